@@ -0,0 +1,96 @@
+"""
+Fetch Benchmark - Measures concurrent problem-detail fetching against the local mock server
+
+Usage:
+    python benchmarks/bench_fetch.py [--problems 64] [--latency-ms 50] [--workers 1 4 16] [--batch-size 1]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from leetcode_client import LeetCodeClient
+from mock_leetcode_server import FaultInjector, MockDataset, MockLeetCodeServer
+from request_scheduler import RequestScheduler
+
+
+def _build_submissions(dataset: MockDataset, count: int) -> List[Tuple[str, Dict]]:
+    """Pick the latest accepted submission for `count` distinct problems, as (slug, submission) pairs"""
+    by_slug = {}
+    for submission in dataset.submissions:
+        if submission["statusDisplay"] == "Accepted" and submission["titleSlug"] not in by_slug:
+            by_slug[submission["titleSlug"]] = submission
+            if len(by_slug) >= count:
+                break
+    return list(by_slug.items())
+
+
+def run_benchmark(problems: int, latency_ms: float, worker_counts: List[int], batch_size: int = 1) -> List[Dict]:
+    """Time _fetch_problem_details at each worker count and return one result per count"""
+    dataset = MockDataset.synthetic(submissions=problems * 10, problems=problems)
+    submissions = _build_submissions(dataset, problems)
+    results = []
+    reference = None
+
+    with MockLeetCodeServer(dataset, FaultInjector(latency_ms=latency_ms)) as server:
+        for workers in worker_counts:
+            # Unlimited rate so the benchmark measures concurrency, not the limiter
+            client = LeetCodeClient("bench-user", "bench-session", max_workers=workers, batch_size=batch_size,
+                                    scheduler=RequestScheduler(rate_per_second=0), graphql_url=server.url)
+
+            # Silence the client's per-problem progress lines while timing
+            client_logger = logging.getLogger("leetcode_client")
+            level = client_logger.level
+            client_logger.setLevel(logging.WARNING)
+            try:
+                start = time.perf_counter()
+                fetched = client._fetch_problem_details(submissions)
+                elapsed = time.perf_counter() - start
+            finally:
+                client_logger.setLevel(level)
+
+            slugs = [p["slug"] for p in fetched]
+            if reference is None:
+                reference = slugs
+            elif slugs != reference:
+                raise RuntimeError(f"Result order differs at {workers} workers")
+
+            results.append({
+                "workers": workers,
+                "seconds": elapsed,
+                "fetched": len(fetched),
+                "requests": client.request_count,
+            })
+
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = baseline / result["seconds"] if result["seconds"] else 0.0
+
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--problems", type=int, default=64, help="number of synthetic problems")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mock server delay per request")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="worker counts to compare")
+    parser.add_argument("--batch-size", type=int, default=1, help="aliased items per request (1 = unbatched)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.problems, args.latency_ms, args.workers, args.batch_size)
+
+    print(f"{args.problems} problems, {args.latency_ms:.0f} ms simulated latency per request, batch size {args.batch_size}")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'requests':>9}")
+    for result in results:
+        print(f"{result['workers']:>8} {result['seconds']:>9.2f} {result['speedup']:>7.1f}x {result['requests']:>9}")
+
+
+if __name__ == "__main__":
+    main()
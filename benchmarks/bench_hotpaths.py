@@ -0,0 +1,306 @@
+"""
+Hot-Path Benchmarks - Times and memory for the index and README code paths at growing sizes
+
+Measures, on synthetic problems at each size:
+  readme_build_table        ReadmeUpdater._build_table over every row
+  readme_replace_section    ReadmeUpdater._replace_table_section on a full README
+  load_index                LeetCodeSync._load_index (log + offset sidecar)
+  save_index                LeetCodeSync._save_index appending APPEND_BATCH new records
+  existing_slugs_dedup      membership checks of every slug plus as many misses
+  store_solution            LeetCodeSync._store_solution for up to STORE_SAMPLE problems
+  search_index_update       LeetCodeSync._update_search_index over those stored files (empty index)
+
+Each benchmark reports the best wall time over --repeat runs and the tracemalloc
+peak of one extra run. Results are compared with benchmarks/baseline.json, and
+the script exits 1 when a benchmark is slower or uses more memory than the
+baseline by more than the thresholds.
+
+Usage:
+    python benchmarks/bench_hotpaths.py                       # compare with the baseline
+    python benchmarks/bench_hotpaths.py --sizes 10 1000       # quicker subset
+    python benchmarks/bench_hotpaths.py --update-baseline     # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from problem_index import ProblemIndex
+from readme_updater import ReadmeUpdater
+from search_index import SearchIndex
+from sync import LeetCodeSync
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+
+# New records appended per save_index run
+APPEND_BATCH = 10
+
+# Solutions written per store_solution run (writing 100k files would measure the disk, not the code)
+STORE_SAMPLE = 1000
+
+# Differences below these are noise, whatever the ratio
+MIN_TIME_DELTA_S = 0.002
+MIN_MEMORY_DELTA_KB = 64
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+TAGS = ["Array", "String", "Hash Table", "Dynamic Programming", "Math", "Sorting", "Greedy",
+        "Binary Search", "Two Pointers", "Stack", "Tree", "Graph", "Heap (Priority Queue)"]
+
+
+def make_problems(count: int, offset: int = 0) -> List[Dict]:
+    """Deterministic synthetic index records in solved order"""
+    problems = []
+    for i in range(offset, offset + count):
+        slug = f"bench-problem-{i}"
+        difficulty = DIFFICULTIES[i % 3]
+        problems.append({
+            "slug": slug,
+            "title": f"Bench Problem {i}",
+            "difficulty": difficulty,
+            "tags": [TAGS[i % len(TAGS)], TAGS[(i * 7) % len(TAGS)]],
+            "leetcode_url": f"https://leetcode.com/problems/{slug}/",
+            "language": "python3",
+            "solution_path": f"solutions/python3/{difficulty.lower()}/{slug}.py",
+            "solved_at": f"{2020 + i // 400000}-{1 + (i // 33000) % 12:02d}-{1 + (i // 1100) % 28:02d}T"
+                         f"{(i // 46) % 24:02d}:{i % 60:02d}:00Z",
+        })
+    return problems
+
+
+def make_solution(record: Dict) -> Dict:
+    """Turn an index record into the problem dict _store_solution expects"""
+    return {
+        **record,
+        "extension": "py",
+        "submission_id": record["slug"].rsplit("-", 1)[1],
+        "code": "class Solution:\n    def solve(self, nums: List[int]) -> int:\n"
+                "        best = 0\n        for num in nums:\n            best = max(best, num)\n"
+                "        return best\n",
+    }
+
+
+class Workspace:
+    """Throwaway repository holding an index log with a given number of problems"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.root = tempfile.mkdtemp(prefix=f"bench-{size}-")
+        os.makedirs(os.path.join(self.root, "metadata"))
+        self.problems = make_problems(size)
+        sync = LeetCodeSync(self.root, probe=False)
+        ProblemIndex(str(sync.index_log_file), writer=sync.writer).append(self.problems)
+        self.log_snapshot = self._snapshot(sync)
+
+    def sync(self) -> LeetCodeSync:
+        return LeetCodeSync(self.root, probe=False)
+
+    def restore_index(self):
+        """Put the log and sidecar back to their freshly built state"""
+        for path, data in self.log_snapshot.items():
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def _snapshot(sync: LeetCodeSync) -> Dict[str, bytes]:
+        index = sync._load_index()
+        snapshot = {}
+        for path in (index.log_path, index.offsets_path):
+            with open(path, "rb") as f:
+                snapshot[str(path)] = f.read()
+        return snapshot
+
+
+def bench_readme_build_table(workspace: Workspace) -> Callable[[], None]:
+    updater = ReadmeUpdater(os.path.join(workspace.root, "README.md"), os.path.join(workspace.root, "metadata", "x"))
+    problems = workspace.problems
+    return lambda: updater._build_table(problems)
+
+
+def bench_readme_replace_section(workspace: Workspace) -> Callable[[], None]:
+    updater = ReadmeUpdater(os.path.join(workspace.root, "README.md"), os.path.join(workspace.root, "metadata", "x"))
+    table = updater._build_table(workspace.problems)
+    content = updater._replace_table_section(updater._create_default_readme(), table)
+    return lambda: updater._replace_table_section(content, table)
+
+
+def bench_load_index(workspace: Workspace) -> Callable[[], None]:
+    sync = workspace.sync()
+    return sync._load_index
+
+
+def bench_save_index(workspace: Workspace) -> Callable[[], None]:
+    new_entries = make_problems(APPEND_BATCH, offset=workspace.size)
+
+    def run():
+        sync = workspace.sync()
+        sync._save_index(sync._load_index(), new_entries)
+    return run
+
+
+def bench_existing_slugs_dedup(workspace: Workspace) -> Callable[[], None]:
+    index = workspace.sync()._load_index()
+    candidates = [p["slug"] for p in workspace.problems] + [f"missing-{i}" for i in range(workspace.size)]
+    return lambda: sum(1 for slug in candidates if slug in index)
+
+
+def bench_store_solution(workspace: Workspace) -> Callable[[], None]:
+    problems = [make_solution(record) for record in workspace.problems[:STORE_SAMPLE]]
+
+    def run():
+        sync = workspace.sync()
+        shutil.rmtree(sync.solutions_dir, ignore_errors=True)
+        for problem in problems:
+            sync._store_solution(problem)
+    return run
+
+
+def bench_search_index_update(workspace: Workspace) -> Callable[[], None]:
+    records = workspace.problems[:STORE_SAMPLE]
+    sync = workspace.sync()
+    for record in records:
+        sync._store_solution(make_solution(record))
+    stored = list(sync._search_pending)
+    index = sync._load_index()
+
+    def run():
+        sync = workspace.sync()
+        search_dir = sync.metadata_dir / "search"
+        shutil.rmtree(search_dir, ignore_errors=True)
+        # Start from an empty index rather than none, which would make the sync rebuild it
+        SearchIndex(str(search_dir), sync.writer).save()
+        sync._search_pending = list(stored)
+        sync._update_search_index(index, records)
+    return run
+
+
+BENCHMARKS = {
+    "readme_build_table": (bench_readme_build_table, False),
+    "readme_replace_section": (bench_readme_replace_section, False),
+    "load_index": (bench_load_index, False),
+    "save_index": (bench_save_index, True),
+    "existing_slugs_dedup": (bench_existing_slugs_dedup, False),
+    "store_solution": (bench_store_solution, False),
+    "search_index_update": (bench_search_index_update, False),
+}
+
+
+def measure(workspace: Workspace, factory: Callable, restores_index: bool, repeat: int) -> Dict:
+    """Best-of-repeat wall time, then tracemalloc peak of one more run"""
+    run = factory(workspace)
+    best = float("inf")
+    for _ in range(repeat):
+        if restores_index:
+            workspace.restore_index()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    if restores_index:
+        workspace.restore_index()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if restores_index:
+        workspace.restore_index()
+
+    return {"time_s": round(best, 6), "peak_kb": round(peak / 1024, 1)}
+
+
+def run_benchmarks(sizes: List[int], names: List[str], repeat: int) -> Dict[str, Dict[str, Dict]]:
+    results = {name: {} for name in names}
+    for size in sizes:
+        workspace = Workspace(size)
+        try:
+            for name in names:
+                factory, restores_index = BENCHMARKS[name]
+                result = measure(workspace, factory, restores_index, repeat)
+                results[name][str(size)] = result
+                print(f"  {name:<24} {size:>7}  {result['time_s'] * 1000:10.3f} ms  {result['peak_kb']:10.1f} KB")
+        finally:
+            workspace.cleanup()
+    return results
+
+
+def find_regressions(results: Dict, baseline: Dict, time_threshold: float, memory_threshold: float) -> List[str]:
+    """Describe every result that is worse than its baseline beyond the thresholds"""
+    regressions = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if not base:
+                continue
+            if (result["time_s"] > base["time_s"] * (1 + time_threshold)
+                    and result["time_s"] - base["time_s"] > MIN_TIME_DELTA_S):
+                regressions.append(f"{name}[{size}] time {base['time_s'] * 1000:.2f} ms -> {result['time_s'] * 1000:.2f} ms")
+            if (result["peak_kb"] > base["peak_kb"] * (1 + memory_threshold)
+                    and result["peak_kb"] - base["peak_kb"] > MIN_MEMORY_DELTA_KB):
+                regressions.append(f"{name}[{size}] peak {base['peak_kb']:.0f} KB -> {result['peak_kb']:.0f} KB")
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.5, help="allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="allowed peak memory growth")
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    print(f"{'benchmark':<26} {'size':>7}  {'best time':>13}  {'peak memory':>13}")
+    results = run_benchmarks(args.sizes, names, args.repeat)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline) or {}
+        for name, by_size in results.items():
+            baseline.setdefault(name, {}).update(by_size)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✓ Wrote baseline to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    regressions = find_regressions(results, baseline, args.time_threshold, args.memory_threshold)
+    if regressions:
+        print("\n✗ Regressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\n✓ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Sync Benchmark - Runs a full LeetCodeSync.run end to end against the local mock server
+
+Creates a throwaway repository, serves a synthetic account from the mock
+server and times a cold backfill sync followed by a warm no-op sync.
+
+Usage:
+    python benchmarks/bench_sync.py [--submissions 10000] [--latency-ms 5] [--error-rate 0.01] [--rate-limit-rate 0.01]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from mock_leetcode_server import FaultInjector, MockDataset, MockLeetCodeServer
+from sync import LeetCodeSync
+
+
+def _timed_run(repo_root: str) -> float:
+    """Run one sync with its output silenced and return the elapsed seconds"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        LeetCodeSync(repo_root).run()
+        return time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=10000, help="synthetic submissions in the account")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = MockDataset.synthetic(args.submissions, seed=args.seed)
+    faults = FaultInjector(latency_ms=args.latency_ms, error_rate=args.error_rate,
+                           rate_limit_rate=args.rate_limit_rate, retry_after=0.1, seed=args.seed)
+
+    with MockLeetCodeServer(dataset, faults) as server, tempfile.TemporaryDirectory() as repo_root:
+        os.makedirs(os.path.join(repo_root, "metadata"))
+        os.environ.update({
+            "LEETCODE_USERNAME": "bench-user",
+            "LEETCODE_SESSION": "bench-session",
+            "LEETCODE_GRAPHQL_URL": server.url,
+            "LEETCODE_BACKFILL": "1",
+            "LEETCODE_RATE_LIMIT": "0",
+        })
+
+        cold = _timed_run(repo_root)
+        cold_requests = dict(server.operation_counts)
+        server.operation_counts.clear()
+        warm = _timed_run(repo_root)
+
+        solutions = sum(len(files) for _, _, files in os.walk(os.path.join(repo_root, "solutions")))
+
+    print(f"{args.submissions} submissions, {len(dataset.questions)} problems, {args.latency_ms:.0f} ms latency")
+    print(f"  cold sync: {cold:8.2f}s  {solutions} solution files  requests {cold_requests}")
+    print(f"  warm sync: {warm:8.2f}s  requests {server.operation_counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Atomic IO - Crash-safe, skip-if-unchanged file writes shared by the sync pipeline
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+PathLike = Union[str, Path]
+
+# Read once: os.umask() can only be queried by setting it, which is not thread-safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class WriteStats:
+    """Counts files and bytes written versus skipped as unchanged"""
+
+    def __init__(self):
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "files_written": self.files_written,
+            "files_skipped": self.files_skipped,
+            "bytes_written": self.bytes_written,
+            "bytes_skipped": self.bytes_skipped,
+        }
+
+    def summary(self) -> str:
+        return (f"wrote {self.files_written} file(s) ({self.bytes_written} bytes), "
+                f"skipped {self.files_skipped} unchanged ({self.bytes_skipped} bytes)")
+
+
+class AtomicWriter:
+    """Writes files through a temp file + os.replace, skipping writes whose content is unchanged"""
+
+    def __init__(self, fsync: Optional[bool] = None):
+        """
+        Initialize writer
+
+        Args:
+            fsync: fsync written files and their directories when flush() is called
+                (defaults to LEETCODE_FSYNC)
+        """
+        if fsync is None:
+            fsync = os.getenv("LEETCODE_FSYNC", "").lower() in ("1", "true", "yes")
+        self.fsync = fsync
+        self.stats = WriteStats()
+        self._written: Dict[Path, None] = {}
+        self._removed: Dict[Path, None] = {}
+        self._pending_sync: List[Path] = []
+        self._lock = threading.Lock()
+
+    @property
+    def written_paths(self) -> List[Path]:
+        """Every path written or appended to, in first-write order"""
+        return list(self._written)
+
+    @property
+    def removed_paths(self) -> List[Path]:
+        """Every path deleted through remove() and not written again since"""
+        return list(self._removed)
+
+    def write_text(self, path: PathLike, content: str, encoding: str = "utf-8") -> bool:
+        """Write text atomically; returns False if the file already had this content"""
+        return self.write_bytes(path, content.encode(encoding))
+
+    def write_json(self, path: PathLike, data: Any, **dump_kwargs) -> bool:
+        """Serialize data with json.dumps(**dump_kwargs) and write it atomically"""
+        return self.write_text(path, json.dumps(data, **dump_kwargs))
+
+    def write_bytes(self, path: PathLike, data: bytes) -> bool:
+        """Write bytes atomically; returns False if the file already had this content"""
+        path = Path(path)
+        if self._unchanged(path, data):
+            with self._lock:
+                self.stats.files_skipped += 1
+                self.stats.bytes_skipped += len(data)
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mode = self._target_mode(path)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.chmod(tmp_name, mode)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        self._record_write(path, len(data))
+        return True
+
+    def reset(self):
+        """Start a new batch: forget the stats and written paths collected so far"""
+        with self._lock:
+            self.stats = WriteStats()
+            self._written = {}
+            self._removed = {}
+
+    def remove(self, path: PathLike) -> bool:
+        """Delete a file, remembering it among the removed paths; returns False if it did not exist"""
+        path = Path(path)
+        if not path.exists():
+            return False
+        path.unlink()
+        with self._lock:
+            self._written.pop(path, None)
+            self._removed.setdefault(path, None)
+            self._pending_sync.append(path)
+        return True
+
+    def note_append(self, path: PathLike, nbytes: int):
+        """Account for bytes appended to a file outside the writer (e.g. a JSONL log)"""
+        if nbytes:
+            self._record_write(Path(path), nbytes)
+
+    def flush(self):
+        """fsync the directories of files written since the last flush (when fsync is enabled)"""
+        with self._lock:
+            pending, self._pending_sync = self._pending_sync, []
+        if not self.fsync:
+            return
+        for directory in sorted({p.parent for p in pending}):
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def _record_write(self, path: Path, nbytes: int):
+        with self._lock:
+            self.stats.files_written += 1
+            self.stats.bytes_written += nbytes
+            self._written.setdefault(path, None)
+            self._removed.pop(path, None)
+            self._pending_sync.append(path)
+
+    @staticmethod
+    def _unchanged(path: Path, data: bytes) -> bool:
+        try:
+            if path.stat().st_size != len(data):
+                return False
+            with open(path, "rb") as f:
+                existing = f.read()
+        except OSError:
+            return False
+        return hashlib.sha256(existing).digest() == hashlib.sha256(data).digest()
+
+    @staticmethod
+    def _target_mode(path: Path) -> int:
+        """Keep an existing file's permissions; new files get the umask default"""
+        try:
+            return path.stat().st_mode & 0o7777
+        except OSError:
+            return 0o666 & ~_UMASK
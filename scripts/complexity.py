@@ -0,0 +1,244 @@
+"""
+Complexity Estimator - Fits measured solution runtimes against the usual complexity classes
+
+Runs the solution harness over a geometric sweep of input sizes, then fits
+time(n) = a + c * f(n) for each class below by least squares on relative error
+(so microsecond and second timings weigh the same). The best fit, with a
+confidence score, is written into each problem's index record under
+"complexity", problems_index.json is re-exported and the README table gains
+the measured class.
+
+A fit is flagged when the measured class grows faster than the one expected
+for the problem's tags (the tightest bound any of its tags implies, unless its
+input generator states a different expectation) and the expected class fits
+the timings clearly worse.
+
+Usage:
+    python scripts/complexity.py                          # sweep, fit and record everything
+    python scripts/complexity.py --only 3sum --dry-run    # print the fit without recording it
+"""
+
+import argparse
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from problem_index import ProblemIndex
+from solution_harness import DEFAULT_TIMEOUT, SolutionHarness
+from solution_inputs import INPUT_GENERATORS
+
+# Candidate classes, simplest first
+COMPLEXITY_CLASSES: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n²)", lambda n: n * n),
+    ("O(n³)", lambda n: n ** 3),
+]
+CLASS_RANK = {label: rank for rank, (label, _) in enumerate(COMPLEXITY_CLASSES)}
+
+# Tightest bound a solution to a problem with the tag can usually reach
+TAG_EXPECTATIONS = {
+    "Binary Search": "O(log n)",
+    "Array": "O(n)",
+    "String": "O(n)",
+    "Two Pointers": "O(n)",
+    "Sliding Window": "O(n)",
+    "Hash Table": "O(n)",
+    "Prefix Sum": "O(n)",
+    "Stack": "O(n)",
+    "Monotonic Stack": "O(n)",
+    "Greedy": "O(n)",
+    "Sorting": "O(n log n)",
+    "Heap (Priority Queue)": "O(n log n)",
+    "Dynamic Programming": "O(n²)",
+}
+
+DEFAULT_MIN_SIZE = 64
+DEFAULT_MAX_SIZE = 131072
+DEFAULT_POINTS = 12
+
+# A more complex class must cut the residual by this fraction to beat a simpler one
+MIN_IMPROVEMENT = 0.1
+
+# A fit is flagged only when the expected class explains the timings at least this
+# much worse (RMS relative error) than the measured one. Neighbouring classes differ
+# by at most a log factor, which cache effects alone can produce, so they need more.
+FLAG_MIN_MISFIT = 1.5
+ADJACENT_MIN_MISFIT = 3.0
+
+
+def geometric_sizes(min_size: int, max_size: int, points: int) -> List[int]:
+    """points sizes spaced evenly on a log scale between min_size and max_size"""
+    if points < 2 or max_size <= min_size:
+        return [min_size]
+    ratio = (max_size / min_size) ** (1 / (points - 1))
+    return sorted({round(min_size * ratio ** i) for i in range(points)})
+
+
+def _fit_class(f: Callable[[float], float], points: Sequence[Tuple[int, float]]) -> Tuple[float, float, float]:
+    """Weighted least-squares fit of t = a + c * f(n) with a, c >= 0; returns (a, c, relative RSS)"""
+    weights = [1 / (t * t) for _, t in points]
+    xs = [f(n) for n, _ in points]
+    ts = [t for _, t in points]
+
+    s = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, xs))
+    sxx = sum(w * x * x for w, x in zip(weights, xs))
+    st = sum(w * t for w, t in zip(weights, ts))
+    sxt = sum(w * x * t for w, x, t in zip(weights, xs, ts))
+
+    det = s * sxx - sx * sx
+    a, c = st / s, 0.0
+    if det > 1e-12 * s * sxx:
+        c = (s * sxt - sx * st) / det
+        a = (st - c * sx) / s
+        if c < 0:
+            a, c = st / s, 0.0
+        elif a < 0:
+            a, c = 0.0, sxt / sxx
+
+    rss = sum(w * (a + c * x - t) ** 2 for w, x, t in zip(weights, xs, ts))
+    return a, c, rss
+
+
+def fit_complexity(points: Sequence[Tuple[int, float]]) -> Optional[Dict]:
+    """
+    Pick the complexity class that best explains (size, seconds) measurements
+
+    Args:
+        points: Measured (n, seconds per call) pairs; at least three distinct sizes are needed
+
+    Returns:
+        {"class", "confidence", "residuals": {class: relative RMS error}}, or None with too few points.
+        Confidence is the goodness of the best fit (1 - its RMS relative error) times
+        its separation from the runner-up (1 - best RSS / runner-up RSS).
+    """
+    points = [(n, t) for n, t in points if n > 0 and t > 0]
+    if len({n for n, _ in points}) < 3:
+        return None
+
+    residuals = {label: _fit_class(f, points)[2] for label, f in COMPLEXITY_CLASSES}
+
+    best = COMPLEXITY_CLASSES[0][0]
+    for label, _ in COMPLEXITY_CLASSES[1:]:
+        if residuals[label] < residuals[best] * (1 - MIN_IMPROVEMENT):
+            best = label
+    runner_up = min(residuals[label] for label in residuals if label != best)
+
+    rms = math.sqrt(residuals[best] / len(points))
+    goodness = max(0.0, 1 - rms)
+    separation = 1 - residuals[best] / runner_up if runner_up > 0 else 0.0
+    return {
+        "class": best,
+        "confidence": round(max(0.0, goodness * separation), 3),
+        "residuals": {label: round(math.sqrt(rss / len(points)), 4) for label, rss in residuals.items()},
+    }
+
+
+def expected_class(slug: str, tags: Sequence[str]) -> Optional[str]:
+    """Growth expected for a problem: its generator's stated bound, else the tightest its tags imply"""
+    generator = INPUT_GENERATORS.get(slug)
+    if generator and generator.expected:
+        return generator.expected
+    bounds = [TAG_EXPECTATIONS[tag] for tag in tags if tag in TAG_EXPECTATIONS]
+    return min(bounds, key=CLASS_RANK.get) if bounds else None
+
+
+def assess(slug: str, tags: Sequence[str], results: List[Dict]) -> Optional[Dict]:
+    """Build the index "complexity" entry for one problem's harness results"""
+    fit = fit_complexity([(result["n"], result["time_s"]) for result in results])
+    if fit is None:
+        return None
+    expected = expected_class(slug, tags)
+    worse = False
+    if expected is not None and CLASS_RANK[fit["class"]] > CLASS_RANK[expected]:
+        min_misfit = ADJACENT_MIN_MISFIT if CLASS_RANK[fit["class"]] == CLASS_RANK[expected] + 1 else FLAG_MIN_MISFIT
+        worse = fit["residuals"][expected] >= min_misfit * fit["residuals"][fit["class"]]
+    return {
+        "class": fit["class"],
+        "confidence": fit["confidence"],
+        "expected": expected,
+        "worse_than_expected": worse,
+        "sizes": [results[0]["n"], results[-1]["n"]],
+    }
+
+
+def record_complexity(repo_root: str, assessments: Dict[str, Dict]) -> int:
+    """
+    Store assessments in the index, re-export problems_index.json and refresh the README
+
+    Returns:
+        Number of index records that changed
+    """
+    from readme_updater import update_readme
+    from sync import LeetCodeSync
+
+    sync = LeetCodeSync(repo_root, probe=False)
+    index = sync._load_index()
+    changed = []
+    for slug, complexity in assessments.items():
+        record = index.get(slug)
+        if record is None or record.get("complexity") == complexity:
+            continue
+        changed.append({**record, "complexity": complexity})
+
+    sync._save_index(index, changed)
+    index.export_json(str(sync.index_file))
+    update_readme(str(sync.readme_file), str(sync._readme_source()), changed, sync.writer,
+                  sync._docs_dir())
+    sync.writer.flush()
+    return len(changed)
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="SLUG", help="assess only these solutions")
+    parser.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE)
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS, help="sizes in the geometric sweep")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT * 2, help="seconds per solution")
+    parser.add_argument("--workers", type=int, help="worker processes (defaults to the CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="print the fits without updating the index")
+    args = parser.parse_args()
+
+    index = ProblemIndex(str(repo_root / "metadata" / "problems_index.jsonl"))
+    sizes = geometric_sizes(args.min_size, args.max_size, args.points)
+    harness = SolutionHarness(str(repo_root), sizes, args.timeout, args.workers)
+    results = harness.run(args.only, save=False)
+
+    assessments = {}
+    print(f"\n{'problem':<40} {'measured':<11} {'confidence':>10}  {'expected':<11}")
+    for slug, entry in sorted(results.items()):
+        record = index.get(slug)
+        if record is None or not entry["results"]:
+            continue
+        complexity = assess(slug, record.get("tags", []), entry["results"])
+        if complexity is None:
+            continue
+        assessments[slug] = complexity
+        mark = "⚠" if complexity["worse_than_expected"] else " "
+        print(f"{mark} {slug:<38} {complexity['class']:<11} {complexity['confidence']:>10.2f}  "
+              f"{complexity['expected'] or '-':<11}")
+
+    flagged = [slug for slug, complexity in assessments.items() if complexity["worse_than_expected"]]
+    if flagged:
+        print(f"\n⚠ Growing faster than expected for their tags: {', '.join(flagged)}")
+
+    if args.dry_run:
+        return
+    changed = record_complexity(str(repo_root), assessments)
+    print(f"✓ Recorded complexity for {len(assessments)} problem(s) ({changed} index record(s) changed)")
+
+
+if __name__ == "__main__":
+    main()
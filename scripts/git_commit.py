@@ -0,0 +1,179 @@
+"""
+Git Commit - Commits exactly the files a sync wrote, through git plumbing
+
+`git add .` makes git stat and rehash the whole working tree to find what a
+sync changed, although the sync's AtomicWriter already knows. This module
+takes those paths (written and removed) and builds the commit directly:
+
+  git check-ignore --stdin       drop ignored paths (sync diagnostics, problems.db)
+  git hash-object -w --stdin-paths   store a blob for each written file
+  git update-index --index-info      point the index at those blobs (or remove entries)
+  git write-tree                     tree from the index (unchanged subtrees are cached)
+  git commit-tree -p HEAD            the commit, with a per-problem message
+  git update-ref HEAD                move the current branch, if nobody else moved it
+
+so the cost grows with the number of changed files, not with the tree.
+
+Usage:
+    python scripts/git_commit.py metadata/state.json README.md -m "Update state"
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+NULL_SHA = "0" * 40
+
+# Problems listed by name in a commit subject; more are summarized by count
+MAX_SUBJECT_PROBLEMS = 2
+
+
+class GitCommitError(Exception):
+    """A git command failed"""
+
+
+class GitCommitter:
+    """Builds commits from explicit path lists with git plumbing commands"""
+
+    def __init__(self, work_dir: str, git: str = "git"):
+        """
+        Initialize committer
+
+        Args:
+            work_dir: Any directory inside the work tree, e.g. one account's tree in a
+                multi-account repository (relative paths are resolved against it)
+            git: git executable
+        """
+        self.work_dir = Path(work_dir).resolve()
+        self.git = git
+        self._top_level: Optional[Path] = None
+
+    def commit(self, written: Iterable[os.PathLike], removed: Iterable[os.PathLike], message: str) -> Optional[str]:
+        """
+        Commit the given files on top of HEAD
+
+        Anything already staged in the index is committed along with them.
+
+        Args:
+            written: Files created or changed (absolute, or relative to work_dir)
+            removed: Files deleted
+            message: Commit message
+
+        Returns:
+            The new commit id, or None when the tree did not change
+
+        Raises:
+            GitCommitError: A git command failed (e.g. no committer identity is configured)
+        """
+        if self._top_level is None:
+            self._top_level = Path(self._run("rev-parse", "--show-toplevel").strip()).resolve()
+        written = self._tracked_candidates(written)
+        removed = self._tracked_candidates(removed)
+        if not written and not removed:
+            return None
+
+        entries = []
+        if written:
+            blobs = self._run("hash-object", "-w", "--stdin-paths", input="\n".join(written) + "\n").split()
+            for path, blob in zip(written, blobs):
+                mode = "100755" if os.access(self._top_level / path, os.X_OK) else "100644"
+                entries.append(f"{mode} {blob}\t{path}")
+        entries.extend(f"0 {NULL_SHA}\t{path}" for path in removed)
+        self._run("update-index", "--index-info", input="\n".join(entries) + "\n")
+
+        tree = self._run("write-tree").strip()
+        parent = self._head()
+        if parent is not None and self._run("rev-parse", f"{parent}^{{tree}}").strip() == tree:
+            return None
+
+        parents = ["-p", parent] if parent is not None else []
+        commit = self._run("commit-tree", tree, *parents, "-F", "-", input=message).strip()
+        self._run("update-ref", "-m", f"commit: {message.splitlines()[0]}", "HEAD", commit, parent or NULL_SHA)
+        return commit
+
+    def _tracked_candidates(self, paths: Iterable[os.PathLike]) -> List[str]:
+        """Paths relative to the top of the work tree (POSIX form) that git does not ignore"""
+        relative = []
+        for path in paths:
+            path = Path(path)
+            absolute = (path if path.is_absolute() else self.work_dir / path).resolve()
+            try:
+                relative.append(absolute.relative_to(self._top_level).as_posix())
+            except ValueError:
+                continue
+        relative = [path for path in dict.fromkeys(relative) if path.split("/")[0] != ".git"]
+        if not relative:
+            return []
+
+        # check-ignore exits 1 when nothing is ignored
+        result = self._git(["check-ignore", "--stdin", "-z"], "\0".join(relative) + "\0")
+        if result.returncode not in (0, 1):
+            raise GitCommitError(f"git check-ignore failed: {result.stderr.strip()}")
+        ignored = set(result.stdout.split("\0"))
+        return [path for path in relative if path not in ignored]
+
+    def _head(self) -> Optional[str]:
+        result = self._git(["rev-parse", "--verify", "-q", "HEAD"])
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _run(self, *args: str, input: Optional[str] = None) -> str:
+        result = self._git(list(args), input)
+        if result.returncode != 0:
+            raise GitCommitError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def _git(self, args: List[str], input: Optional[str] = None) -> subprocess.CompletedProcess:
+        return subprocess.run([self.git, *args], cwd=self._top_level or self.work_dir, input=input,
+                              capture_output=True, text=True, encoding="utf-8")
+
+
+def commit_message(entries: Sequence[Dict], new_slugs: Iterable[str] = ()) -> str:
+    """
+    Describe a sync: one line per problem with its difficulty, language and solution file
+
+    Args:
+        entries: Index entries the sync added or updated
+        new_slugs: Slugs that were not in the index before the sync
+    """
+    if not entries:
+        return "Sync LeetCode: update sync state\n"
+
+    new_slugs = set(new_slugs)
+    added = sum(1 for entry in entries if entry["slug"] in new_slugs)
+    if len(entries) <= MAX_SUBJECT_PROBLEMS:
+        subject = "Sync LeetCode: " + ", ".join(entry["title"] for entry in entries)
+    else:
+        subject = f"Sync LeetCode: {len(entries)} problems ({added} new, {len(entries) - added} updated)"
+
+    lines = [subject, ""]
+    for entry in entries:
+        action = "New" if entry["slug"] in new_slugs else "Updated"
+        versions = len(entry.get("versions") or [])
+        history = f", {versions} versions" if versions > 1 else ""
+        lines.append(f"- {action}: {entry['title']} ({entry.get('difficulty', '')}, {entry.get('language', '')}"
+                     f"{history}) -> {entry.get('solution_path', '')}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="files to commit, relative to the current directory "
+                                                 "(missing files are committed as deletions)")
+    parser.add_argument("-m", "--message", required=True, help="commit message")
+    args = parser.parse_args()
+
+    written = [path for path in args.paths if os.path.exists(path)]
+    removed = [path for path in args.paths if not os.path.exists(path)]
+    try:
+        commit = GitCommitter(os.getcwd()).commit(written, removed, args.message + "\n")
+    except GitCommitError as e:
+        sys.exit(f"✗ {e}")
+    print(f"✓ Committed {commit}" if commit else "✓ Nothing to commit")
+
+
+if __name__ == "__main__":
+    main()
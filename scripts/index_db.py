@@ -0,0 +1,220 @@
+"""
+Index DB - Optional SQLite store mirroring the problem index for fast filtered queries
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from problem_index import ProblemIndex
+
+
+class ProblemStore:
+    """SQLite tables for problems, tags and submissions, kept in step with problems_index.jsonl"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS problems (
+        slug TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        difficulty TEXT NOT NULL COLLATE NOCASE,
+        leetcode_url TEXT,
+        language TEXT NOT NULL COLLATE NOCASE,
+        solution_path TEXT,
+        solved_at TEXT NOT NULL,
+        record TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS problem_tags (
+        slug TEXT NOT NULL REFERENCES problems(slug) ON DELETE CASCADE,
+        tag TEXT NOT NULL COLLATE NOCASE,
+        PRIMARY KEY (slug, tag)
+    );
+    CREATE TABLE IF NOT EXISTS submissions (
+        slug TEXT NOT NULL REFERENCES problems(slug) ON DELETE CASCADE,
+        language TEXT NOT NULL COLLATE NOCASE,
+        solution_path TEXT,
+        solved_at TEXT NOT NULL,
+        PRIMARY KEY (slug, language, solved_at)
+    );
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_problems_difficulty ON problems(difficulty);
+    CREATE INDEX IF NOT EXISTS idx_problems_language ON problems(language);
+    CREATE INDEX IF NOT EXISTS idx_problems_solved_at ON problems(solved_at);
+    CREATE INDEX IF NOT EXISTS idx_problem_tags_tag ON problem_tags(tag);
+    CREATE INDEX IF NOT EXISTS idx_submissions_language ON submissions(language);
+    CREATE INDEX IF NOT EXISTS idx_submissions_solved_at ON submissions(solved_at);
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize problem store
+
+        Args:
+            db_path: Path to the SQLite database (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit everything in the block atomically, rolling back on error"""
+        with self.conn:
+            yield self.conn
+
+    def add(self, records: List[Dict], index: Optional[ProblemIndex] = None):
+        """
+        Insert or replace records in one transaction
+
+        Args:
+            records: Index entries to store
+            index: Log the records were appended to; its size is recorded so drift can be detected
+        """
+        with self.transaction() as conn:
+            for record in records:
+                self._upsert(conn, record)
+            if index is not None:
+                self._set_meta(conn, "log_size", index.log_size)
+
+    def apply_append(self, index: ProblemIndex, records: List[Dict], previous_log_size: int):
+        """
+        Mirror records just appended to the log
+
+        Args:
+            index: Log the records were appended to
+            records: The appended records
+            previous_log_size: Log size before the append; if the store was not in
+                step with it, the whole store is rebuilt from the log instead
+        """
+        if self._get_meta("log_size") == str(previous_log_size):
+            self.add(records, index)
+        else:
+            self.sync_from_index(index)
+
+    def sync_from_index(self, index: ProblemIndex) -> bool:
+        """
+        Rebuild the tables from the log if they were not written alongside it
+
+        Returns:
+            True if a rebuild happened
+        """
+        if self._get_meta("log_size") == str(index.log_size):
+            return False
+
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM submissions")
+            conn.execute("DELETE FROM problem_tags")
+            conn.execute("DELETE FROM problems")
+            for record in index.all():
+                self._upsert(conn, record)
+            self._set_meta(conn, "log_size", index.log_size)
+        return True
+
+    def all_problems(self) -> List[Dict]:
+        """Every problem record, oldest solved first"""
+        return self.query()
+
+    def query(self, difficulty: Optional[str] = None, tags: Optional[List[str]] = None,
+              language: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              title: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Filter problems, oldest solved first
+
+        Args:
+            difficulty: Easy/Medium/Hard (case-insensitive)
+            tags: Problems must carry every one of these tags
+            language: Language of any stored submission
+            since: Inclusive lower bound on solved_at (ISO date or timestamp)
+            until: Exclusive upper bound on solved_at
+            title: Substring of the title
+            limit: Maximum rows to return
+
+        Returns:
+            Index records as stored in problems_index.jsonl
+        """
+        clauses = []
+        params = []
+        if difficulty:
+            clauses.append("p.difficulty = ?")
+            params.append(difficulty)
+        if language:
+            clauses.append("p.slug IN (SELECT slug FROM submissions WHERE language = ?)")
+            params.append(language)
+        if since:
+            clauses.append("p.solved_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("p.solved_at < ?")
+            params.append(until)
+        if title:
+            clauses.append("p.title LIKE ?")
+            params.append(f"%{title}%")
+        if tags:
+            placeholders = ", ".join("?" for _ in tags)
+            clauses.append(
+                f"p.slug IN (SELECT slug FROM problem_tags WHERE tag IN ({placeholders}) "
+                f"GROUP BY slug HAVING COUNT(DISTINCT tag) = ?)"
+            )
+            params.extend(tags)
+            params.append(len(set(tag.lower() for tag in tags)))
+
+        sql = "SELECT p.record FROM problems p"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.solved_at, p.rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [json.loads(row["record"]) for row in self.conn.execute(sql, params)]
+
+    def _upsert(self, conn: sqlite3.Connection, record: Dict):
+        slug = record["slug"]
+        conn.execute(
+            "INSERT INTO problems (slug, title, difficulty, leetcode_url, language, solution_path, solved_at, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(slug) DO UPDATE SET title = excluded.title, difficulty = excluded.difficulty, "
+            "leetcode_url = excluded.leetcode_url, language = excluded.language, "
+            "solution_path = excluded.solution_path, solved_at = excluded.solved_at, record = excluded.record",
+            (slug, record.get("title", ""), record.get("difficulty", ""), record.get("leetcode_url"),
+             record.get("language", ""), record.get("solution_path"), record.get("solved_at", ""),
+             json.dumps(record, ensure_ascii=False)),
+        )
+        conn.execute("DELETE FROM problem_tags WHERE slug = ?", (slug,))
+        conn.executemany("INSERT OR IGNORE INTO problem_tags (slug, tag) VALUES (?, ?)",
+                         [(slug, tag) for tag in record.get("tags", [])])
+        # One submissions row per stored version (records predating versions have just one)
+        versions = record.get("versions") or [
+            {"language": record.get("language", ""), "path": record.get("solution_path"),
+             "solved_at": record.get("solved_at", "")}
+        ]
+        conn.execute("DELETE FROM submissions WHERE slug = ?", (slug,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO submissions (slug, language, solution_path, solved_at) VALUES (?, ?, ?, ?)",
+            [(slug, version.get("language") or "", version.get("path"), version.get("solved_at") or "")
+             for version in versions],
+        )
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def index_db_enabled(db_path: str) -> bool:
+    """The store is used when LEETCODE_INDEX_DB is set or a database already exists"""
+    return os.getenv("LEETCODE_INDEX_DB", "").lower() in ("1", "true", "yes") or os.path.exists(db_path)
@@ -2,10 +2,26 @@
 LeetCode Client - Fetches solved problems from LeetCode API
 """
 
+import json
+import logging
 import os
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+
+from atomic_io import AtomicWriter
+from question_cache import QuestionCache
+from request_scheduler import RequestFailed, RequestScheduler
+from sync_metrics import SyncMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryScanError(Exception):
+    """A page of the submission history could not be read, so the scan ended early"""
 
 
 class LeetCodeClient:
@@ -13,6 +29,42 @@ class LeetCodeClient:
     
     GRAPHQL_URL = "https://leetcode.com/graphql"
     
+    # Default number of concurrent problem-detail fetches
+    DEFAULT_MAX_WORKERS = 4
+    
+    # Default number of aliased fields packed into one GraphQL request
+    DEFAULT_BATCH_SIZE = 25
+    
+    QUESTION_FIELDS = """
+                questionId
+                title
+                titleSlug
+                difficulty
+                topicTags {
+                    name
+                }
+    """
+    
+    SUBMISSION_FIELDS = """
+                code
+                timestamp
+    """
+    
+    # Questions fetched per page when prefetching the full problem-set catalog
+    CATALOG_PAGE_SIZE = 1000
+    
+    # Submissions per page in backfill mode (LeetCode caps submissionList at 20)
+    BACKFILL_PAGE_SIZE = 20
+    
+    # Submission fields kept in state.json for failed items
+    SUBMISSION_KEYS = ("id", "title", "titleSlug", "timestamp", "statusDisplay", "lang")
+    
+    # Runs a failed submission is retried on before it moves to the dead-letter list
+    MAX_PENDING_ATTEMPTS = 5
+    
+    # New submissions whose details (with code) are fetched and handed to the caller at a time
+    FETCH_CHUNK_SIZE = 100
+    
     # Language ID to extension mapping
     LANG_EXTENSIONS = {
         "python3": "py",
@@ -35,16 +87,55 @@ class LeetCodeClient:
         "oraclesql": "sql",
     }
     
-    def __init__(self, username: str, session_cookie: str):
+    def __init__(self, username: str, session_cookie: str, max_workers: Optional[int] = None,
+                 batch_size: Optional[int] = None, question_cache: Optional[QuestionCache] = None,
+                 backfill: Optional[bool] = None, scheduler: Optional[RequestScheduler] = None,
+                 graphql_url: Optional[str] = None, metrics: Optional[SyncMetrics] = None):
         """
         Initialize LeetCode client
         
         Args:
             username: LeetCode username
             session_cookie: LEETCODE_SESSION cookie value
+            max_workers: Number of problems fetched concurrently
+                (defaults to LEETCODE_FETCH_WORKERS or DEFAULT_MAX_WORKERS)
+            batch_size: Maximum slugs/submission ids per aliased GraphQL request;
+                1 disables batching (defaults to LEETCODE_BATCH_SIZE or DEFAULT_BATCH_SIZE)
+            question_cache: Optional on-disk cache consulted before fetching question metadata
+            backfill: Page through the full submission history instead of only the
+                most recent accepted submissions (defaults to LEETCODE_BACKFILL)
+            scheduler: Rate limiter / retry policy shared by every request
+                (defaults to a new RequestScheduler configured from the environment)
+            graphql_url: Endpoint to query, e.g. a local mock server
+                (defaults to LEETCODE_GRAPHQL_URL or GRAPHQL_URL)
+            metrics: Collector for per-operation request counts, latency and bytes
         """
         self.username = username
+        self.graphql_url = graphql_url or os.getenv("LEETCODE_GRAPHQL_URL") or self.GRAPHQL_URL
+        self.question_cache = question_cache
+        self.metrics = metrics or SyncMetrics()
+        if backfill is None:
+            backfill = os.getenv("LEETCODE_BACKFILL", "").lower() in ("1", "true", "yes")
+        self.backfill = backfill
+        self.scheduler = scheduler or RequestScheduler()
+        if max_workers is None:
+            max_workers = int(os.getenv("LEETCODE_FETCH_WORKERS", self.DEFAULT_MAX_WORKERS))
+        self.max_workers = max(1, max_workers)
+        if batch_size is None:
+            batch_size = int(os.getenv("LEETCODE_BATCH_SIZE", self.DEFAULT_BATCH_SIZE))
+        self.batch_size = max(1, batch_size)
+        # Current adaptive batch size: halves on failed batches, grows back on clean ones
+        self._current_batch_size = self.batch_size
+        self._batch_lock = threading.Lock()
+        self.request_count = 0
+        self.failed_submissions = []
+        self.dead_submissions = []
+        self.newest_accepted_at = None
         self.session = requests.Session()
+        # Size the connection pool so concurrent workers can reuse connections
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, self.max_workers))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.cookies.set("LEETCODE_SESSION", session_cookie, domain=".leetcode.com")
         self.session.cookies.set("csrftoken", "dummy", domain=".leetcode.com")
         self.session.headers.update({
@@ -55,12 +146,40 @@ class LeetCodeClient:
             "X-Requested-With": "XMLHttpRequest"
         })
     
-    def get_new_solved_problems(self, last_processed_time: Optional[str] = None) -> List[Dict]:
+    def get_new_solved_problems(self, last_processed_time: Optional[str] = None,
+                                watermarks: Optional[Dict[str, Dict[str, Dict]]] = None,
+                                pending: Optional[List[Dict]] = None,
+                                is_stored: Optional[Callable[[str, str], bool]] = None) -> List[Dict]:
+        """Fetch solved problems from LeetCode as one list (see iter_new_solved_problems)"""
+        return [problem for chunk in self.iter_new_solved_problems(last_processed_time, watermarks, pending, is_stored)
+                for problem in chunk]
+    
+    def iter_new_solved_problems(self, last_processed_time: Optional[str] = None,
+                                 watermarks: Optional[Dict[str, Dict[str, Dict]]] = None,
+                                 pending: Optional[List[Dict]] = None,
+                                 is_stored: Optional[Callable[[str, str], bool]] = None) -> Iterator[List[Dict]]:
         """
-        Fetch solved problems from LeetCode
+        Fetch solved problems from LeetCode, FETCH_CHUNK_SIZE submissions at a time
+        
+        Details and code are fetched for one chunk of new submissions while the
+        history is scanned, and the chunk is yielded before the scan goes on, so
+        only one chunk of code is held in memory. What grows with the number of
+        new submissions is the set of their ids (to skip overlapping pages).
+        
+        Submissions whose details could not be fetched are left in
+        self.failed_submissions (or, after MAX_PENDING_ATTEMPTS runs, in
+        self.dead_submissions), and the newest accepted submission time seen
+        in the scan in self.newest_accepted_at, so the caller can retry the
+        failures next run without rescanning the history.
         
         Args:
             last_processed_time: ISO timestamp to fetch problems after (None = fetch all)
+            watermarks: slug -> language -> {"submission_id", "solved_at"} of the newest
+                stored submission; anything at or below it is skipped
+            pending: Submissions that failed on an earlier run, retried first. They are
+                retried even when a newer submission has moved the watermark past them.
+            is_stored: (slug, submission id) -> whether that submission is already stored
+                as a version; pending submissions it reports stored are not refetched
             
         Returns:
             List of problem dictionaries with keys:
@@ -71,58 +190,499 @@ class LeetCodeClient:
             - leetcode_url: full URL to problem
             - language: programming language
             - code: solution code
+            - submission_id: LeetCode submission id
             - solved_at: ISO timestamp of when solved
+            
+            One dictionary per new accepted submission, so a problem re-solved
+            (or solved in another language) appears once per submission.
+            
+        Yields:
+            Lists of those dictionaries, one per chunk
         """
-        print(f"Fetching submissions for user: {self.username}")
-        
-        # Get all submissions
-        submissions = self._get_all_submissions()
-        
-        if not submissions:
-            print("No submissions found")
-            return []
+        logger.info(f"Fetching submissions for user: {self.username}")
         
-        # Filter to accepted submissions only
-        accepted_submissions = [s for s in submissions if s.get("statusDisplay") == "Accepted"]
-        print(f"Found {len(accepted_submissions)} accepted submissions")
+        self.failed_submissions = []
+        self.dead_submissions = []
+        self.newest_accepted_at = None
+        # A copy: the caller advances its watermarks as it stores each chunk, which must not
+        # hide older submissions of the same (slug, language) further down the history
+        watermarks = {slug: dict(marks) for slug, marks in (watermarks or {}).items()}
         
-        # Filter by time if specified
+        cutoff_timestamp = None
         if last_processed_time:
             cutoff_timestamp = int(datetime.fromisoformat(last_processed_time.replace("Z", "+00:00")).timestamp())
+        
+        # Get all submissions (lazily, page by page, in backfill mode)
+        if self.backfill:
+            logger.info("Backfill mode: paging through full submission history")
+            submissions = self.iter_submissions(cutoff_timestamp)
+        else:
+            submissions = self._get_all_submissions()
+        
+        # Filter to accepted submissions after the cutoff, streaming over the
+        # submissions; every accepted submission becomes a version of its problem
+        total_count = 0
+        accepted_count = 0
+        new_count = 0
+        seen = set()
+        chunk = []
+        for submission in submissions:
+            total_count += 1
+            if submission.get("statusDisplay") != "Accepted":
+                continue
+            accepted_count += 1
+            
             # Convert timestamp to int for comparison (it might be a string from API)
-            accepted_submissions = [
-                s for s in accepted_submissions 
-                if int(s.get("timestamp", 0)) > cutoff_timestamp
-            ]
-            print(f"Found {len(accepted_submissions)} new submissions after {last_processed_time}")
-        
-        if not accepted_submissions:
-            return []
-        
-        # Group by problem slug to get latest submission per problem
-        problems_by_slug = {}
-        for submission in accepted_submissions:
-            slug = submission.get("titleSlug")
             timestamp = int(submission.get("timestamp", 0))
+            if self.newest_accepted_at is None or timestamp > self.newest_accepted_at:
+                self.newest_accepted_at = timestamp
+            if cutoff_timestamp is not None and timestamp <= cutoff_timestamp:
+                continue
+            if not self._is_past_watermark(submission, watermarks):
+                continue
+            
+            # Tracked by submission id so overlapping pages never fetch the same code twice
+            submission_id = str(submission.get("id"))
+            if submission_id in seen:
+                continue
+            seen.add(submission_id)
+            new_count += 1
+            chunk.append(submission)
+            if len(chunk) >= self.FETCH_CHUNK_SIZE:
+                yield self._fetch_chunk(chunk)
+                chunk = []
+        
+        if total_count:
+            logger.info(f"Found {accepted_count} accepted submissions")
+            if last_processed_time:
+                logger.info(f"Found {new_count} new submissions after {last_processed_time}")
+        
+        # Retry earlier failures directly by submission id, regardless of the cutoff and of
+        # the watermark (a newer submission stored meanwhile moves it past older failures)
+        retries = 0
+        for submission in pending or []:
+            submission_id = str(submission.get("id"))
+            if submission_id in seen:
+                continue
+            if is_stored is not None and is_stored(submission.get("titleSlug"), submission_id):
+                continue
+            seen.add(submission_id)
+            chunk.append(submission)
+            retries += 1
+            if len(chunk) >= self.FETCH_CHUNK_SIZE:
+                yield self._fetch_chunk(chunk)
+                chunk = []
+        if retries:
+            logger.info(f"Retrying {retries} submission(s) that failed on earlier runs")
+        
+        if chunk:
+            yield self._fetch_chunk(chunk)
+        elif not seen and not total_count:
+            logger.info("No submissions found")
+        
+        if self.question_cache:
+            self.question_cache.save()
+    
+    def _fetch_chunk(self, submissions: List[Dict]) -> List[Dict]:
+        """Fetch details and code for one chunk of new submissions"""
+        items = [(submission.get("titleSlug"), submission) for submission in submissions]
+        slugs = list(dict.fromkeys(slug for slug, _ in items))
+        logger.info(f"Processing {len(items)} submissions across {len(slugs)} unique problems")
+        
+        # Fill the question cache in bulk before falling back to per-slug lookups
+        self._warm_question_cache(slugs)
+        
+        # Get full details for each submission
+        return self._fetch_problem_details(items)
+    
+    def _warm_question_cache(self, slugs: Iterable[str]):
+        """Prefetch the whole problem-set catalog when cached metadata is missing and stale"""
+        if not self.question_cache:
+            return
+        
+        slugs = list(slugs)
+        if not self.question_cache.missing(slugs):
+            logger.info("Question metadata served from cache")
+            return
+        
+        with self.question_cache.catalog_lock:
+            # Another client sharing the cache may have fetched the catalog meanwhile
+            if self.question_cache.missing(slugs) and self.question_cache.catalog_is_stale():
+                try:
+                    count = self.prefetch_question_catalog()
+                    logger.info(f"Prefetched {count} questions into the metadata cache")
+                except Exception as e:
+                    # Per-slug lookups still fill the gaps
+                    logger.warning(f"  ⚠ Question catalog prefetch failed: {e}")
+    
+    def prefetch_question_catalog(self) -> int:
+        """
+        Page through the public problem-set list and store every question in the cache
+        
+        Returns:
+            Number of questions cached
+        """
+        query = f"""
+        query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {{
+            problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {{
+                total: totalNum
+                questions: data {{{self.QUESTION_FIELDS}                }}
+            }}
+        }}
+        """
+        
+        fetched = 0
+        skip = 0
+        while True:
+            payload = {
+                "query": query,
+                "variables": {"categorySlug": "", "limit": self.CATALOG_PAGE_SIZE, "skip": skip, "filters": {}},
+                "operationName": "problemsetQuestionList"
+            }
+            data = self._post_graphql(payload)
+            if "errors" in data:
+                raise ValueError(f"GraphQL errors: {data['errors']}")
+            
+            page = (data.get("data") or {}).get("problemsetQuestionList") or {}
+            questions = page.get("questions") or []
+            self.question_cache.put_many({q["titleSlug"]: q for q in questions})
+            fetched += len(questions)
+            skip += len(questions)
             
-            if slug not in problems_by_slug or timestamp > int(problems_by_slug[slug].get("timestamp", 0)):
-                problems_by_slug[slug] = submission
+            if not questions or skip >= page.get("total", 0):
+                break
         
-        print(f"Processing {len(problems_by_slug)} unique problems")
+        self.question_cache.mark_catalog_fetched()
+        return fetched
+    
+    def _fetch_problem_details(self, items: List[Tuple[str, Dict]]) -> List[Dict]:
+        """
+        Fetch details for every submission, using up to max_workers threads
+        
+        Args:
+            items: (slug, accepted submission) pairs; a slug may appear more than once
+            
+        Returns:
+            Problem dictionaries in the same order as items
+        """
+        workers = min(self.max_workers, len(items))
+        
+        if self.batch_size > 1:
+            results = self._fetch_problem_details_batched(items)
+        elif workers <= 1:
+            results = [self._process_submission(slug, submission) for slug, submission in items]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map() yields in submission order, keeping output deterministic
+                results = list(executor.map(lambda item: self._process_submission(*item), items))
         
-        # Get full details for each problem
         problems = []
-        for slug, submission in problems_by_slug.items():
+        for (_, submission), (slug, problem_details, error) in zip(items, results):
+            if error is not None:
+                logger.error(f"  ✗ Failed to process {slug}: {error}")
+            if problem_details:
+                problems.append(problem_details)
+                logger.info(f"  ✓ {problem_details['title']} ({problem_details['language']})")
+            else:
+                self._record_failure(submission)
+        
+        return problems
+    
+    def _record_failure(self, submission: Dict):
+        """Keep a failed submission for the next run, or dead-letter it after MAX_PENDING_ATTEMPTS"""
+        failure = {key: submission.get(key) for key in self.SUBMISSION_KEYS}
+        failure["attempts"] = int(submission.get("attempts", 0)) + 1
+        if failure["attempts"] >= self.MAX_PENDING_ATTEMPTS:
+            logger.error(f"  ✗ Submission {failure['id']} ({failure['titleSlug']}) failed {failure['attempts']} times; "
+                         f"moved to the dead-letter list (retry it with sync.py --retry-dead)")
+            self.dead_submissions.append(failure)
+            return
+        self.failed_submissions.append(failure)
+    
+    @staticmethod
+    def _is_past_watermark(submission: Dict, watermarks: Dict[str, Dict[str, Dict]]) -> bool:
+        """True when a submission is newer than the newest stored one for its (slug, language)"""
+        mark = watermarks.get(submission.get("titleSlug"), {}).get((submission.get("lang") or "python3").lower())
+        if not mark:
+            return True
+        try:
+            return int(submission["id"]) > int(mark["submission_id"])
+        except (KeyError, TypeError, ValueError):
+            # No comparable ids: fall back to the submission time
+            stored = int(datetime.fromisoformat(mark["solved_at"].replace("Z", "+00:00")).timestamp())
+            return int(submission.get("timestamp", 0)) > stored
+    
+    def _process_submission(self, slug: str, submission: Dict) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+        """Fetch details for one problem, isolating any failure to that slug"""
+        try:
+            return slug, self._get_problem_details(slug, submission), None
+        except RequestFailed:
+            raise
+        except Exception as e:
+            return slug, None, e
+    
+    def _fetch_problem_details_batched(self, items: List[Tuple[str, Dict]]) -> List[Tuple[str, Optional[Dict], Optional[Exception]]]:
+        """Fetch question metadata and submission code for all items through aliased batch queries"""
+        questions = self._get_questions_batch([slug for slug, _ in items])
+        codes = self._get_submission_codes_batch([str(submission["id"]) for _, submission in items])
+        
+        results = []
+        for slug, submission in items:
             try:
-                problem_details = self._get_problem_details(slug, submission)
-                if problem_details:
-                    problems.append(problem_details)
-                    print(f"  ✓ {problem_details['title']} ({problem_details['language']})")
+                question = questions.get(slug)
+                code = codes.get(str(submission["id"]))
+                if question and not code:
+                    logger.warning(f"    Warning: No code found for {slug}")
+                results.append((slug, self._build_problem(slug, submission, question, code), None))
             except Exception as e:
-                print(f"  ✗ Failed to process {slug}: {e}")
-                continue
+                results.append((slug, None, e))
         
-        return problems
+        return results
+    
+    def _get_questions_batch(self, slugs: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch question metadata for many slugs, packing them into aliased requests"""
+        cached = {}
+        if self.question_cache:
+            cached = {slug: self.question_cache.get(slug) for slug in slugs}
+            cached = {slug: question for slug, question in cached.items() if question}
+            slugs = [slug for slug in slugs if slug not in cached]
+        
+        def build(chunk: List[str]) -> Dict:
+            params = ", ".join(f"$s{i}: String!" for i in range(len(chunk)))
+            fields = "\n".join(
+                f"            q{i}: question(titleSlug: $s{i}) {{{self.QUESTION_FIELDS}            }}"
+                for i in range(len(chunk))
+            )
+            return {
+                "query": f"query batchQuestionDetail({params}) {{\n{fields}\n        }}",
+                "variables": {f"s{i}": slug for i, slug in enumerate(chunk)},
+                "operationName": "batchQuestionDetail"
+            }
+        
+        fetched = self._run_batched(slugs, build, "q", self._get_question)
+        if self.question_cache:
+            self.question_cache.put_many(fetched)
+        
+        return {**cached, **fetched}
+    
+    def _get_submission_codes_batch(self, submission_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Fetch code for many submissions, packing them into aliased requests"""
+        def build(chunk: List[str]) -> Dict:
+            params = ", ".join(f"$i{i}: Int!" for i in range(len(chunk)))
+            fields = "\n".join(
+                f"            s{i}: submissionDetails(submissionId: $i{i}) {{{self.SUBMISSION_FIELDS}            }}"
+                for i in range(len(chunk))
+            )
+            return {
+                "query": f"query batchSubmissionDetails({params}) {{\n{fields}\n        }}",
+                "variables": {f"i{i}": int(submission_id) for i, submission_id in enumerate(chunk)},
+                "operationName": "batchSubmissionDetails"
+            }
+        
+        results = self._run_batched(submission_ids, build, "s", self._get_submission_code)
+        return {
+            submission_id: value.get("code") if isinstance(value, dict) else value
+            for submission_id, value in results.items()
+        }
+    
+    def _run_batched(self, items: List[str], build: Callable[[List[str]], Dict], alias_prefix: str,
+                     fetch_one: Callable[[str], object]) -> Dict[str, object]:
+        """
+        Resolve items through aliased batch requests, spread over max_workers threads
+        
+        Args:
+            items: Keys to resolve (slugs or submission ids)
+            build: Builds the GraphQL payload for a chunk of items
+            alias_prefix: Prefix of the per-item aliases in the response ("q" -> q0, q1, ...)
+            fetch_one: Single-item request used when an alias comes back with an error
+            
+        Returns:
+            Mapping of item to its resolved value (None when it could not be fetched)
+        """
+        unique_items = list(dict.fromkeys(items))
+        results = {}
+        cursor = [0]
+        
+        def next_chunk() -> List[str]:
+            with self._batch_lock:
+                start = cursor[0]
+                chunk = unique_items[start:start + self._current_batch_size]
+                cursor[0] += len(chunk)
+                return chunk
+        
+        def worker():
+            while True:
+                chunk = next_chunk()
+                if not chunk:
+                    return
+                results.update(self._resolve_chunk(chunk, build, alias_prefix, fetch_one))
+        
+        batches = -(-len(unique_items) // self._current_batch_size) if unique_items else 0
+        workers = min(self.max_workers, batches)
+        if workers <= 1:
+            worker()
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(worker) for _ in range(workers)]:
+                    future.result()
+        
+        return results
+    
+    def _resolve_chunk(self, chunk: List[str], build: Callable[[List[str]], Dict], alias_prefix: str,
+                       fetch_one: Callable[[str], object]) -> Dict[str, object]:
+        """Send one aliased request, splitting it on failure and falling back per item on partial errors"""
+        if len(chunk) == 1:
+            return {chunk[0]: fetch_one(chunk[0])}
+        
+        try:
+            data = self._post_graphql(build(chunk))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            data = {"errors": [{"message": str(e)}]}
+        
+        aliased = data.get("data") or {}
+        errored_aliases = {
+            error["path"][0]
+            for error in data.get("errors", [])
+            if error.get("path")
+        }
+        
+        if not aliased:
+            # The whole batch failed: shrink future batches and retry this one in halves
+            logger.warning(f"    Batch of {len(chunk)} failed, splitting: {data.get('errors')}")
+            self._adapt_batch_size(success=False)
+            middle = len(chunk) // 2
+            results = self._resolve_chunk(chunk[:middle], build, alias_prefix, fetch_one)
+            results.update(self._resolve_chunk(chunk[middle:], build, alias_prefix, fetch_one))
+            return results
+        
+        results = {}
+        for i, item in enumerate(chunk):
+            alias = f"{alias_prefix}{i}"
+            value = aliased.get(alias)
+            if value is None or alias in errored_aliases:
+                # Partial error: re-request just this item on its own
+                value = fetch_one(item)
+            results[item] = value
+        
+        self._adapt_batch_size(success=not errored_aliases)
+        return results
+    
+    def _adapt_batch_size(self, success: bool):
+        """Grow the batch size after clean batches and halve it after failures"""
+        with self._batch_lock:
+            if success:
+                self._current_batch_size = min(self.batch_size, self._current_batch_size * 2)
+            else:
+                self._current_batch_size = max(1, self._current_batch_size // 2)
+    
+    def _post_graphql(self, payload: Dict) -> Dict:
+        """POST a GraphQL payload and return the decoded JSON body"""
+        response = self._send_graphql(payload)
+        response.raise_for_status()
+        return response.json()
+    
+    def _send_graphql(self, payload: Dict) -> requests.Response:
+        """
+        POST a GraphQL payload through the request scheduler, counting every attempt
+        
+        Raises:
+            RequestFailed: The request could not be completed after retries
+        """
+        operation = payload.get("operationName") or "anonymous"
+        body = json.dumps(payload).encode("utf-8")
+        
+        def send(timeout: float) -> requests.Response:
+            with self._batch_lock:
+                self.request_count += 1
+            start = time.perf_counter()
+            try:
+                response = self.session.post(
+                    self.graphql_url,
+                    data=body,
+                    timeout=timeout
+                )
+            except requests.exceptions.RequestException:
+                self.metrics.record_request(operation, time.perf_counter() - start, len(body), 0, "error")
+                raise
+            self.metrics.record_request(operation, time.perf_counter() - start, len(body),
+                                        len(response.content), response.status_code)
+            return response
+        
+        return self.scheduler.execute(send)
+    
+    def iter_submissions(self, since_timestamp: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lazily page through the user's complete submission history, newest first
+        
+        Only one page is held in memory at a time. Paging stops as soon as a
+        submission at or before since_timestamp is reached.
+        
+        Args:
+            since_timestamp: Unix timestamp watermark (None = walk the whole history)
+            
+        Yields:
+            Submission dictionaries (all statuses) with id, title, titleSlug,
+            timestamp, statusDisplay and lang
+            
+        Raises:
+            HistoryScanError: A page failed (e.g. an expired session or a GraphQL error);
+                the history past it was not read, so the caller must not treat the
+                scan as complete
+        """
+        query = """
+        query submissionList($offset: Int!, $limit: Int!, $lastKey: String, $questionSlug: String) {
+            submissionList(offset: $offset, limit: $limit, lastKey: $lastKey, questionSlug: $questionSlug) {
+                lastKey
+                hasNext
+                submissions {
+                    id
+                    title
+                    titleSlug
+                    timestamp
+                    statusDisplay
+                    lang
+                }
+            }
+        }
+        """
+        
+        offset = 0
+        last_key = None
+        
+        while True:
+            payload = {
+                "query": query,
+                "variables": {
+                    "offset": offset,
+                    "limit": self.BACKFILL_PAGE_SIZE,
+                    "lastKey": last_key,
+                    "questionSlug": ""
+                },
+                "operationName": "submissionList"
+            }
+            
+            try:
+                data = self._post_graphql(payload)
+            except (requests.exceptions.RequestException, RequestFailed, ValueError) as e:
+                raise HistoryScanError(f"submission page at offset {offset} failed: {e}") from e
+            
+            if "errors" in data:
+                raise HistoryScanError(f"submission page at offset {offset} failed: GraphQL errors: {data['errors']}")
+            
+            page = (data.get("data") or {}).get("submissionList") or {}
+            submissions = page.get("submissions") or []
+            
+            for submission in submissions:
+                if since_timestamp is not None and int(submission.get("timestamp", 0)) <= since_timestamp:
+                    # History is newest first: everything after this is already synced
+                    return
+                yield submission
+            
+            if not submissions or not page.get("hasNext"):
+                return
+            
+            offset += len(submissions)
+            last_key = page.get("lastKey")
     
     def _get_all_submissions(self) -> List[Dict]:
         """Fetch all submissions for the user"""
@@ -157,23 +717,19 @@ class LeetCodeClient:
             }
             
             try:
-                response = self.session.post(
-                    self.GRAPHQL_URL,
-                    json=payload,
-                    timeout=30
-                )
+                response = self._send_graphql(payload)
                 
                 # Print response for debugging
                 if response.status_code != 200:
-                    print(f"Response status: {response.status_code}")
-                    print(f"Response body: {response.text[:500]}")
+                    logger.warning(f"Response status: {response.status_code}")
+                    logger.warning(f"Response body: {response.text[:500]}")
                 
                 response.raise_for_status()
                 data = response.json()
                 
                 # Check for GraphQL errors
                 if "errors" in data:
-                    print(f"GraphQL errors: {data['errors']}")
+                    logger.warning(f"GraphQL errors: {data['errors']}")
                     break
                 
                 submissions = data.get("data", {}).get("recentAcSubmissionList", [])
@@ -188,42 +744,17 @@ class LeetCodeClient:
                 break
                 
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching submissions: {e}")
+                logger.error(f"Error fetching submissions: {e}")
                 if hasattr(e, 'response') and e.response is not None:
-                    print(f"Response content: {e.response.text[:500]}")
+                    logger.warning(f"Response content: {e.response.text[:500]}")
                 break
         
         return all_submissions
     
     def _get_problem_details(self, slug: str, submission: Dict) -> Optional[Dict]:
         """Get full details for a specific problem"""
-        
-        # Get problem metadata (difficulty, tags, etc.)
-        query = """
-        query getQuestionDetail($titleSlug: String!) {
-            question(titleSlug: $titleSlug) {
-                questionId
-                title
-                titleSlug
-                difficulty
-                topicTags {
-                    name
-                }
-            }
-        }
-        """
-        
-        variables = {"titleSlug": slug}
-        
         try:
-            response = self.session.post(
-                self.GRAPHQL_URL,
-                json={"query": query, "variables": variables}
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            question = data.get("data", {}).get("question", {})
+            question = self._get_question(slug)
             
             if not question:
                 return None
@@ -232,40 +763,77 @@ class LeetCodeClient:
             code = self._get_submission_code(submission["id"])
             
             if not code:
-                print(f"    Warning: No code found for {slug}")
+                logger.warning(f"    Warning: No code found for {slug}")
                 return None
             
-            # Normalize language name
-            language = submission.get("lang", "python3").lower()
-            
-            # Get file extension
-            extension = self.LANG_EXTENSIONS.get(language, "txt")
-            
-            # Handle timestamp - could be int or string
-            timestamp = submission.get("timestamp")
-            if isinstance(timestamp, str):
-                try:
-                    timestamp = int(timestamp)
-                except (ValueError, TypeError):
-                    # If it's already an ISO string, use current time
-                    timestamp = int(datetime.now().timestamp())
-            
-            return {
-                "slug": slug,
-                "title": question["title"],
-                "difficulty": question["difficulty"],
-                "tags": [tag["name"] for tag in question.get("topicTags", [])],
-                "leetcode_url": f"https://leetcode.com/problems/{slug}/",
-                "language": language,
-                "extension": extension,
-                "code": code,
-                "solved_at": datetime.fromtimestamp(timestamp).isoformat() + "Z"
-            }
+            return self._build_problem(slug, submission, question, code)
             
+        except RequestFailed:
+            raise
         except Exception as e:
-            print(f"    Error getting details for {slug}: {e}")
+            logger.error(f"    Error getting details for {slug}: {e}")
             return None
     
+    def _get_question(self, slug: str) -> Optional[Dict]:
+        """Get problem metadata (difficulty, tags, etc.) for a single slug"""
+        if self.question_cache:
+            cached = self.question_cache.get(slug)
+            if cached:
+                return cached
+        
+        query = f"""
+        query getQuestionDetail($titleSlug: String!) {{
+            question(titleSlug: $titleSlug) {{{self.QUESTION_FIELDS}            }}
+        }}
+        """
+        
+        variables = {"titleSlug": slug}
+        
+        try:
+            data = self._post_graphql({"query": query, "variables": variables})
+            question = data.get("data", {}).get("question") or None
+            if question and self.question_cache:
+                self.question_cache.put(slug, question)
+            return question
+        except RequestFailed:
+            raise
+        except Exception as e:
+            logger.error(f"    Error getting details for {slug}: {e}")
+            return None
+    
+    def _build_problem(self, slug: str, submission: Dict, question: Optional[Dict], code: Optional[str]) -> Optional[Dict]:
+        """Combine question metadata, submission info and code into a problem dictionary"""
+        if not question or not code:
+            return None
+        
+        # Normalize language name
+        language = submission.get("lang", "python3").lower()
+        
+        # Get file extension
+        extension = self.LANG_EXTENSIONS.get(language, "txt")
+        
+        # Handle timestamp - could be int or string
+        timestamp = submission.get("timestamp")
+        if isinstance(timestamp, str):
+            try:
+                timestamp = int(timestamp)
+            except (ValueError, TypeError):
+                # If it's already an ISO string, use current time
+                timestamp = int(datetime.now().timestamp())
+        
+        return {
+            "slug": slug,
+            "title": question["title"],
+            "difficulty": question["difficulty"],
+            "tags": [tag["name"] for tag in question.get("topicTags", [])],
+            "leetcode_url": f"https://leetcode.com/problems/{slug}/",
+            "language": language,
+            "extension": extension,
+            "code": code,
+            "submission_id": str(submission["id"]) if submission.get("id") is not None else None,
+            "solved_at": datetime.fromtimestamp(timestamp).isoformat() + "Z"
+        }
+    
     def _get_submission_code(self, submission_id: str) -> Optional[str]:
         """Get the code for a specific submission"""
         query = """
@@ -286,53 +854,106 @@ class LeetCodeClient:
         }
         
         try:
-            response = self.session.post(
-                self.GRAPHQL_URL,
-                json=payload,
-                timeout=30
-            )
+            response = self._send_graphql(payload)
             
             if response.status_code != 200:
-                print(f"    Submission code fetch failed: {response.status_code}")
-                print(f"    Response: {response.text[:300]}")
+                logger.warning(f"    Submission code fetch failed: {response.status_code}")
+                logger.warning(f"    Response: {response.text[:300]}")
                 return None
             
             data = response.json()
             
             if "errors" in data:
-                print(f"    GraphQL errors: {data['errors']}")
+                logger.warning(f"    GraphQL errors: {data['errors']}")
                 return None
             
             submission_detail = data.get("data", {}).get("submissionDetails", {})
             code = submission_detail.get("code")
             
             if not code:
-                print(f"    No code in response for submission {submission_id}")
+                logger.warning(f"    No code in response for submission {submission_id}")
             
             return code
             
+        except RequestFailed:
+            raise
         except Exception as e:
-            print(f"    Error getting submission code: {e}")
+            logger.error(f"    Error getting submission code: {e}")
             return None
 
 
-def get_new_solved_problems(state: Dict) -> List[Dict]:
+def get_new_solved_problems(state: Dict, question_cache_path: Optional[str] = None,
+                            writer: Optional[AtomicWriter] = None,
+                            credentials: Optional[Tuple[str, str]] = None,
+                            question_cache: Optional[QuestionCache] = None,
+                            scheduler: Optional[RequestScheduler] = None,
+                            metrics: Optional[SyncMetrics] = None,
+                            client: Optional[LeetCodeClient] = None,
+                            is_stored: Optional[Callable[[str, str], bool]] = None) -> List[Dict]:
+    """Main entry point for getting new solved problems as one list (see iter_new_solved_problems)"""
+    chunks = iter_new_solved_problems(state, question_cache_path, writer, credentials, question_cache, scheduler,
+                                      metrics, client, is_stored)
+    return [problem for chunk in chunks for problem in chunk]
+
+
+def iter_new_solved_problems(state: Dict, question_cache_path: Optional[str] = None,
+                             writer: Optional[AtomicWriter] = None,
+                             credentials: Optional[Tuple[str, str]] = None,
+                             question_cache: Optional[QuestionCache] = None,
+                             scheduler: Optional[RequestScheduler] = None,
+                             metrics: Optional[SyncMetrics] = None,
+                             client: Optional[LeetCodeClient] = None,
+                             is_stored: Optional[Callable[[str, str], bool]] = None) -> Iterator[List[Dict]]:
     """
-    Main entry point for getting new solved problems
+    Main entry point for getting new solved problems, a chunk at a time
     
     Args:
-        state: Dictionary with 'last_processed_submission_time' key
+        state: Sync state with 'last_processed_submission_time', 'watermarks' and
+            'pending_submissions'. Updated in place once the last chunk is consumed:
+            'pending_submissions' is replaced by this run's failures, those that ran out
+            of attempts are added to 'dead_submissions', and 'last_processed_submission_time'
+            advances to the newest accepted submission scanned (failures are retried from
+            the pending list).
+        question_cache_path: Path to the question metadata cache (None = no cache)
+        writer: Shared writer used to save the cache
+        credentials: (username, session cookie) to sync
+            (defaults to LEETCODE_USERNAME / LEETCODE_SESSION)
+        question_cache: Cache shared with other accounts (overrides question_cache_path)
+        scheduler: Rate limiter shared with other accounts
+        metrics: Collector for request statistics
+        client: Already constructed client to reuse with its warm session and caches
+            (credentials, question cache and scheduler are then ignored)
+        is_stored: (slug, submission id) -> whether that submission is already stored,
+            so pending retries that were stored meanwhile are skipped
         
-    Returns:
-        List of new problem dictionaries
+    Yields:
+        Lists of new problem dictionaries, at most LeetCodeClient.FETCH_CHUNK_SIZE each
+        
+    Raises:
+        HistoryScanError: A backfill page failed; state is left as it was, so the next
+            run scans the same history again
     """
-    username = os.getenv("LEETCODE_USERNAME")
-    session_cookie = os.getenv("LEETCODE_SESSION")
-    
-    if not username or not session_cookie:
-        raise ValueError("LEETCODE_USERNAME and LEETCODE_SESSION environment variables required")
-    
-    client = LeetCodeClient(username, session_cookie)
+    if client is None:
+        username, session_cookie = credentials or (os.getenv("LEETCODE_USERNAME"), os.getenv("LEETCODE_SESSION"))
+        
+        if not username or not session_cookie:
+            raise ValueError("LEETCODE_USERNAME and LEETCODE_SESSION environment variables required")
+        
+        if question_cache is None and question_cache_path:
+            question_cache = QuestionCache(question_cache_path, writer=writer)
+        client = LeetCodeClient(username, session_cookie, question_cache=question_cache, scheduler=scheduler,
+                                metrics=metrics)
+    elif metrics is not None:
+        client.metrics = metrics
     last_time = state.get("last_processed_submission_time")
     
-    return client.get_new_solved_problems(last_time)
+    yield from client.iter_new_solved_problems(last_time, state.get("watermarks"), state.get("pending_submissions"),
+                                               is_stored)
+    
+    state["pending_submissions"] = client.failed_submissions
+    if client.dead_submissions:
+        state["dead_submissions"] = (state.get("dead_submissions") or []) + client.dead_submissions
+    if client.newest_accepted_at is not None:
+        newest = datetime.fromtimestamp(client.newest_accepted_at).isoformat() + "Z"
+        if not last_time or newest > last_time:
+            state["last_processed_submission_time"] = newest
@@ -0,0 +1,141 @@
+"""
+Log Offsets - Slug -> byte offset map over an append-only JSONL log
+
+The map is saved as a snapshot (a JSON sidecar next to the log) covering the
+log up to some size. Loading reads the snapshot and then parses only the lines
+appended after it, so an append never rewrites the map: the snapshot is
+refreshed once the lines it does not cover pass REFRESH_BYTES, or after the
+log was rewritten. The snapshot also records a digest of CHECK_LINES lines
+spread over the part it covers, first and last included, so a log
+replaced underneath it (a checkout or merge that happens to keep the size) is
+detected and the map rebuilt from one scan of the log.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from atomic_io import AtomicWriter
+
+# Log bytes past the snapshot parsed on every load before the snapshot is rewritten
+REFRESH_BYTES = 256 * 1024
+
+# Lines whose bytes the snapshot's digest covers
+CHECK_LINES = 16
+
+
+class LogOffsets:
+    """Offset of the latest line per slug, and the number of lines, in the first log_size bytes of a log"""
+
+    def __init__(self, log_path: Path, sidecar_path: Path, writer: AtomicWriter):
+        """
+        Initialize log offsets
+
+        Args:
+            log_path: JSONL log whose lines each carry a "slug"
+            sidecar_path: Snapshot file
+            writer: Shared writer used for the snapshot
+        """
+        self.log_path = log_path
+        self.sidecar_path = sidecar_path
+        self.writer = writer
+        self.offsets: Dict[str, int] = {}
+        self.records = 0
+        self.log_size = 0
+        # Log bytes the saved snapshot covers, and whether it must be rewritten regardless
+        self._covered = 0
+        self._stale = True
+
+    def load(self, log_size: int, rescan: bool = False) -> bool:
+        """
+        Map the first log_size bytes of the log
+
+        Args:
+            log_size: Bytes of the log to map
+            rescan: Ignore the snapshot and scan the whole log
+
+        Returns:
+            False when the snapshot was missing, did not match the log or was ignored (the whole log was scanned)
+        """
+        self.log_size = log_size
+        snapshot = None if rescan else self._read_snapshot()
+        if snapshot is not None:
+            self.offsets = snapshot["offsets"]
+            self.records = snapshot["records"]
+            self._covered = snapshot["log_size"]
+            self._stale = False
+        else:
+            self.offsets = {}
+            self.records = 0
+            self._covered = 0
+            self._stale = True
+        self._scan(self._covered)
+        return snapshot is not None
+
+    def add(self, slug: str, offset: int, end: int):
+        """Record a line appended at offset, ending the log at end"""
+        self.offsets[slug] = offset
+        self.records += 1
+        self.log_size = end
+
+    def reset(self, offsets: Dict[str, int], log_size: int):
+        """Replace the map after the log was rewritten with one line per slug"""
+        self.offsets = offsets
+        self.records = len(offsets)
+        self.log_size = log_size
+        self._stale = True
+
+    def save(self):
+        """Write the snapshot when it is stale or the lines it does not cover passed REFRESH_BYTES"""
+        if not self._stale and self.log_size - self._covered < REFRESH_BYTES:
+            return
+        # Evenly spaced line starts from the first line to the last (always the latest for its slug)
+        starts = sorted(set(self.offsets.values()) | {0}) if self.log_size else []
+        picks = min(len(starts), CHECK_LINES)
+        check_offsets = sorted({starts[i * (len(starts) - 1) // max(1, picks - 1)] for i in range(picks)})
+        self.writer.write_json(self.sidecar_path, {
+            "log_size": self.log_size,
+            "records": self.records,
+            "check_offsets": check_offsets,
+            "check": self._digest_lines(check_offsets, self.log_size),
+            "offsets": self.offsets,
+        }, separators=(",", ":"))
+        self._covered = self.log_size
+        self._stale = False
+
+    def _read_snapshot(self) -> Optional[Dict]:
+        try:
+            with open(self.sidecar_path, 'r') as f:
+                snapshot = json.load(f)
+            if snapshot["log_size"] > self.log_size:
+                return None
+            if snapshot["check"] != self._digest_lines(snapshot["check_offsets"], snapshot["log_size"]):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return snapshot
+
+    def _digest_lines(self, offsets: List[int], log_size: int) -> str:
+        digest = hashlib.sha256()
+        if offsets:
+            with open(self.log_path, 'rb') as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    digest.update(f.readline(max(0, log_size - offset)))
+        return digest.hexdigest()[:16]
+
+    def _scan(self, start: int):
+        if start >= self.log_size:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            while offset < self.log_size:
+                line = f.readline(self.log_size - offset)
+                if not line:
+                    break
+                if line.strip():
+                    self.offsets[json.loads(line)["slug"]] = offset
+                    self.records += 1
+                offset += len(line)
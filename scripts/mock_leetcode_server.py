@@ -0,0 +1,562 @@
+"""
+Mock LeetCode Server - Local stand-in for the LeetCode GraphQL endpoint
+
+Answers the queries LeetCodeClient sends (recentAcSubmissions, submissionList,
+getQuestionDetail, submissionDetails, problemsetQuestionList and their aliased
+batch forms, plus the syncProbe change check) from a fixture file or a
+synthetic account, with optional latency, error and 429 injection. Point a
+sync at it with LEETCODE_GRAPHQL_URL.
+
+Usage:
+    python scripts/mock_leetcode_server.py --synthetic 10000 --latency-ms 20
+    python scripts/mock_leetcode_server.py --fixture metadata/mock_fixture.json --error-rate 0.05
+    python scripts/mock_leetcode_server.py --record recordings.json     # proxy to leetcode.com
+    python scripts/mock_leetcode_server.py --replay recordings.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class GraphQLField:
+    """One field of a parsed selection set"""
+
+    def __init__(self, name: str, alias: Optional[str], args: Dict[str, Any], selections: List["GraphQLField"]):
+        self.name = name
+        self.alias = alias or name
+        self.args = args
+        self.selections = selections
+
+
+class GraphQLParser:
+    """Minimal parser for the query documents LeetCodeClient sends (no fragments or directives)"""
+
+    TOKEN_PATTERN = re.compile(r'\s*(?:(\.\.\.)|("(?:[^"\\]|\\.)*")|(-?\d+(?:\.\d+)?)|([A-Za-z_]\w*)|(\$)|([{}()\[\]:!,=]))')
+
+    def __init__(self, query: str, variables: Dict[str, Any]):
+        self.tokens = [match.group(0).strip() for match in self.TOKEN_PATTERN.finditer(query)]
+        self.variables = variables
+        self.pos = 0
+
+    def parse(self) -> List[GraphQLField]:
+        """Return the top-level selections of the first operation"""
+        # Skip "query Name($var: Type, ...)" up to the opening brace
+        depth = 0
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+            elif token == "{" and depth == 0:
+                break
+            self.pos += 1
+        return self._selection_set()
+
+    def _next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _selection_set(self) -> List[GraphQLField]:
+        self._next()  # "{"
+        fields = []
+        while self._peek() != "}":
+            name = self._next()
+            alias = None
+            if self._peek() == ":":
+                self._next()
+                alias, name = name, self._next()
+            args = self._arguments() if self._peek() == "(" else {}
+            selections = self._selection_set() if self._peek() == "{" else []
+            fields.append(GraphQLField(name, alias, args, selections))
+            if self._peek() == ",":
+                self._next()
+        self._next()  # "}"
+        return fields
+
+    def _arguments(self) -> Dict[str, Any]:
+        self._next()  # "("
+        args = {}
+        while self._peek() != ")":
+            name = self._next()
+            self._next()  # ":"
+            args[name] = self._value()
+            if self._peek() == ",":
+                self._next()
+        self._next()  # ")"
+        return args
+
+    def _value(self) -> Any:
+        token = self._next()
+        if token == "$":
+            return self.variables.get(self._next())
+        if token == "{":
+            value = {}
+            while self._peek() != "}":
+                key = self._next()
+                self._next()  # ":"
+                value[key] = self._value()
+                if self._peek() == ",":
+                    self._next()
+            self._next()
+            return value
+        if token == "[":
+            value = []
+            while self._peek() != "]":
+                value.append(self._value())
+                if self._peek() == ",":
+                    self._next()
+            self._next()
+            return value
+        if token.startswith('"'):
+            return json.loads(token)
+        if token in ("true", "false"):
+            return token == "true"
+        if token == "null":
+            return None
+        try:
+            return int(token)
+        except ValueError:
+            try:
+                return float(token)
+            except ValueError:
+                return token  # enum value
+
+
+class MockDataset:
+    """Questions, submissions (newest first) and submission code served by the mock"""
+
+    LANGUAGES = ["python3", "cpp", "java"]
+    DIFFICULTIES = ["Easy", "Medium", "Hard"]
+    TAGS = ["Array", "String", "Hash Table", "Two Pointers", "Binary Search", "Dynamic Programming",
+            "Stack", "Tree", "Graph", "Sorting", "Greedy", "Matrix", "Heap (Priority Queue)", "Math"]
+
+    def __init__(self, questions: Dict[str, Dict], submissions: List[Dict], codes: Optional[Dict[str, str]] = None):
+        """
+        Initialize dataset
+
+        Args:
+            questions: titleSlug -> question (questionId, title, titleSlug, difficulty, topicTags)
+            submissions: Submissions newest first (id, title, titleSlug, timestamp, statusDisplay, lang)
+            codes: Submission id -> code (missing ids get generated code)
+        """
+        self.questions = questions
+        self.submissions = submissions
+        self.codes = codes or {}
+        self._by_id = {str(s["id"]): s for s in submissions}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def synthetic(cls, submissions: int = 10000, problems: Optional[int] = None,
+                  accept_rate: float = 0.7, seed: int = 0, start_timestamp: int = 1600000000) -> "MockDataset":
+        """Generate a deterministic account with the given number of submissions"""
+        rng = random.Random(seed)
+        problems = problems or max(50, min(3000, submissions // 3))
+
+        questions = {}
+        for i in range(problems):
+            slug = f"synthetic-problem-{i}"
+            questions[slug] = {
+                "questionId": str(i + 1),
+                "title": f"Synthetic Problem {i}",
+                "titleSlug": slug,
+                "difficulty": cls.DIFFICULTIES[i % 3],
+                "topicTags": [{"name": tag} for tag in rng.sample(cls.TAGS, rng.randint(1, 3))],
+            }
+
+        slugs = list(questions)
+        timestamp = start_timestamp
+        history = []
+        for i in range(submissions):
+            timestamp += rng.randint(60, 6 * 3600)
+            slug = rng.choice(slugs)
+            history.append({
+                "id": str(100000 + i),
+                "title": questions[slug]["title"],
+                "titleSlug": slug,
+                "timestamp": str(timestamp),
+                "statusDisplay": "Accepted" if rng.random() < accept_rate else "Wrong Answer",
+                "lang": rng.choice(cls.LANGUAGES),
+            })
+        history.reverse()
+
+        return cls(questions, history)
+
+    @classmethod
+    def load(cls, path: str) -> "MockDataset":
+        """Load a fixture file written by save()"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data.get("questions", {}), data.get("submissions", []), data.get("codes", {}))
+
+    def save(self, path: str):
+        """Write the dataset as a fixture file"""
+        with open(path, 'w') as f:
+            json.dump({"questions": self.questions, "submissions": self.submissions, "codes": self.codes}, f, indent=2)
+
+    def add_submission(self, slug: str, lang: str = "python3", status: str = "Accepted",
+                       code: Optional[str] = None, timestamp: Optional[int] = None) -> Dict:
+        """Record a new submission at the head of the history (for live-sync experiments)"""
+        with self._lock:
+            newest = int(self.submissions[0]["timestamp"]) if self.submissions else 0
+            submission_id = str(max([int(i) for i in self._by_id] or [100000]) + 1)
+            question = self.questions.get(slug) or {"title": slug.replace("-", " ").title()}
+            submission = {
+                "id": submission_id,
+                "title": question["title"],
+                "titleSlug": slug,
+                "timestamp": str(timestamp or max(newest + 1, int(time.time()))),
+                "statusDisplay": status,
+                "lang": lang,
+            }
+            self.submissions.insert(0, submission)
+            self._by_id[submission_id] = submission
+            if code is not None:
+                self.codes[submission_id] = code
+            return submission
+
+    def question(self, slug: str) -> Dict:
+        if slug not in self.questions:
+            raise LookupError(f"Question {slug} not found")
+        return self.questions[slug]
+
+    def submission_details(self, submission_id: Any) -> Dict:
+        submission = self._by_id.get(str(submission_id))
+        if submission is None:
+            raise LookupError(f"Submission {submission_id} not found")
+        code = self.codes.get(str(submission_id))
+        if code is None:
+            code = (f"class Solution:\n"
+                    f"    # {submission['titleSlug']} ({submission['lang']}), submission {submission_id}\n"
+                    f"    pass\n")
+        return {"code": code, "timestamp": int(submission["timestamp"])}
+
+    def recent_accepted(self, limit: int) -> List[Dict]:
+        accepted = []
+        for submission in self.submissions:
+            if submission["statusDisplay"] == "Accepted":
+                accepted.append(submission)
+                if len(accepted) >= limit:
+                    break
+        return accepted
+
+    def matched_user(self, username: str) -> Dict:
+        """Profile stats: distinct problems solved and accepted submissions per difficulty"""
+        solved = {}
+        submissions = {"All": 0, "Easy": 0, "Medium": 0, "Hard": 0}
+        for submission in self.submissions:
+            if submission["statusDisplay"] != "Accepted":
+                continue
+            difficulty = (self.questions.get(submission["titleSlug"]) or {}).get("difficulty", "Easy")
+            solved[submission["titleSlug"]] = difficulty
+            submissions["All"] += 1
+            submissions[difficulty] = submissions.get(difficulty, 0) + 1
+        counts = {"All": len(solved)}
+        for difficulty in solved.values():
+            counts[difficulty] = counts.get(difficulty, 0) + 1
+        return {
+            "username": username,
+            "submitStatsGlobal": {
+                "acSubmissionNum": [
+                    {"difficulty": difficulty, "count": counts.get(difficulty, 0), "submissions": total}
+                    for difficulty, total in submissions.items()
+                ]
+            },
+        }
+
+    def submission_page(self, offset: int, limit: int) -> Dict:
+        page = self.submissions[offset:offset + limit]
+        return {
+            "lastKey": str(offset + len(page)),
+            "hasNext": offset + len(page) < len(self.submissions),
+            "submissions": page,
+        }
+
+    def question_page(self, skip: int, limit: int) -> Dict:
+        questions = list(self.questions.values())
+        return {"totalNum": len(questions), "data": questions[skip:skip + limit]}
+
+
+class FaultInjector:
+    """Decides, per request, whether to add latency, fail or rate-limit"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: float = 1.0, alias_error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Initialize fault injector
+
+        Args:
+            latency_ms: Fixed delay added to every response
+            jitter_ms: Extra uniformly random delay
+            error_rate: Probability of an HTTP 500
+            rate_limit_rate: Probability of an HTTP 429 with Retry-After
+            retry_after: Retry-After value sent with 429s, in seconds
+            alias_error_rate: Probability that one aliased field in a batch returns an error
+            seed: Random seed for reproducible fault sequences
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.alias_error_rate = alias_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def http_failure(self) -> Optional[int]:
+        """Return a status code to fail with, or None"""
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def alias_failure(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.alias_error_rate
+
+
+class MockLeetCodeServer:
+    """Threaded HTTP server answering LeetCode GraphQL queries on localhost"""
+
+    def __init__(self, dataset: Optional[MockDataset] = None, faults: Optional[FaultInjector] = None,
+                 host: str = "127.0.0.1", port: int = 0, recordings: Optional[str] = None,
+                 record_upstream: Optional[str] = None):
+        """
+        Initialize mock server
+
+        Args:
+            dataset: Data to serve (defaults to an empty account)
+            faults: Fault injection settings (defaults to none)
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+            recordings: Recording file; responses in it are replayed, and in record mode it is written
+            record_upstream: Real GraphQL URL to proxy to and record from
+        """
+        self.dataset = dataset or MockDataset({}, [])
+        self.faults = faults or FaultInjector()
+        self.recordings_path = recordings
+        self.record_upstream = record_upstream
+        self.recordings = {}
+        if recordings and os.path.exists(recordings) and not record_upstream:
+            with open(recordings, 'r') as f:
+                self.recordings = json.load(f)
+        self.operation_counts = {}
+        self._stats_lock = threading.Lock()
+
+        self._httpd = _MockHTTPServer((host, port), _MockHandler)
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def start(self) -> "MockLeetCodeServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self.record_upstream and self.recordings_path:
+            with open(self.recordings_path, 'w') as f:
+                json.dump(self.recordings, f, indent=2, sort_keys=True)
+
+    def __enter__(self) -> "MockLeetCodeServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, payload: Dict) -> Tuple[int, Dict, Dict[str, str]]:
+        """Resolve one GraphQL payload into (status, body, extra headers)"""
+        operation = payload.get("operationName") or "anonymous"
+        with self._stats_lock:
+            self.operation_counts[operation] = self.operation_counts.get(operation, 0) + 1
+
+        time.sleep(self.faults.delay())
+
+        status = self.faults.http_failure()
+        if status == 429:
+            return 429, {"errors": [{"message": "Too many requests"}]}, {"Retry-After": str(self.faults.retry_after)}
+        if status is not None:
+            return status, {"errors": [{"message": "Injected server error"}]}, {}
+
+        key = self._recording_key(payload)
+        if self.record_upstream:
+            body = self._proxy(payload)
+            self.recordings[key] = body
+            return 200, body, {}
+        if key in self.recordings:
+            return 200, self.recordings[key], {}
+
+        return 200, self._resolve(payload), {}
+
+    def _resolve(self, payload: Dict) -> Dict:
+        try:
+            fields = GraphQLParser(payload.get("query", ""), payload.get("variables") or {}).parse()
+        except (IndexError, ValueError) as e:
+            return {"errors": [{"message": f"Syntax error: {e}"}]}
+
+        data = {}
+        errors = []
+        batched = len(fields) > 1
+        for field in fields:
+            try:
+                if batched and self.faults.alias_failure():
+                    raise LookupError("Injected field error")
+                data[field.alias] = self._project(self._root(field), field.selections)
+            except LookupError as e:
+                data[field.alias] = None
+                errors.append({"message": str(e), "path": [field.alias]})
+
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+    def _root(self, field: GraphQLField) -> Any:
+        args = field.args
+        if field.name == "question":
+            return self.dataset.question(args.get("titleSlug"))
+        if field.name == "submissionDetails":
+            return self.dataset.submission_details(args.get("submissionId"))
+        if field.name == "recentAcSubmissionList":
+            return self.dataset.recent_accepted(int(args.get("limit") or 20))
+        if field.name == "submissionList":
+            return self.dataset.submission_page(int(args.get("offset") or 0), min(20, int(args.get("limit") or 20)))
+        if field.name == "matchedUser":
+            return self.dataset.matched_user(args.get("username"))
+        if field.name == "questionList":
+            return self.dataset.question_page(int(args.get("skip") or 0), int(args.get("limit") or 50))
+        raise LookupError(f"Unsupported field {field.name}")
+
+    def _project(self, value: Any, selections: List[GraphQLField]) -> Any:
+        if not selections or value is None:
+            return value
+        if isinstance(value, list):
+            return [self._project(item, selections) for item in value]
+        return {field.alias: self._project(value.get(field.name), field.selections) for field in selections}
+
+    def _proxy(self, payload: Dict) -> Dict:
+        import requests
+
+        session_cookie = os.getenv("LEETCODE_SESSION", "")
+        response = requests.post(
+            self.record_upstream,
+            json=payload,
+            cookies={"LEETCODE_SESSION": session_cookie, "csrftoken": "dummy"},
+            headers={"Referer": "https://leetcode.com", "Origin": "https://leetcode.com"},
+            timeout=30,
+        )
+        return response.json()
+
+    @staticmethod
+    def _recording_key(payload: Dict) -> str:
+        return json.dumps([payload.get("operationName"), payload.get("variables") or {}], sort_keys=True)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._reply(400, {"errors": [{"message": "Invalid JSON"}]}, {})
+            return
+        status, body, headers = self.server.mock.handle(payload)
+        self._reply(status, body, headers)
+
+    def _reply(self, status: int, body: Dict, headers: Dict[str, str]):
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    """Run the mock server until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixture", help="dataset fixture to serve")
+    source.add_argument("--synthetic", type=int, metavar="N", help="generate an account with N submissions")
+    parser.add_argument("--seed", type=int, default=0, help="seed for synthetic data and faults")
+    parser.add_argument("--save-fixture", help="write the served dataset to this file and continue")
+    parser.add_argument("--record", metavar="FILE", help="proxy to --upstream and record responses to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay responses recorded in FILE")
+    parser.add_argument("--upstream", default="https://leetcode.com/graphql", help="real endpoint for --record")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--alias-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.fixture:
+        dataset = MockDataset.load(args.fixture)
+    elif args.synthetic:
+        dataset = MockDataset.synthetic(args.synthetic, seed=args.seed)
+    else:
+        dataset = MockDataset({}, [])
+    if args.save_fixture:
+        dataset.save(args.save_fixture)
+
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate,
+                           args.retry_after, args.alias_error_rate, seed=args.seed)
+    server = MockLeetCodeServer(dataset, faults, args.host, args.port,
+                                recordings=args.record or args.replay,
+                                record_upstream=args.upstream if args.record else None)
+
+    print(f"Mock LeetCode GraphQL server on {server.url}")
+    print(f"  {len(dataset.questions)} questions, {len(dataset.submissions)} submissions")
+    print(f"  export LEETCODE_GRAPHQL_URL={server.url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Requests by operation: {json.dumps(server.operation_counts, sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Multi-Account Sync - Syncs several LeetCode accounts concurrently into one repository
+
+Each account gets its own tree under accounts/<name>/ (solutions/, metadata/,
+README.md). All accounts share the question metadata cache and one request
+scheduler, so the team as a whole stays within the rate limit and a question
+fetched for one member is never fetched again for another. A combined
+LEADERBOARD.md is written at the repository root.
+
+With LEETCODE_GIT_COMMIT set, the accounts do not commit on their own (their
+commits would race on .git/index); once every account has finished, one commit
+covers the files written for all of them plus the shared cache and leaderboard.
+
+Config file (JSON):
+    {
+      "workers": 4,
+      "accounts": [
+        {"name": "alice", "username": "alice-lc", "session_env": "LEETCODE_SESSION_ALICE"},
+        {"name": "bob", "username": "bob-lc", "session_env": "LEETCODE_SESSION_BOB"}
+      ]
+    }
+
+Usage:
+    python scripts/multi_sync.py --config accounts.json [--workers 4] [--only alice]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from atomic_io import AtomicWriter
+from problem_index import ProblemIndex
+from question_cache import QuestionCache
+from request_scheduler import RequestScheduler
+from sync import LeetCodeSync, _load_env
+from sync_metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class MultiAccountSync:
+    """Runs LeetCodeSync for every configured account over a shared cache and rate limiter"""
+
+    DEFAULT_WORKERS = 4
+    ACCOUNTS_DIR = "accounts"
+
+    def __init__(self, repo_root: str, accounts: List[Dict], workers: Optional[int] = None):
+        """
+        Initialize multi-account sync
+
+        Args:
+            repo_root: Root directory of the repository
+            accounts: Account entries with name, username and session or session_env
+            workers: Accounts synced concurrently (defaults to DEFAULT_WORKERS)
+        """
+        self.repo_root = Path(repo_root)
+        self.accounts = accounts
+        self.workers = max(1, workers or self.DEFAULT_WORKERS)
+        self.accounts_dir = self.repo_root / self.ACCOUNTS_DIR
+        self.leaderboard_file = self.repo_root / "LEADERBOARD.md"
+        self.writer = AtomicWriter()
+        self.question_cache = QuestionCache(str(self.repo_root / "metadata" / "question_cache.json"), writer=self.writer)
+        self.scheduler = RequestScheduler()
+        self.git_commit = os.getenv("LEETCODE_GIT_COMMIT", "").lower() in ("1", "true", "yes")
+        # Writer of every account synced this run, for the combined commit
+        self._account_writers: Dict[str, AtomicWriter] = {}
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Sync accounts concurrently, then write the leaderboard over every account
+
+        Args:
+            names: Accounts to sync (None = all)
+
+        Returns:
+            Mapping of account name to its error message (None on success)
+        """
+        accounts = [account for account in self.accounts if names is None or account["name"] in names]
+        self._account_writers = {}
+        logger.info(f"Syncing {len(accounts)} account(s) with {self.workers} worker(s)")
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(accounts)) or 1) as executor:
+            results = dict(zip(
+                [account["name"] for account in accounts],
+                executor.map(self._sync_account, accounts),
+            ))
+
+        self.question_cache.save()
+        self.write_leaderboard()
+        self.writer.flush()
+        self._commit(results)
+
+        logger.info("\n" + "=" * 60)
+        for name, error in results.items():
+            if error is None:
+                logger.info(f"  ✓ {name}")
+            else:
+                logger.error(f"  ✗ {name}: {error}")
+        logger.info("=" * 60)
+        return results
+
+    def account_root(self, account: Dict) -> Path:
+        return self.accounts_dir / account["name"]
+
+    def _sync_account(self, account: Dict) -> Optional[str]:
+        """Sync one account, isolating its failure from the others"""
+        try:
+            credentials = (account["username"], self._session(account))
+            root = self.account_root(account)
+            (root / "metadata").mkdir(parents=True, exist_ok=True)
+            sync = LeetCodeSync(str(root), credentials, self.question_cache, self.scheduler, git_commit=False)
+            self._account_writers[account["name"]] = sync.writer
+            sync.run()
+            return None
+        except SystemExit as e:
+            # LeetCodeSync.run exits on fatal errors; that must not stop the other accounts
+            return f"sync exited with status {e.code}"
+        except Exception as e:
+            return str(e)
+
+    def _commit(self, results: Dict[str, Optional[str]]):
+        """Commit the files written for every account and the shared ones in a single commit, when enabled"""
+        if not self.git_commit:
+            return
+
+        from git_commit import GitCommitError, GitCommitter
+
+        writers = [self.writer, *self._account_writers.values()]
+        written = [path for writer in writers for path in writer.written_paths]
+        removed = [path for writer in writers for path in writer.removed_paths]
+        synced = [name for name, writer in self._account_writers.items() if writer.written_paths or writer.removed_paths]
+        message = f"Sync LeetCode: {', '.join(synced) or 'shared metadata'}\n"
+        if any(error is not None for error in results.values()):
+            failed = ", ".join(name for name, error in results.items() if error is not None)
+            message += f"\nFailed accounts (partial files included): {failed}\n"
+        try:
+            commit = GitCommitter(str(self.repo_root)).commit(written, removed, message)
+        except GitCommitError as e:
+            logger.error(f"✗ Error committing changes: {e}")
+            sys.exit(1)
+
+        if commit is None:
+            logger.info("✓ Nothing to commit")
+        else:
+            logger.info(f"✓ Committed {commit[:12]}: {message.splitlines()[0]}")
+
+    @staticmethod
+    def _session(account: Dict) -> str:
+        session = account.get("session") or os.getenv(account.get("session_env", ""), "")
+        if not session:
+            raise ValueError(f"no session cookie (set {account.get('session_env') or 'session'})")
+        return session
+
+    def write_leaderboard(self):
+        """Write LEADERBOARD.md ranking every account by problems solved"""
+        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        rows = []
+        for account in self.accounts:
+            log_path = self.account_root(account) / "metadata" / "problems_index.jsonl"
+            problems = ProblemIndex(str(log_path), writer=self.writer).all() if log_path.exists() else []
+            by_difficulty = {"Easy": 0, "Medium": 0, "Hard": 0}
+            for problem in problems:
+                by_difficulty[problem.get("difficulty")] = by_difficulty.get(problem.get("difficulty"), 0) + 1
+            rows.append({
+                "name": account["name"],
+                "username": account["username"],
+                "solved": len(problems),
+                "this_week": sum(1 for p in problems if p.get("first_solved_at", p.get("solved_at", "")) >= week_ago),
+                "last_solved": max((p.get("solved_at", "") for p in problems), default=""),
+                **by_difficulty,
+            })
+
+        rows.sort(key=lambda row: (-row["solved"], -row["Hard"], -row["Medium"], row["name"]))
+        lines = [
+            "# Team Leaderboard",
+            "",
+            "| Rank | Member | Solved | Easy | Medium | Hard | Last 7 Days | Last Solved |",
+            "|------|--------|--------|------|--------|------|-------------|-------------|",
+        ]
+        for rank, row in enumerate(rows, start=1):
+            lines.append(
+                f"| {rank} | [{row['name']}]({self.ACCOUNTS_DIR}/{row['name']}/README.md) "
+                f"([{row['username']}](https://leetcode.com/u/{row['username']}/)) "
+                f"| {row['solved']} | {row['Easy']} | {row['Medium']} | {row['Hard']} "
+                f"| {row['this_week']} | {row['last_solved'][:10]} |"
+            )
+        self.writer.write_text(self.leaderboard_file, "\n".join(lines) + "\n")
+        logger.info(f"✓ Updated {self.leaderboard_file.name} ({len(rows)} account(s))")
+
+
+def load_accounts(config_path: str) -> Dict:
+    """Load and validate the multi-account config file"""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    accounts = config.get("accounts") or []
+    names = [account.get("name") for account in accounts]
+    if not accounts or not all(names) or not all(account.get("username") for account in accounts):
+        raise ValueError(f"{config_path}: every account needs a name and a username")
+    if len(set(names)) != len(names):
+        raise ValueError(f"{config_path}: account names must be unique")
+    return config
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=str(repo_root / "accounts.json"), help="multi-account config file")
+    parser.add_argument("--workers", type=int, help="accounts synced concurrently")
+    parser.add_argument("--only", action="append", metavar="NAME", help="sync only these accounts (repeatable)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    configure_logging(args.log_format == "json")
+    _load_env(repo_root)
+
+    config = load_accounts(args.config)
+    results = MultiAccountSync(str(repo_root), config["accounts"], args.workers or config.get("workers")).run(args.only)
+    if any(error is not None for error in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
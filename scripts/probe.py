@@ -0,0 +1,135 @@
+"""
+Change Probe - One tiny GraphQL request that tells whether a full sync is needed
+
+Asks for the user's accepted-submission counts and newest accepted submission.
+The answer (a fingerprint) is compared with the one stored in state.json by the
+last successful sync; when they match there is nothing new to fetch. Only the
+standard library is used, so a no-op run never pays for importing requests.
+
+Usage:
+    python scripts/probe.py            # exit 0 = unchanged, 1 = changed or unknown
+"""
+
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_GRAPHQL_URL = "https://leetcode.com/graphql"
+
+PROBE_QUERY = """
+query syncProbe($username: String!) {
+    matchedUser(username: $username) {
+        submitStatsGlobal {
+            acSubmissionNum {
+                difficulty
+                count
+                submissions
+            }
+        }
+    }
+    recentAcSubmissionList(username: $username, limit: 1) {
+        id
+        timestamp
+    }
+}
+"""
+
+
+class ProbeError(Exception):
+    """The probe request failed or returned something unusable"""
+
+
+def fetch_fingerprint(username: str, graphql_url: Optional[str] = None, timeout: float = 10.0, session=None) -> Dict:
+    """
+    Fetch the account's current change fingerprint
+
+    Args:
+        username: LeetCode username (both fields are public, so no session is needed)
+        graphql_url: Endpoint to query (defaults to LEETCODE_GRAPHQL_URL or DEFAULT_GRAPHQL_URL)
+        timeout: Seconds to wait for the response
+        session: requests.Session to send the probe through, reusing its open connection
+            (by default a one-off urllib request is made)
+
+    Returns:
+        {"accepted": {difficulty: [solved, accepted submissions]}, "newest_id", "newest_timestamp"}
+
+    Raises:
+        ProbeError: The request failed or the user was not found
+    """
+    url = graphql_url or os.getenv("LEETCODE_GRAPHQL_URL") or DEFAULT_GRAPHQL_URL
+    body = json.dumps({
+        "query": PROBE_QUERY,
+        "variables": {"username": username},
+        "operationName": "syncProbe",
+    }).encode("utf-8")
+    request = urllib.request.Request(url, data=body, method="POST", headers={
+        "Content-Type": "application/json",
+        "Referer": "https://leetcode.com",
+        "Origin": "https://leetcode.com",
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    })
+
+    try:
+        if session is not None:
+            response = session.post(url, data=body, headers=dict(request.header_items()), timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+        else:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                data = json.loads(response.read())
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise ProbeError(f"probe request failed: {e}") from e
+
+    result = data.get("data") or {}
+    user = result.get("matchedUser")
+    if data.get("errors") or not user:
+        raise ProbeError(f"probe returned no data for {username}: {data.get('errors')}")
+
+    accepted = {
+        entry["difficulty"]: [entry.get("count"), entry.get("submissions")]
+        for entry in (user.get("submitStatsGlobal") or {}).get("acSubmissionNum") or []
+    }
+    newest = (result.get("recentAcSubmissionList") or [{}])[0]
+    return {
+        "accepted": accepted,
+        "newest_id": str(newest["id"]) if newest.get("id") is not None else None,
+        "newest_timestamp": int(newest["timestamp"]) if newest.get("timestamp") is not None else None,
+    }
+
+
+def is_unchanged(state: Dict, fingerprint: Dict) -> bool:
+    """True when the last successful sync saw this exact fingerprint and left nothing to retry"""
+    return state.get("probe") == fingerprint and not state.get("pending_submissions")
+
+
+def main():
+    """Probe the account configured in the environment against metadata/state.json"""
+    state_file = Path(__file__).parent.parent / "metadata" / "state.json"
+    username = os.getenv("LEETCODE_USERNAME")
+    if not username:
+        sys.exit("LEETCODE_USERNAME is required")
+
+    state = {}
+    if state_file.exists():
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+
+    try:
+        fingerprint = fetch_fingerprint(username)
+    except ProbeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if is_unchanged(state, fingerprint):
+        print("✓ Unchanged since the last sync")
+        return
+    print(f"Changed: {json.dumps(fingerprint)}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Problem Index - Append-only JSONL log of solved-problem records
+
+Each sync appends one JSON line per new or updated problem to
+metadata/problems_index.jsonl. A sidecar (problems_index.offsets.json, see
+log_offsets) maps every slug to the byte offset of its latest record, so
+membership checks and lookups never parse the whole log, and appends do not
+rewrite the sidecar until the records past it add up. Compaction folds superseded
+records, and export writes the legacy problems_index.json layout.
+
+Usage:
+    python scripts/problem_index.py compact
+    python scripts/problem_index.py export [--output metadata/problems_index.json]
+    python scripts/problem_index.py get two-sum
+    python scripts/problem_index.py history two-sum [--show 2]
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, KeysView, List, Optional
+
+from atomic_io import AtomicWriter
+from log_offsets import LogOffsets
+
+logger = logging.getLogger(__name__)
+
+
+class ProblemIndex:
+    """Append-only problem index with an O(1) slug -> offset sidecar"""
+
+    # Compact automatically once superseded records outnumber this fraction of live ones
+    COMPACTION_RATIO = 0.5
+    COMPACTION_MIN_SUPERSEDED = 100
+
+    def __init__(self, log_path: str, offsets_path: Optional[str] = None, legacy_json_path: Optional[str] = None,
+                 writer: Optional[AtomicWriter] = None):
+        """
+        Initialize problem index
+
+        Args:
+            log_path: Path to problems_index.jsonl
+            offsets_path: Path to the slug -> offset sidecar
+                (defaults to problems_index.offsets.json next to the log)
+            legacy_json_path: problems_index.json to import from when the log does not exist yet
+            writer: Shared writer used for the sidecar and exports
+        """
+        self.writer = writer or AtomicWriter()
+        self.log_path = Path(log_path)
+        self.offsets_path = Path(offsets_path) if offsets_path else self.log_path.with_name(
+            self.log_path.name.replace(".jsonl", "") + ".offsets.json")
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
+
+        if not self.log_path.exists() and self.legacy_json_path and self.legacy_json_path.exists():
+            self._import_legacy()
+
+        self._offsets = LogOffsets(self.log_path, self.offsets_path, self.writer)
+        self._load_offsets()
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self._offsets.offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets.offsets)
+
+    def slugs(self) -> KeysView:
+        """All slugs in the index"""
+        return self._offsets.offsets.keys()
+
+    @property
+    def log_size(self) -> int:
+        """Size of the log in bytes as of the last append or compaction"""
+        return self._offsets.log_size
+
+    @property
+    def superseded(self) -> int:
+        """Number of records in the log that a later record for the same slug replaced"""
+        return self._offsets.records - len(self)
+
+    def get(self, slug: str) -> Optional[Dict]:
+        """Return the latest record for slug by seeking straight to its offset"""
+        offset = self._offsets.offsets.get(slug)
+        if offset is None:
+            return None
+        record = self._read_at(offset)
+        if record is None or record.get("slug") != slug:
+            # The log changed under the sidecar without being caught on load: rebuild the map and retry
+            logger.warning(f"  ⚠ Offset sidecar out of step with {self.log_path.name}; rescanning the log")
+            self._load_offsets(rescan=True)
+            offset = self._offsets.offsets.get(slug)
+            record = None if offset is None else self._read_at(offset)
+        return record
+
+    def append(self, records: List[Dict]):
+        """Append records to the log; a record for an existing slug supersedes the old one"""
+        if not records:
+            return
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'ab') as f:
+            start = f.tell()
+            for record in records:
+                offset = f.tell()
+                f.write(self._encode(record))
+                self._offsets.add(record["slug"], offset, f.tell())
+        self.writer.note_append(self.log_path, self._offsets.log_size - start)
+        self._offsets.save()
+
+    def all(self) -> List[Dict]:
+        """Latest record per slug, in order of each slug's first appearance"""
+        folded = {}
+        for record in self._scan():
+            folded[record["slug"]] = record
+        return list(folded.values())
+
+    def needs_compaction(self) -> bool:
+        return (self.superseded >= self.COMPACTION_MIN_SUPERSEDED
+                and self.superseded > self.COMPACTION_RATIO * len(self))
+
+    def compact(self) -> int:
+        """
+        Rewrite the log keeping only the latest record per slug
+
+        Returns:
+            Number of superseded records removed
+        """
+        removed = self.superseded
+        records = self.all()
+        offsets = {}
+        chunks = []
+        log_size = 0
+        for record in records:
+            offsets[record["slug"]] = log_size
+            encoded = self._encode(record)
+            chunks.append(encoded)
+            log_size += len(encoded)
+        self.writer.write_bytes(self.log_path, b"".join(chunks))
+
+        self._offsets.reset(offsets, log_size)
+        self._offsets.save()
+        return removed
+
+    def export_json(self, output_path: str):
+        """Write the folded index in the legacy {"problems": [...]} layout"""
+        self.writer.write_json(output_path, {"problems": self.all()}, indent=2)
+
+    def _scan(self) -> Iterator[Dict]:
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _import_legacy(self):
+        with open(self.legacy_json_path, 'r') as f:
+            problems = json.load(f).get("problems", [])
+        self.writer.write_bytes(self.log_path, b"".join(self._encode(record) for record in problems))
+        logger.info(f"  ✓ Imported {len(problems)} problems from {self.legacy_json_path.name} into {self.log_path.name}")
+
+    def _load_offsets(self, rescan: bool = False):
+        """Map the whole log, writing the sidecar again when it was missing, out of date or ignored"""
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        self._offsets.load(log_size, rescan)
+        self._offsets.save()
+
+    def _read_at(self, offset: int) -> Optional[Dict]:
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            line = f.readline()
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _encode(record: Dict) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def load_problems(index_path: str) -> List[Dict]:
+    """Load all problems from the JSONL log, the SQLite store or a legacy problems_index.json"""
+    if str(index_path).endswith(".jsonl"):
+        return ProblemIndex(index_path).all()
+    if str(index_path).endswith(".db"):
+        from index_db import ProblemStore
+
+        store = ProblemStore(index_path)
+        try:
+            return store.all_problems()
+        finally:
+            store.close()
+    with open(index_path, 'r') as f:
+        return json.load(f).get("problems", [])
+
+
+def main():
+    """Compact, export or query the problem index"""
+    metadata_dir = Path(__file__).parent.parent / "metadata"
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=str(metadata_dir / "problems_index.jsonl"), help="path to the JSONL log")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("compact", help="fold superseded records")
+    export_parser = subparsers.add_parser("export", help="write problems_index.json")
+    export_parser.add_argument("--output", default=str(metadata_dir / "problems_index.json"))
+    get_parser = subparsers.add_parser("get", help="print the latest record for a slug")
+    get_parser.add_argument("slug")
+    history_parser = subparsers.add_parser("history", help="list every stored version of a problem")
+    history_parser.add_argument("slug")
+    history_parser.add_argument("--show", type=int, metavar="N", help="print the code of version N")
+    args = parser.parse_args()
+
+    index = ProblemIndex(args.log)
+
+    if args.command == "compact":
+        removed = index.compact()
+        print(f"✓ Compacted {index.log_path.name}: removed {removed} superseded record(s), {len(index)} live")
+    elif args.command == "export":
+        index.export_json(args.output)
+        print(f"✓ Exported {len(index)} problems to {args.output}")
+    elif args.command == "get":
+        record = index.get(args.slug)
+        if record is None:
+            parser.exit(1, f"{args.slug} not found\n")
+        print(json.dumps(record, indent=2))
+    elif args.command == "history":
+        print_history(index, args.slug, args.show, parser)
+
+
+def print_history(index: ProblemIndex, slug: str, show: Optional[int], parser: argparse.ArgumentParser):
+    """List a problem's versions oldest first, marking the one the index points at"""
+    from solution_store import SolutionStore, legacy_versions
+
+    record = index.get(slug)
+    if record is None:
+        parser.exit(1, f"{slug} not found\n")
+    versions = record.get("versions") or legacy_versions(record)
+
+    if show is not None:
+        if not 1 <= show <= len(versions):
+            parser.exit(1, f"{slug} has {len(versions)} version(s)\n")
+        code = SolutionStore(str(index.log_path.parent.parent)).read(versions[show - 1])
+        if code is None:
+            parser.exit(1, f"version {show} of {slug} is not stored\n")
+        print(code)
+        return
+
+    current = record.get("code_hash")
+    for number, version in enumerate(versions, start=1):
+        marker = "*" if current and version.get("code_hash") == current and version.get("language") == record.get("language") else " "
+        print(f"{marker} {number:>3}  {(version.get('solved_at') or '')[:19]}  {version.get('language') or '':<10}  "
+              f"{(version.get('code_hash') or '-')[:12]:<12}  {version.get('path') or ''}")
+    distinct = len({version.get("code_hash") for version in versions if version.get("code_hash")})
+    print(f"{len(versions)} version(s), {distinct} distinct", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+Progress Stats - Running aggregates of solved problems, rendered into the README
+
+Keeps metadata/progress_stats.json up to date with:
+  difficulty / tags / languages   problems per value (every language a problem
+                                  was accepted in counts)
+  daily / weekly                  accepted submissions per UTC day and ISO week
+  runs                            maximal streaks of consecutive active days
+
+Each problem's last contribution is kept in an append-only log next to it
+(metadata/progress_contributions.jsonl, latest line per slug wins), with a
+slug -> offset sidecar (progress_contributions.offsets.json, see log_offsets).
+A sync reads back the old contribution of just the records it appended,
+subtracts it, adds the new one and appends only those: the cost grows with
+the number of new problems, not with the history. The aggregates record the
+log size they match; a longer log (a sync that stopped between the two
+writes) is cut back to it. A full recompute from the index happens only on
+demand (or when either file is missing).
+
+The README gets a summary, streaks (the current one counts only if it reaches
+today or yesterday, UTC), weekly and daily histograms and a
+calendar heatmap between the LEETCODE_STATS markers, inserted in front of the
+problems table when missing.
+
+Usage:
+    python scripts/progress_stats.py recompute    # rebuild from the whole index
+    python scripts/progress_stats.py show         # print the rendered section
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from atomic_io import AtomicWriter
+from log_offsets import LogOffsets
+from solution_store import legacy_versions
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 2
+
+# Compact the contributions log once superseded lines outnumber this fraction of live ones
+COMPACTION_RATIO = 0.5
+COMPACTION_MIN_SUPERSEDED = 100
+
+START_MARKER = "<!-- LEETCODE_STATS_START -->"
+END_MARKER = "<!-- LEETCODE_STATS_END -->"
+TABLE_MARKER = "<!-- LEETCODE_TABLE_START -->"
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+HISTOGRAM_WEEKS = 12
+HISTOGRAM_DAYS = 14
+HISTOGRAM_WIDTH = 30
+HEATMAP_WEEKS = 53
+
+# Heatmap cell for a day's accepted submissions: none, 1, 2, 3-4, 5 or more
+HEATMAP_LEVELS = ((5, "█"), (3, "▓"), (2, "▒"), (1, "░"), (0, "·"))
+WEEKDAYS = ("Mon", "", "Wed", "", "Fri", "", "Sun")
+
+
+def contribution(record: Dict) -> Dict:
+    """What one index record adds to the aggregates"""
+    versions = record.get("versions") or legacy_versions(record)
+    days = Counter(version["solved_at"][:10] for version in versions if version.get("solved_at"))
+    return {
+        "difficulty": record.get("difficulty", ""),
+        "tags": list(record.get("tags", [])),
+        "languages": sorted({version["language"] for version in versions if version.get("language")}),
+        "days": dict(sorted(days.items())),
+    }
+
+
+def iso_week(day: str) -> str:
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+def _run_length(run: List[str]) -> int:
+    return (date.fromisoformat(run[1]) - date.fromisoformat(run[0])).days + 1
+
+
+def _encode(slug: str, part: Dict) -> bytes:
+    return (json.dumps({"slug": slug, **part}, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ProgressStats:
+    """Running aggregates in metadata/progress_stats.json, per-problem contributions in a log beside it"""
+
+    def __init__(self, stats_path: str, writer: Optional[AtomicWriter] = None,
+                 contributions_path: Optional[str] = None):
+        """
+        Initialize progress stats
+
+        Args:
+            stats_path: Path to progress_stats.json
+            writer: Shared writer (an unchanged file is not rewritten)
+            contributions_path: Per-problem contributions log
+                (defaults to progress_contributions.jsonl next to stats_path)
+        """
+        self.stats_path = stats_path
+        self.contributions_path = Path(contributions_path) if contributions_path else \
+            Path(stats_path).with_name("progress_contributions.jsonl")
+        self.writer = writer or AtomicWriter()
+        self.data = self._empty()
+        self._offsets = LogOffsets(self.contributions_path,
+                                   self.contributions_path.with_name(self.contributions_path.stem + ".offsets.json"),
+                                   self.writer)
+        # Contributions changed since loading (appended on save)
+        self._changed: Dict[str, Dict] = {}
+        self._rewrite_log = True
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {
+            "version": STATS_VERSION,
+            "submissions": 0,
+            "difficulty": {},
+            "tags": {},
+            "languages": {},
+            "daily": {},
+            "weekly": {},
+            "runs": [],
+            "problem_count": 0,
+            "contributions_size": 0,
+        }
+
+    @property
+    def problem_count(self) -> int:
+        """Problems with a contribution, including ones not saved yet"""
+        offsets = self._offsets.offsets
+        return len(offsets) + sum(1 for slug in self._changed if slug not in offsets)
+
+    def load(self) -> bool:
+        """Load saved aggregates and contribution offsets; False when they are missing, stale or from another version"""
+        try:
+            with open(self.stats_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != STATS_VERSION:
+                return False
+            if os.path.getsize(self.contributions_path) < data["contributions_size"]:
+                return False
+            self._offsets.load(data["contributions_size"])
+        except (OSError, ValueError, KeyError):
+            return False
+        if len(self._offsets.offsets) != data.get("problem_count"):
+            return False
+        self.data = data
+        self._changed = {}
+        self._rewrite_log = False
+        return True
+
+    def _current(self, slug: str) -> Optional[Dict]:
+        """A problem's current contribution, read from the log by its offset unless changed since loading"""
+        if slug in self._changed:
+            return self._changed[slug]
+        offset = self._offsets.offsets.get(slug)
+        if offset is None:
+            return None
+        with open(self.contributions_path, 'rb') as f:
+            f.seek(offset)
+            part = json.loads(f.readline())
+        part.pop("slug")
+        return part
+
+    def save(self):
+        """Append the changed contributions (or rewrite the log when it needs compacting), then the aggregates"""
+        problem_count = self.problem_count
+        superseded = self._offsets.records + len(self._changed) - problem_count
+        if self._rewrite_log or (superseded >= COMPACTION_MIN_SUPERSEDED
+                                 and superseded > COMPACTION_RATIO * problem_count):
+            problems = self._read_all()
+            problems.update(self._changed)
+            offsets = {}
+            chunks = []
+            log_size = 0
+            for slug, part in problems.items():
+                offsets[slug] = log_size
+                chunks.append(_encode(slug, part))
+                log_size += len(chunks[-1])
+            self.writer.write_bytes(self.contributions_path, b"".join(chunks))
+            self._offsets.reset(offsets, log_size)
+        elif self._changed:
+            # Cut off anything a sync appended without saving the aggregates that match it
+            with open(self.contributions_path, 'r+b') as f:
+                f.truncate(self.data["contributions_size"])
+                f.seek(0, os.SEEK_END)
+                for slug, part in self._changed.items():
+                    offset = f.tell()
+                    f.write(_encode(slug, part))
+                    self._offsets.add(slug, offset, f.tell())
+            self.writer.note_append(self.contributions_path, self._offsets.log_size - self.data["contributions_size"])
+        self._offsets.save()
+        self._changed = {}
+        self._rewrite_log = False
+        self.data["contributions_size"] = self._offsets.log_size
+        self.data["problem_count"] = len(self._offsets.offsets)
+        self.writer.write_json(self.stats_path, self.data, separators=(",", ":"))
+
+    def _read_all(self) -> Dict[str, Dict]:
+        """Every saved contribution, from one pass over the log"""
+        problems = {}
+        if not self.data["contributions_size"]:
+            return problems
+        with open(self.contributions_path, 'rb') as f:
+            for line in f.read(self.data["contributions_size"]).splitlines():
+                part = json.loads(line)
+                problems[part.pop("slug")] = part
+        return problems
+
+    def update(self, records: Iterable[Dict]) -> int:
+        """
+        Fold new or changed index records into the aggregates
+
+        Returns:
+            Number of records whose contribution changed
+        """
+        changed = 0
+        for record in records:
+            slug = record.get("slug")
+            if not slug:
+                continue
+            new = contribution(record)
+            old = self._current(slug)
+            if old == new:
+                continue
+            if old is not None:
+                self._apply(old, -1)
+            self._apply(new, 1)
+            self._changed[slug] = new
+            changed += 1
+        return changed
+
+    def recompute(self, records: Iterable[Dict]):
+        """Discard the aggregates and rebuild them from every index record"""
+        self.data = self._empty()
+        self._offsets.reset({}, 0)
+        self._changed = {}
+        self.update(records)
+        self._rewrite_log = True
+
+    def _apply(self, part: Dict, sign: int):
+        """Add (sign=1) or subtract (sign=-1) one problem's contribution"""
+        self._bump(self.data["difficulty"], part["difficulty"], sign)
+        for tag in part["tags"]:
+            self._bump(self.data["tags"], tag, sign)
+        for language in part["languages"]:
+            self._bump(self.data["languages"], language, sign)
+        for day, count in part["days"].items():
+            self.data["submissions"] += sign * count
+            self._bump(self.data["weekly"], iso_week(day), sign * count)
+            was_active = day in self.data["daily"]
+            self._bump(self.data["daily"], day, sign * count)
+            if not was_active:
+                self._add_day(day)
+            elif day not in self.data["daily"]:
+                self._remove_day(day)
+
+    @staticmethod
+    def _bump(counts: Dict[str, int], key: str, delta: int):
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+    def _add_day(self, day: str):
+        """Extend, join or start the streak runs around a newly active day"""
+        runs = self.data["runs"]
+        i = bisect.bisect_right(runs, day, key=lambda run: run[0])
+        before = runs[i - 1] if i else None
+        after = runs[i] if i < len(runs) else None
+        joins_before = before is not None and before[1] == _shift(day, -1)
+        joins_after = after is not None and after[0] == _shift(day, 1)
+        if joins_before and joins_after:
+            before[1] = after[1]
+            del runs[i]
+        elif joins_before:
+            before[1] = day
+        elif joins_after:
+            after[0] = day
+        else:
+            runs.insert(i, [day, day])
+
+    def _remove_day(self, day: str):
+        """Shrink or split the streak run holding a day that is no longer active"""
+        runs = self.data["runs"]
+        i = bisect.bisect_right(runs, day, key=lambda run: run[0]) - 1
+        start, end = runs[i]
+        if start == end:
+            del runs[i]
+        elif day == start:
+            runs[i][0] = _shift(day, 1)
+        elif day == end:
+            runs[i][1] = _shift(day, -1)
+        else:
+            runs[i:i + 1] = [[start, _shift(day, -1)], [_shift(day, 1), end]]
+
+    def streaks(self) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        """(latest run, longest run) of consecutive active days, earliest longest on ties"""
+        runs = self.data["runs"]
+        if not runs:
+            return None, None
+        return runs[-1], max(runs, key=_run_length)
+
+    def render(self, today: Optional[date] = None) -> str:
+        """
+        Markdown for the README stats section
+
+        Args:
+            today: Run date the current streak is measured against (defaults to today, UTC)
+        """
+        data = self.data
+        if not self.problem_count:
+            return "_No problems solved yet._"
+        today = today or datetime.now(timezone.utc).date()
+
+        difficulty = " · ".join(f"{name} {data['difficulty'].get(name, 0)}" for name in DIFFICULTIES)
+        lines = [
+            f"**{self.problem_count} problems** solved in {data['submissions']} accepted submissions "
+            f"on {len(data['daily'])} days · {difficulty}",
+            "",
+        ]
+
+        latest, longest = self.streaks()
+        # A streak that ended before yesterday is broken
+        current = _run_length(latest) if latest[1] >= (today - timedelta(days=1)).isoformat() else 0
+        lines.append(f"**Current streak:** {current} day(s), last active {latest[1]} · "
+                     f"**Longest streak:** {_run_length(longest)} day(s), {longest[0]} to {longest[1]}")
+        lines.append("")
+        lines.append("**Languages:** " + self._ranked(data["languages"]))
+        lines.append("")
+        lines.append("**Tags:** " + self._ranked(data["tags"]))
+        lines.append("")
+
+        last_day = latest[1]
+        last_monday = _shift(last_day, -date.fromisoformat(last_day).weekday())
+        weeks = [_shift(last_monday, -7 * i) for i in reversed(range(HISTOGRAM_WEEKS))]
+        days = [_shift(last_day, -i) for i in reversed(range(HISTOGRAM_DAYS))]
+
+        lines.append("```text")
+        lines.append("Accepted submissions per week")
+        lines.extend(self._bars([(iso_week(monday), data["weekly"].get(iso_week(monday), 0)) for monday in weeks]))
+        lines.append("")
+        lines.append("Accepted submissions per day")
+        lines.extend(self._bars([(day, data["daily"].get(day, 0)) for day in days]))
+        lines.append("")
+        lines.extend(self._heatmap(last_monday))
+        lines.append("```")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _ranked(counts: Dict[str, int]) -> str:
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return " · ".join(f"{name} {count}" for name, count in ordered)
+
+    @staticmethod
+    def _bars(rows: List[Tuple[str, int]]) -> List[str]:
+        peak = max((count for _, count in rows), default=0) or 1
+        return [f"{label}  {'█' * -(-count * HISTOGRAM_WIDTH // peak):<{HISTOGRAM_WIDTH}} {count}".rstrip()
+                for label, count in rows]
+
+    def _heatmap(self, last_monday: str) -> List[str]:
+        """One row per weekday, one column per week, ending with the latest active week"""
+        first_monday = _shift(last_monday, -7 * (HEATMAP_WEEKS - 1))
+        mondays = [date.fromisoformat(first_monday) + timedelta(weeks=i) for i in range(HEATMAP_WEEKS)]
+
+        # Month labels above the first column of each month, where they fit
+        header = [" "] * HEATMAP_WEEKS
+        free_from = 0
+        for column, monday in enumerate(mondays):
+            if column >= free_from and (column == 0 or monday.month != mondays[column - 1].month):
+                label = monday.strftime("%b")
+                if column + len(label) <= HEATMAP_WEEKS:
+                    header[column:column + len(label)] = label
+                    free_from = column + len(label) + 1
+
+        lines = [f"Calendar, {first_monday} to {_shift(last_monday, 6)}", "     " + "".join(header).rstrip()]
+        for weekday, name in enumerate(WEEKDAYS):
+            cells = []
+            for monday in mondays:
+                count = self.data["daily"].get((monday + timedelta(days=weekday)).isoformat(), 0)
+                cells.append(next(glyph for threshold, glyph in HEATMAP_LEVELS if count >= threshold))
+            lines.append(f"{name:<4} " + "".join(cells))
+        lines.append("     · none  ░ 1  ▒ 2  ▓ 3-4  █ 5+")
+        return lines
+
+
+def replace_stats_section(content: str, section: str) -> str:
+    """Put the section between the stats markers, adding them before the problems table if missing"""
+    block = START_MARKER + "\n" + section + "\n" + END_MARKER
+    start_idx = content.find(START_MARKER)
+    end_idx = content.find(END_MARKER)
+    if start_idx != -1 and end_idx != -1:
+        if start_idx >= end_idx:
+            raise ValueError("Invalid stats marker positions in README.md")
+        return content[:start_idx] + block + content[end_idx + len(END_MARKER):]
+
+    table_idx = content.find(TABLE_MARKER)
+    if table_idx == -1:
+        return content + "\n\n" + block + "\n"
+    return content[:table_idx] + block + "\n\n" + content[table_idx:]
+
+
+def update_stats(readme_path: str, stats_path: str, index_path: str, new_problems: Optional[List[Dict]] = None,
+                 writer: Optional[AtomicWriter] = None) -> ProgressStats:
+    """
+    Fold new index records into the aggregates and refresh the README stats section
+
+    Args:
+        readme_path: Path to README.md
+        stats_path: Path to progress_stats.json
+        index_path: Index to recompute from when needed (see problem_index.load_problems)
+        new_problems: Index entries added or changed since the last update (None = full recompute)
+        writer: Shared writer so the caller can report bytes written and skipped
+    """
+    from problem_index import load_problems
+
+    stats = ProgressStats(stats_path, writer)
+    if new_problems is not None and stats.load():
+        changed = stats.update(new_problems)
+        mode = "incremental"
+    else:
+        if new_problems is not None:
+            logger.info("No saved progress stats; recomputing from the whole index")
+        stats.recompute(load_problems(index_path))
+        changed = stats.problem_count
+        mode = "full recompute"
+    stats.save()
+
+    if os.path.exists(readme_path):
+        with open(readme_path, 'r') as f:
+            content = f.read()
+        stats.writer.write_text(readme_path, replace_stats_section(content, stats.render()))
+
+    logger.info(f"✓ Updated progress stats for {changed} problem(s) ({mode})")
+    return stats
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+    metadata_dir = repo_root / "metadata"
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stats", default=str(metadata_dir / "progress_stats.json"), help="aggregates file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    recompute_parser = subparsers.add_parser("recompute", help="rebuild the aggregates and README section from the index")
+    recompute_parser.add_argument("--index", default=str(metadata_dir / "problems_index.jsonl"),
+                                  help="index to read (problems_index.jsonl or problems.db)")
+    subparsers.add_parser("show", help="print the rendered README section")
+    args = parser.parse_args()
+
+    if args.command == "recompute":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        update_stats(str(repo_root / "README.md"), args.stats, args.index)
+        return
+
+    stats = ProgressStats(args.stats)
+    if not stats.load():
+        sys.exit(f"✗ No progress stats in {args.stats}; run the recompute command first")
+    print(stats.render())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Query Index - Filter solved problems through the SQLite index store
+
+Usage:
+    python scripts/query_index.py --difficulty Medium --tag "Binary Search" --language python3 --this-month
+    python scripts/query_index.py --tag Array --tag "Two Pointers" --since 2025-01-01 --format json
+    python scripts/query_index.py --count --difficulty Hard
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from index_db import ProblemStore
+from problem_index import ProblemIndex
+
+
+def main():
+    """Main entry point"""
+    metadata_dir = Path(__file__).parent.parent / "metadata"
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=str(metadata_dir / "problems.db"), help="SQLite store path")
+    parser.add_argument("--log", default=str(metadata_dir / "problems_index.jsonl"), help="index log to sync from")
+    parser.add_argument("--difficulty", help="Easy, Medium or Hard")
+    parser.add_argument("--tag", action="append", dest="tags", help="required tag (repeatable, all must match)")
+    parser.add_argument("--language", help="submission language, e.g. python3")
+    parser.add_argument("--title", help="substring of the problem title")
+    parser.add_argument("--since", help="solved on or after this ISO date")
+    parser.add_argument("--until", help="solved before this ISO date")
+    parser.add_argument("--this-month", action="store_true", help="solved during the current calendar month")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--count", action="store_true", help="print only the number of matches")
+    parser.add_argument("--format", choices=["table", "json"], default="table")
+    args = parser.parse_args()
+
+    since = args.since
+    if args.this_month:
+        since = datetime.now().strftime("%Y-%m-01")
+
+    store = ProblemStore(args.db)
+    try:
+        if Path(args.log).exists() and store.sync_from_index(ProblemIndex(args.log)):
+            print(f"Rebuilt {args.db} from {args.log}", file=sys.stderr)
+
+        problems = store.query(
+            difficulty=args.difficulty,
+            tags=args.tags,
+            language=args.language,
+            since=since,
+            until=args.until,
+            title=args.title,
+            limit=args.limit,
+        )
+    finally:
+        store.close()
+
+    if args.count:
+        print(len(problems))
+    elif args.format == "json":
+        print(json.dumps(problems, indent=2))
+    else:
+        for problem in problems:
+            print(f"{problem.get('solved_at', '')[:10]}  {problem.get('difficulty', ''):<6}  "
+                  f"{problem.get('language', ''):<10}  {problem.get('title', '')}  "
+                  f"[{', '.join(problem.get('tags', []))}]")
+        print(f"{len(problems)} problem(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
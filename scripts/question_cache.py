@@ -0,0 +1,159 @@
+"""
+Question Cache - Persistent on-disk cache of LeetCode question metadata
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from atomic_io import AtomicWriter
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionCache:
+    """Caches question metadata (title, difficulty, topicTags) keyed by titleSlug"""
+
+    DEFAULT_TTL_DAYS = 30
+
+    def __init__(self, cache_path: str, ttl_seconds: Optional[float] = None, writer: Optional[AtomicWriter] = None):
+        """
+        Initialize question cache
+
+        Args:
+            cache_path: Path to question_cache.json
+            ttl_seconds: Age after which entries are treated as missing
+                (defaults to LEETCODE_QUESTION_CACHE_TTL_DAYS or DEFAULT_TTL_DAYS)
+            writer: Shared writer used to save the cache
+        """
+        self.writer = writer or AtomicWriter()
+        self.cache_path = Path(cache_path)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LEETCODE_QUESTION_CACHE_TTL_DAYS", self.DEFAULT_TTL_DAYS)) * 86400
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Held while the full catalog is prefetched, so clients sharing the cache fetch it once
+        self.catalog_lock = threading.Lock()
+        self._dirty = False
+        self._data = self._load()
+
+    @property
+    def questions(self) -> Dict[str, Dict]:
+        """All cached entries, fresh or stale"""
+        return self._data["questions"]
+
+    def get(self, slug: str) -> Optional[Dict]:
+        """Return cached metadata for slug, or None if missing or expired"""
+        entry = self.questions.get(slug)
+        if entry is None or self._is_expired(entry.get("cached_at", 0)):
+            return None
+        return entry
+
+    def put(self, slug: str, question: Dict):
+        """Store metadata for one slug"""
+        self.put_many({slug: question})
+
+    def put_many(self, questions: Dict[str, Dict]):
+        """Store metadata for many slugs at once"""
+        now = time.time()
+        with self._lock:
+            for slug, question in questions.items():
+                if not question:
+                    continue
+                self.questions[slug] = {
+                    "questionId": question.get("questionId"),
+                    "title": question.get("title"),
+                    "titleSlug": slug,
+                    "difficulty": question.get("difficulty"),
+                    "topicTags": [{"name": tag["name"]} for tag in question.get("topicTags") or []],
+                    "cached_at": now,
+                }
+            self._dirty = True
+
+    def mark_catalog_fetched(self):
+        """Record that the full problem-set catalog was just loaded"""
+        with self._lock:
+            self._data["catalog_fetched_at"] = time.time()
+            self._dirty = True
+
+    def catalog_is_stale(self) -> bool:
+        """True when the full catalog has never been fetched or has expired"""
+        fetched_at = self._data.get("catalog_fetched_at")
+        return fetched_at is None or self._is_expired(fetched_at)
+
+    def missing(self, slugs: Iterable[str]) -> List[str]:
+        """Return the slugs that have no fresh cache entry"""
+        return [slug for slug in slugs if self.get(slug) is None]
+
+    def invalidate(self, slugs: Optional[Iterable[str]] = None):
+        """
+        Drop cached entries
+
+        Args:
+            slugs: Slugs to drop (None = drop everything, including the catalog timestamp)
+        """
+        with self._lock:
+            if slugs is None:
+                self._data = self._empty()
+            else:
+                for slug in slugs:
+                    self.questions.pop(slug, None)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.writer.write_json(self.cache_path, self._data, indent=2, sort_keys=True)
+            self._dirty = False
+
+    def _is_expired(self, timestamp: float) -> bool:
+        return time.time() - timestamp > self.ttl_seconds
+
+    def _load(self) -> Dict:
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r') as f:
+                    data = json.load(f)
+                data.setdefault("questions", {})
+                return data
+            except (OSError, ValueError) as e:
+                logger.warning(f"  ⚠ Ignoring unreadable question cache {self.cache_path}: {e}")
+        return self._empty()
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {"catalog_fetched_at": None, "questions": {}}
+
+
+def main():
+    """Inspect or invalidate the question cache"""
+    default_path = Path(__file__).parent.parent / "metadata" / "question_cache.json"
+
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the question metadata cache")
+    parser.add_argument("--cache", default=str(default_path), help="path to question_cache.json")
+    parser.add_argument("--invalidate", nargs="*", metavar="SLUG",
+                        help="drop the given slugs, or the whole cache when none are given")
+    args = parser.parse_args()
+
+    cache = QuestionCache(args.cache)
+
+    if args.invalidate is not None:
+        cache.invalidate(args.invalidate or None)
+        cache.save()
+        target = ", ".join(args.invalidate) if args.invalidate else "all entries"
+        print(f"✓ Invalidated {target}")
+        return
+
+    stale = "stale" if cache.catalog_is_stale() else "fresh"
+    print(f"{len(cache.questions)} cached questions (catalog {stale})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 """
 README Updater - Manages the problems table in README.md
+
+With a docs directory the output is sharded: README.md gets a summary linking
+one page per difficulty, tag and language (docs/difficulty/easy.md,
+docs/tags/two-pointers.md, docs/languages/cpp.md), each holding the table rows
+of its problems. The render cache keeps a dependency map from every page to
+the slugs on it, so an update rewrites only the pages whose rows changed.
 """
 
+import logging
 import os
 import json
-from typing import List, Dict
+import bisect
+import hashlib
+from typing import List, Dict, Optional, Set, Tuple, Union
 from datetime import datetime
 
+from atomic_io import AtomicWriter
+from problem_index import load_problems
+from text_utils import slugify
+
+logger = logging.getLogger(__name__)
+
 
 class ReadmeUpdater:
     """Updates the README.md file with solved problems table"""
@@ -14,34 +29,50 @@ class ReadmeUpdater:
     START_MARKER = "<!-- LEETCODE_TABLE_START -->"
     END_MARKER = "<!-- LEETCODE_TABLE_END -->"
     
-    TABLE_HEADER = """| # | Title | Difficulty | Tags | LeetCode Link | My Solution | Solved On |
-|---|--------|------------|------|---------------|-------------|-----------|"""
+    TABLE_HEADER = """| # | Title | Difficulty | Tags | LeetCode Link | My Solution | Measured Complexity | Structure | Solved On |
+|---|--------|------------|------|---------------|-------------|---------------------|-----------|-----------|"""
+    
+    # Complexity fits below this confidence (scripts/complexity.py) are shown as "?" rather than as a class
+    MIN_COMPLEXITY_CONFIDENCE = 0.3
+    
+    # Page groups of the sharded layout: directory under docs -> label
+    PAGE_GROUPS = {"difficulty": "Difficulty", "tags": "Tag", "languages": "Language"}
+    DIFFICULTY_ORDER = ["easy", "medium", "hard"]
     
-    def __init__(self, readme_path: str, index_path: str):
+    def __init__(self, readme_path: str, index_path: str, cache_path: Optional[str] = None,
+                 writer: Optional[AtomicWriter] = None, docs_dir: Optional[str] = None):
         """
         Initialize README updater
         
         Args:
             readme_path: Path to README.md file
-            index_path: Path to problems_index.json file
+            index_path: Path to problems_index.jsonl (or a legacy problems_index.json)
+            cache_path: Path to the rendered-row cache
+                (defaults to readme_cache.json next to the index)
+            writer: Shared writer for the README and cache (skips unchanged content)
+            docs_dir: Directory for per-difficulty, per-tag and per-language pages;
+                when given, README.md only gets a summary linking them
         """
+        self.writer = writer or AtomicWriter()
         self.readme_path = readme_path
         self.index_path = index_path
+        self.cache_path = cache_path or os.path.join(os.path.dirname(index_path), "readme_cache.json")
+        self.readme_dir = os.path.dirname(os.path.abspath(readme_path))
+        self.docs_prefix = None
+        if docs_dir is not None:
+            # Pages are keyed by their path relative to the README, and sit two levels below docs_dir
+            self.docs_prefix = os.path.relpath(os.path.abspath(docs_dir), self.readme_dir).replace(os.sep, "/")
+            self.page_link_prefix = "../" * (self.docs_prefix.count("/") + 2)
     
-    def update(self):
-        """Update the README.md file with current problems from index"""
-        # Load all problems from index
-        with open(self.index_path, 'r') as f:
-            data = json.load(f)
-            problems = data.get("problems", [])
-        
-        if not problems:
-            print("No problems to add to README")
-            return
-        
-        # Sort problems by solved_at timestamp (oldest first)
-        problems.sort(key=lambda p: p.get("solved_at", ""))
+    def update(self, new_problems: Optional[List[Dict]] = None):
+        """
+        Update the README.md file with current problems from index
         
+        Args:
+            new_problems: Index entries added or changed since the last update. When
+                given and the render cache matches the README, only these rows are
+                rendered and spliced in; otherwise the whole table is rebuilt.
+        """
         # Read current README content
         if os.path.exists(self.readme_path):
             with open(self.readme_path, 'r') as f:
@@ -50,47 +81,317 @@ class ReadmeUpdater:
             # Create basic README structure if it doesn't exist
             readme_content = self._create_default_readme()
         
-        # Build new table
-        new_table = self._build_table(problems)
+        cache = self._load_cache()
+        
+        if self.docs_prefix is not None:
+            result = self._update_sharded(readme_content, cache, new_problems)
+            if result is None:
+                logger.info("No problems to add to README")
+                return
+            updated_content, cache, mode = result
+        elif new_problems is not None and self._cache_matches(cache, readme_content):
+            updated_content = self._update_incremental(readme_content, cache, new_problems)
+            mode = "incremental"
+        else:
+            if new_problems is not None:
+                logger.info("README and render cache disagree; rebuilding the whole table")
+            result = self._update_full(readme_content)
+            if result is None:
+                logger.info("No problems to add to README")
+                return
+            # Switching back from the sharded layout leaves its pages behind otherwise
+            for page in (cache or {}).get("pages") or {}:
+                self._remove_page(page)
+            updated_content, cache = result
+            mode = "full rebuild"
+        
+        # Write back to file (a no-op when nothing changed)
+        self.writer.write_text(self.readme_path, updated_content)
+        
+        self._save_cache(cache)
         
-        # Replace table section
+        logger.info(f"✓ Updated README.md with {len(cache['rows'])} problems ({mode})")
+    
+    def _update_full(self, readme_content: str) -> Optional[Tuple[str, Dict]]:
+        """Render every row from the index and return (content, cache), or None if the index is empty"""
+        # Load all problems from index
+        problems = load_problems(self.index_path)
+        
+        if not problems:
+            return None
+        
+        # Sort problems by solved_at timestamp (oldest first)
+        problems.sort(key=lambda p: p.get("solved_at", ""))
+        
+        rows = [[p.get("slug", ""), p.get("solved_at", ""), self._render_row_tail(p)] for p in problems]
+        new_table = self._assemble_table([row[2] for row in rows])
         updated_content = self._replace_table_section(readme_content, new_table)
         
-        # Write back to file
-        with open(self.readme_path, 'w') as f:
-            f.write(updated_content)
+        return updated_content, self._make_cache(rows, updated_content)
+    
+    def _update_incremental(self, readme_content: str, cache: Dict, new_problems: List[Dict]) -> str:
+        """Render only new or changed rows and splice them into the existing table"""
+        rows = cache["rows"]
+        positions = {row[0]: i for i, row in enumerate(rows)}
+        original_count = len(rows)
+        appended_only = True
+        changed = False
+        
+        for problem in new_problems:
+            slug = problem.get("slug", "")
+            solved_at = problem.get("solved_at", "")
+            tail = self._render_row_tail(problem)
+            
+            if slug in positions:
+                existing = rows[positions[slug]]
+                if existing[1] == solved_at and existing[2] == tail:
+                    continue
+                # Changed row: drop it and re-insert at its sorted position
+                del rows[positions[slug]]
+                positions = {row[0]: i for i, row in enumerate(rows)}
+                appended_only = False
+            
+            # Insert after any rows with the same solved_at, matching the stable full sort
+            pos = bisect.bisect_right(rows, solved_at, key=lambda row: row[1])
+            rows.insert(pos, [slug, solved_at, tail])
+            if pos == len(rows) - 1:
+                positions[slug] = pos
+            else:
+                appended_only = False
+                positions = {row[0]: i for i, row in enumerate(rows)}
+            changed = True
+        
+        if not changed:
+            return readme_content
+        
+        if appended_only:
+            # New rows all sort last: splice them in just before the end marker
+            end_idx = readme_content.find(self.END_MARKER)
+            new_lines = [self._render_row(idx, row[2]) for idx, row in enumerate(rows[original_count:], start=original_count + 1)]
+            updated_content = readme_content[:end_idx] + "\n".join(new_lines) + "\n" + readme_content[end_idx:]
+        else:
+            # Renumbering needed: reassemble the table from cached row text
+            new_table = self._assemble_table([row[2] for row in rows])
+            updated_content = self._replace_table_section(readme_content, new_table)
+        
+        cache.update(self._make_cache(rows, updated_content))
+        return updated_content
+    
+    def _update_sharded(self, readme_content: str, cache: Optional[Dict],
+                        new_problems: Optional[List[Dict]]) -> Optional[Tuple[str, Dict, str]]:
+        """
+        Regenerate the pages holding new or changed rows, then the README summary
+        
+        Returns:
+            (README content, cache, mode), or None if there is nothing to render
+        """
+        if new_problems is not None and self._cache_matches(cache, readme_content):
+            rows, pages = cache["rows"], cache["pages"]
+            dirty = self._place_rows(rows, pages, new_problems)
+            mode = "incremental"
+        else:
+            if new_problems is not None:
+                logger.info("README and render cache disagree; rebuilding every page")
+            problems = load_problems(self.index_path)
+            if not problems:
+                return None
+            rows, pages = {}, {}
+            self._place_rows(rows, pages, problems)
+            # Pages of the previous layout that no longer have rows are removed below
+            dirty = set(pages) | set((cache or {}).get("pages") or {})
+            mode = "full rebuild"
+        
+        # A deleted page file is regenerated even when its rows did not change
+        dirty.update(page for page in pages if not os.path.exists(os.path.join(self.readme_dir, page)))
+        for page in sorted(dirty):
+            self._write_page(page, rows, pages)
+        
+        updated_content = self._replace_table_section(readme_content, self._build_summary(rows, pages))
+        cache = self._make_cache(rows, updated_content)
+        cache["pages"] = pages
+        return updated_content, cache, f"{mode}, {len(dirty)} page(s) regenerated"
+    
+    def _place_rows(self, rows: Dict[str, List], pages: Dict[str, Dict], problems: List[Dict]) -> Set[str]:
+        """
+        Render rows into the slug -> row map and move them between pages as needed
+        
+        Args:
+            rows: slug -> [solved_at, rendered row tail, pages holding the row]
+            pages: page -> {"title", "slugs"}, the dependency map
+            problems: Index entries to (re)place
+            
+        Returns:
+            Pages whose rows changed
+        """
+        dirty = set()
+        for problem in problems:
+            slug = problem.get("slug", "")
+            memberships = self._pages_of(problem)
+            row = [problem.get("solved_at", ""), self._render_row_tail(problem, self.page_link_prefix),
+                   [page for page, _ in memberships]]
+            old = rows.get(slug)
+            if old == row:
+                continue
+            
+            for page in old[2] if old else []:
+                pages[page]["slugs"].remove(slug)
+                dirty.add(page)
+            for page, title in memberships:
+                pages.setdefault(page, {"title": title, "slugs": []})["slugs"].append(slug)
+                dirty.add(page)
+            rows[slug] = row
+        return dirty
+    
+    def _pages_of(self, problem: Dict) -> List[Tuple[str, str]]:
+        """(page, title) of every page a problem's row belongs on"""
+        difficulty = problem.get("difficulty", "")
+        memberships = [(f"{self.docs_prefix}/difficulty/{slugify(difficulty)}.md", difficulty)]
+        memberships.extend((f"{self.docs_prefix}/tags/{slugify(tag)}.md", tag) for tag in problem.get("tags", []))
+        language = problem.get("language", "")
+        memberships.append((f"{self.docs_prefix}/languages/{slugify(language)}.md", language))
+        return memberships
+    
+    def _write_page(self, page: str, rows: Dict[str, List], pages: Dict[str, Dict]):
+        """Render one page from cached rows, oldest first, or remove it once it has none"""
+        entry = pages.get(page)
+        if not entry or not entry["slugs"]:
+            pages.pop(page, None)
+            self._remove_page(page)
+            return
+        
+        entry["slugs"].sort(key=lambda slug: (rows[slug][0], slug))
+        group = self.PAGE_GROUPS[page.split("/")[-2]]
+        table = self._assemble_table([rows[slug][1] for slug in entry["slugs"]])
+        content = (
+            f"# {group}: {entry['title']}\n\n"
+            f"[← All problems]({self.page_link_prefix}{os.path.basename(self.readme_path)})\n\n"
+            f"{table}\n"
+        )
+        self.writer.write_text(os.path.join(self.readme_dir, page), content)
+    
+    def _remove_page(self, page: str):
+        self.writer.remove(os.path.join(self.readme_dir, page))
+    
+    def _build_summary(self, rows: Dict[str, List], pages: Dict[str, Dict]) -> str:
+        """README table linking every page with its problem count"""
+        def order(page: str):
+            group, name = page.split("/")[-2:]
+            rank = list(self.PAGE_GROUPS).index(group)
+            if group == "difficulty" and name[:-3] in self.DIFFICULTY_ORDER:
+                return rank, self.DIFFICULTY_ORDER.index(name[:-3]), ""
+            return rank, -len(pages[page]["slugs"]), pages[page]["title"]
         
-        print(f"✓ Updated README.md with {len(problems)} problems")
+        lines = [
+            f"{len(rows)} problems, listed by difficulty, tag and language.",
+            "",
+            "| Group | Page | Problems |",
+            "|-------|------|----------|",
+        ]
+        for page in sorted(pages, key=order):
+            group = self.PAGE_GROUPS[page.split("/")[-2]]
+            lines.append(f"| {group} | [{pages[page]['title']}]({page}) | {len(pages[page]['slugs'])} |")
+        return "\n".join(lines)
     
     def _build_table(self, problems: List[Dict]) -> str:
         """Build the markdown table from problems list"""
+        return self._assemble_table([self._render_row_tail(problem) for problem in problems])
+    
+    def _assemble_table(self, tails: List[str]) -> str:
+        """Join the header and numbered rows into the markdown table"""
         rows = [self.TABLE_HEADER]
+        rows.extend(self._render_row(idx, tail) for idx, tail in enumerate(tails, start=1))
+        return "\n".join(rows)
+    
+    def _render_row(self, idx: int, tail: str) -> str:
+        """Prefix a rendered row with its position"""
+        return f"| {idx} {tail}"
+    
+    def _render_row_tail(self, problem: Dict, link_prefix: str = "") -> str:
+        """Render every column of a row except the leading position number (solution links get link_prefix)"""
+        # Format solved date
+        solved_at = problem.get("solved_at", "")
+        try:
+            dt = datetime.fromisoformat(solved_at.replace("Z", "+00:00"))
+            formatted_date = dt.strftime("%Y-%m-%d %H:%M UTC")
+        except:
+            formatted_date = solved_at
         
-        for idx, problem in enumerate(problems, start=1):
-            # Format solved date
-            solved_at = problem.get("solved_at", "")
-            try:
-                dt = datetime.fromisoformat(solved_at.replace("Z", "+00:00"))
-                formatted_date = dt.strftime("%Y-%m-%d %H:%M UTC")
-            except:
-                formatted_date = solved_at
-            
-            # Format tags
-            tags = ", ".join(problem.get("tags", []))
+        # Format tags
+        tags = ", ".join(problem.get("tags", []))
+        
+        # Measured complexity (scripts/complexity.py) with the fit's confidence, marked when worse than
+        # the tags suggest; a weak fit says little, so it is shown as unknown
+        complexity = problem.get("complexity") or {}
+        measured = ""
+        if complexity.get("class"):
+            confidence = complexity.get("confidence", 0)
+            if confidence < self.MIN_COMPLEXITY_CONFIDENCE:
+                measured = "?"
+            else:
+                measured = f"{complexity['class']} ({confidence:.0%})"
+                if complexity.get("worse_than_expected"):
+                    measured += f" ⚠ (expected {complexity.get('expected')})"
+        
+        # Static analysis of the solution file (scripts/solution_analysis.py)
+        structure = ""
+        if problem.get("analysis"):
+            from solution_analysis import describe
             
-            # Build row
-            row = (
-                f"| {idx} "
-                f"| {problem.get('title', '')} "
-                f"| {problem.get('difficulty', '')} "
-                f"| {tags} "
-                f"| [Link]({problem.get('leetcode_url', '')}) "
-                f"| [Solution]({problem.get('solution_path', '')}) "
-                f"| {formatted_date} |"
-            )
-            rows.append(row)
+            structure = describe(problem["analysis"])
         
-        return "\n".join(rows)
+        # Build row
+        return (
+            f"| {problem.get('title', '')} "
+            f"| {problem.get('difficulty', '')} "
+            f"| {tags} "
+            f"| [Link]({problem.get('leetcode_url', '')}) "
+            f"| [Solution]({link_prefix}{problem.get('solution_path', '')}) "
+            f"| {measured} "
+            f"| {structure} "
+            f"| {formatted_date} |"
+        )
+    
+    def _region_hash(self, content: str) -> Optional[str]:
+        """Hash of the text between the table markers, or None if the markers are missing"""
+        start_idx = content.find(self.START_MARKER)
+        end_idx = content.find(self.END_MARKER)
+        if start_idx == -1 or end_idx == -1 or start_idx >= end_idx:
+            return None
+        region = content[start_idx + len(self.START_MARKER):end_idx]
+        return hashlib.sha256(region.encode("utf-8")).hexdigest()
+    
+    def _layout(self) -> str:
+        return "single" if self.docs_prefix is None else f"sharded:{self.docs_prefix}"
+    
+    def _make_cache(self, rows: Union[List[List[str]], Dict[str, List]], content: str) -> Dict:
+        return {
+            "header": self.TABLE_HEADER,
+            "layout": self._layout(),
+            "rows": rows,
+            "table_hash": self._region_hash(content)
+        }
+    
+    def _cache_matches(self, cache: Optional[Dict], content: str) -> bool:
+        """True when the cache describes exactly the table currently in the README"""
+        return (
+            cache is not None
+            and cache.get("header") == self.TABLE_HEADER
+            and cache.get("layout", "single") == self._layout()
+            and cache.get("table_hash") is not None
+            and cache["table_hash"] == self._region_hash(content)
+        )
+    
+    def _load_cache(self) -> Optional[Dict]:
+        if not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cache(self, cache: Dict):
+        self.writer.write_json(self.cache_path, cache, indent=1)
     
     def _replace_table_section(self, content: str, new_table: str) -> str:
         """Replace the table section between markers"""
@@ -130,13 +431,17 @@ This repository automatically syncs my solved LeetCode problems every day.
 """
 
 
-def update_readme(readme_path: str, index_path: str):
+def update_readme(readme_path: str, index_path: str, new_problems: Optional[List[Dict]] = None,
+                  writer: Optional[AtomicWriter] = None, docs_dir: Optional[str] = None):
     """
     Main entry point for updating README
     
     Args:
         readme_path: Path to README.md
-        index_path: Path to problems_index.json
+        index_path: Path to problems_index.jsonl (or a legacy problems_index.json)
+        new_problems: Index entries added since the last update (None = full rebuild)
+        writer: Shared writer so the caller can report bytes written and skipped
+        docs_dir: Write the sharded layout, with its pages under this directory
     """
-    updater = ReadmeUpdater(readme_path, index_path)
-    updater.update()
+    updater = ReadmeUpdater(readme_path, index_path, writer=writer, docs_dir=docs_dir)
+    updater.update(new_problems)
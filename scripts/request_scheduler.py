@@ -0,0 +1,230 @@
+"""
+Request Scheduler - Rate limiting, retries and circuit breaking for LeetCode GraphQL calls
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class RequestFailed(Exception):
+    """Raised when a request could not be completed within its retry budget or deadline"""
+
+
+class CircuitOpenError(RequestFailed):
+    """Raised when the circuit breaker is refusing requests after repeated failures"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None):
+        """
+        Block until a token is available
+
+        Args:
+            deadline: time.monotonic() value after which waiting is abandoned
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                    self._updated_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RequestFailed("Deadline exceeded while waiting for rate limiter")
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds (e.g. after a 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated_at = self._paused_until
+
+
+class CircuitBreaker:
+    """Stops sending requests after consecutive failures until a cool-down has passed"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self):
+        """Raise CircuitOpenError if the circuit is open and still cooling down"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f"Circuit open after {self._failures} consecutive failures; "
+                                       f"retrying in {remaining:.0f}s")
+            # Half-open: let this request through as a trial
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class RequestScheduler:
+    """Runs every GraphQL request through a shared rate limit, retry policy and circuit breaker"""
+
+    DEFAULT_RATE = 5.0
+    DEFAULT_MAX_RETRIES = 5
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, rate_per_second: Optional[float] = None, burst: Optional[float] = None,
+                 max_retries: Optional[int] = None, base_delay: float = 0.5, max_delay: float = 30.0,
+                 request_timeout: float = 30.0, deadline: float = 120.0,
+                 failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize request scheduler
+
+        Args:
+            rate_per_second: Sustained request rate (defaults to LEETCODE_RATE_LIMIT or DEFAULT_RATE; <= 0 = unlimited)
+            burst: Requests allowed back to back (defaults to twice the rate)
+            max_retries: Retries after the first attempt (defaults to LEETCODE_MAX_RETRIES or DEFAULT_MAX_RETRIES)
+            base_delay: First backoff step in seconds
+            max_delay: Upper bound for a single backoff in seconds
+            request_timeout: Socket timeout for a single attempt in seconds
+            deadline: Total time budget for a request, including retries, in seconds
+            failure_threshold: Consecutive failures that open the circuit breaker
+            reset_timeout: Seconds before an open circuit allows a trial request
+        """
+        if rate_per_second is None:
+            rate_per_second = float(os.getenv("LEETCODE_RATE_LIMIT", self.DEFAULT_RATE))
+        if max_retries is None:
+            max_retries = int(os.getenv("LEETCODE_MAX_RETRIES", self.DEFAULT_MAX_RETRIES))
+
+        self.bucket = TokenBucket(rate_per_second, burst if burst is not None else rate_per_second * 2)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+        self.deadline = deadline
+
+    def execute(self, send: Callable[[float], requests.Response]) -> requests.Response:
+        """
+        Send a request, retrying transient failures
+
+        Args:
+            send: Performs one attempt given a socket timeout in seconds
+
+        Returns:
+            The first response that is not a retryable status (4xx responses other
+            than 429 are returned for the caller to handle)
+
+        Raises:
+            CircuitOpenError: The circuit breaker is open
+            RequestFailed: Retries or the deadline were exhausted
+        """
+        deadline = time.monotonic() + self.deadline
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_request()
+            self.bucket.acquire(deadline)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            retry_after = None
+            try:
+                response = send(min(self.request_timeout, remaining))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = e
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                last_error = RequestFailed(f"HTTP {response.status_code}")
+                retry_after = self._retry_after(response)
+                if response.status_code == 429:
+                    # Back off every thread sharing this scheduler, not just this one
+                    self.bucket.pause(retry_after if retry_after is not None else self._backoff(attempt))
+
+            self.breaker.record_failure()
+            if attempt == self.max_retries:
+                break
+
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            if time.monotonic() + delay > deadline:
+                break
+            logger.warning(f"    Retrying in {delay:.1f}s after {last_error} (attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+        raise RequestFailed(f"Request failed after {attempt + 1} attempt(s): {last_error}")
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.max_delay, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+            return min(self.max_delay, max(0.0, delay))
+        except (TypeError, ValueError):
+            return None
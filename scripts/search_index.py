@@ -0,0 +1,493 @@
+"""
+Search Index - Incrementally maintained inverted index over solution code and problem metadata
+
+Every readable solution file (solutions/<language>/<difficulty>/<slug>.<ext>)
+is one document. Its terms are the identifiers in its code (whole and split
+on camelCase/snake_case), the words of the title and tags, and field terms:
+  tag:monotonic-stack   lang:cpp   difficulty:easy   slug:two-sum
+
+The index lives under metadata/search/:
+  meta.json             next document id
+  paths/<key>.json      path -> document id, sharded by the path's hash
+  docs/<key>.json       document id -> [path, title], DOC_SHARD_SIZE ids per shard
+  forward/<key>.json    document id -> content hash and terms (used only for updates)
+  postings/<key>.json   term -> sorted document ids, sharded by the term's first
+                        characters (field terms by field and first letter)
+
+A query reads only the postings shards its terms live in and the docs shards of
+its matches, so it stays fast as the index grows. Replacing a document reads and
+rewrites just its path, docs and forward shards and the postings shards holding
+its old and new terms. LeetCodeSync adds each solution file as it stores it, and
+rebuilds the whole index when it finds none (a fresh clone, or after deleting it).
+
+Query syntax: terms are ANDed; OR, NOT (or -term) and parentheses combine
+them; term* matches every term with that prefix; a term with several words
+("quoted words", two-sum) requires all of them; field values are given as in
+the index (tag:"Monotonic Stack" also works).
+
+Usage:
+    python scripts/search_index.py query 'tag:monotonic-stack OR (monotonic AND stack)'
+    python scripts/search_index.py query 'tag:matrix lang:cpp'
+    python scripts/search_index.py query 'heap* -lang:python3' --limit 20
+    python scripts/search_index.py rebuild
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from atomic_io import AtomicWriter
+from solution_store import hash_code
+from text_utils import WORD, slugify
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+FIELDS = ("tag", "lang", "difficulty", "slug")
+
+# Terms shorter than this carry no meaning in code (i, j, l, r, ...)
+MIN_TERM_LENGTH = 2
+
+# Shards of each kind kept in memory; past this, changed shards are written out and the cache is dropped
+MAX_CACHED_SHARDS = 64
+
+# Documents per docs/ and forward/ shard (ids are assigned in order, so new documents fill the last one)
+DOC_SHARD_SIZE = 256
+
+# Hex digits of a path's hash naming its paths/ shard
+PATH_SHARD_DIGITS = 2
+
+
+def code_terms(code: str) -> Set[str]:
+    """Identifiers of a source file, whole and split into their camelCase/snake_case parts"""
+    terms = set()
+    for identifier in set(IDENTIFIER.findall(code)):
+        terms.add(identifier.lower())
+        for part in identifier.split("_"):
+            terms.update(piece.lower() for piece in CAMEL_PART.findall(part))
+    return {term for term in terms if len(term) >= MIN_TERM_LENGTH}
+
+
+def document_terms(doc: Dict) -> Set[str]:
+    """Every term of a document: code identifiers, title and tag words, and field terms"""
+    terms = code_terms(doc.get("code", ""))
+    terms.update(WORD.findall(doc.get("title", "").lower()))
+    for tag in doc.get("tags", []):
+        terms.update(WORD.findall(tag.lower()))
+        terms.add(f"tag:{slugify(tag)}")
+    terms.add(f"lang:{doc['language']}")
+    terms.add(f"difficulty:{slugify(doc.get('difficulty', ''))}")
+    terms.add(f"slug:{doc['slug']}")
+    return terms
+
+
+def shard_key(term: str) -> str:
+    """Postings shard holding a term"""
+    if ":" in term:
+        field, value = term.split(":", 1)
+        return f"{field}-{value[:1] or '_'}"
+    return term[:2]
+
+
+def doc_shard_key(doc_id: int) -> str:
+    """Document and forward shard holding a document id"""
+    return str(doc_id // DOC_SHARD_SIZE)
+
+
+def path_shard_key(path: str) -> str:
+    """Path shard holding a solution file's document id"""
+    return hash_code(path)[:PATH_SHARD_DIGITS]
+
+
+class _ShardSet:
+    """JSON object files in one directory, read on first use and written back when changed"""
+
+    def __init__(self, directory: Path, writer: AtomicWriter, max_cached: int = MAX_CACHED_SHARDS):
+        self.directory = directory
+        self.writer = writer
+        self.max_cached = max_cached
+        self._shards: Dict[str, Dict] = {}
+        self._dirty: Set[str] = set()
+
+    def get(self, key: str) -> Dict:
+        shard = self._shards.get(key)
+        if shard is None:
+            # Bound memory on large updates: a written shard is simply read again when needed
+            if len(self._shards) >= self.max_cached:
+                self.write()
+                self._shards.clear()
+            shard = SearchIndex._read(self.directory / f"{key}.json") or {}
+            self._shards[key] = shard
+        return shard
+
+    def reset(self):
+        """Forget every cached shard and unsaved change"""
+        self._shards.clear()
+        self._dirty.clear()
+
+    def mark(self, key: str):
+        self._dirty.add(key)
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Keys of the shards on disk or changed in memory that start with prefix"""
+        keys = {key for key in self._dirty if key.startswith(prefix)}
+        if self.directory.exists():
+            keys.update(path.stem for path in self.directory.glob(f"{prefix}*.json"))
+        return sorted(keys)
+
+    def write(self):
+        for key in sorted(self._dirty):
+            shard = self._shards[key]
+            path = self.directory / f"{key}.json"
+            if shard:
+                self.writer.write_json(path, dict(sorted(shard.items())), separators=(",", ":"))
+            else:
+                self.writer.remove(path)
+        self._dirty.clear()
+
+
+class SearchIndex:
+    """Inverted index under metadata/search/ with shard-level incremental updates"""
+
+    def __init__(self, search_dir: str, writer: Optional[AtomicWriter] = None):
+        """
+        Initialize search index
+
+        Args:
+            search_dir: Directory holding meta.json and the paths/, docs/, forward/ and postings/ shards
+            writer: Shared writer (unchanged shards and files are never rewritten)
+        """
+        self.search_dir = Path(search_dir)
+        self.meta_path = self.search_dir / "meta.json"
+        self.writer = writer or AtomicWriter()
+        self._meta: Optional[Dict] = None
+        # Path shards are small, and a bulk update touches every one of them: keep them all
+        self._paths = _ShardSet(self.search_dir / "paths", self.writer, 16 ** PATH_SHARD_DIGITS)
+        self._docs = _ShardSet(self.search_dir / "docs", self.writer)
+        self._forward = _ShardSet(self.search_dir / "forward", self.writer)
+        self._postings = _ShardSet(self.search_dir / "postings", self.writer)
+        self.updated = 0
+
+    def update_document(self, doc: Dict) -> bool:
+        """
+        Add or replace one solution file's document
+
+        Args:
+            doc: {"path", "slug", "title", "language", "difficulty", "tags", "code"}
+
+        Returns:
+            True when the index changed (False if the document is already indexed as is)
+        """
+        terms = document_terms(doc)
+        digest = hash_code(f"{doc.get('title', '')}\0{','.join(doc.get('tags', []))}\0{doc.get('code', '')}")
+        path_key = path_shard_key(doc["path"])
+        doc_id = self._paths.get(path_key).get(doc["path"])
+
+        if doc_id is not None:
+            entry = self._forward.get(doc_shard_key(doc_id))[str(doc_id)]
+            if entry["hash"] == digest and set(entry["terms"]) == terms:
+                return False
+            old_terms = set(entry["terms"])
+        else:
+            meta = self._load_meta()
+            doc_id = meta["next_id"]
+            meta["next_id"] += 1
+            self._paths.get(path_key)[doc["path"]] = doc_id
+            self._paths.mark(path_key)
+            old_terms = set()
+
+        for term in old_terms - terms:
+            self._remove_posting(term, doc_id)
+        for term in terms - old_terms:
+            self._add_posting(term, doc_id)
+
+        key = doc_shard_key(doc_id)
+        self._docs.get(key)[str(doc_id)] = [doc["path"], doc.get("title", "")]
+        self._docs.mark(key)
+        self._forward.get(key)[str(doc_id)] = {"hash": digest, "terms": sorted(terms)}
+        self._forward.mark(key)
+        self.updated += 1
+        return True
+
+    def remove_document(self, path: str) -> bool:
+        path_key = path_shard_key(path)
+        doc_id = self._paths.get(path_key).pop(path, None)
+        if doc_id is None:
+            return False
+        self._paths.mark(path_key)
+        key = doc_shard_key(doc_id)
+        for term in self._forward.get(key).pop(str(doc_id), {}).get("terms", []):
+            self._remove_posting(term, doc_id)
+        self._forward.mark(key)
+        self._docs.get(key).pop(str(doc_id), None)
+        self._docs.mark(key)
+        self.updated += 1
+        return True
+
+    def paths(self) -> Set[str]:
+        """Every indexed path (reads all path shards)"""
+        result: Set[str] = set()
+        for key in self._paths.keys():
+            result.update(self._paths.get(key))
+        return result
+
+    def exists(self) -> bool:
+        """Whether an index has been written (an empty one included)"""
+        return self.meta_path.exists()
+
+    def clear(self):
+        """Delete every index file, e.g. one left by an older layout, before indexing from scratch"""
+        if self.search_dir.exists():
+            for path in sorted(self.search_dir.rglob("*.json")):
+                self.writer.remove(path)
+        self._meta = None
+        for shards in (self._paths, self._docs, self._forward, self._postings):
+            shards.reset()
+
+    def save(self):
+        """Write the shards changed since loading, plus meta.json if anything changed (or it is missing)"""
+        if not self.updated and self.meta_path.exists():
+            return
+        for shards in (self._postings, self._forward, self._docs, self._paths):
+            shards.write()
+        self.writer.write_json(self.meta_path, self._load_meta(), separators=(",", ":"))
+        self.updated = 0
+
+    def _add_posting(self, term: str, doc_id: int):
+        key = shard_key(term)
+        postings = self._postings.get(key).setdefault(term, [])
+        postings.append(doc_id)
+        if len(postings) > 1 and postings[-2] > doc_id:
+            postings.sort()
+        self._postings.mark(key)
+
+    def _remove_posting(self, term: str, doc_id: int):
+        key = shard_key(term)
+        shard = self._postings.get(key)
+        postings = shard.get(term)
+        if postings and doc_id in postings:
+            postings.remove(doc_id)
+            if not postings:
+                del shard[term]
+            self._postings.mark(key)
+
+    def search(self, query: str) -> List[Tuple[str, str]]:
+        """
+        Evaluate a query
+
+        Returns:
+            (path, title) of every matching document, sorted by path
+
+        Raises:
+            ValueError: The query does not parse
+        """
+        ids = _QueryParser(query, self).parse()
+        return sorted(tuple(self._docs.get(doc_shard_key(doc_id))[str(doc_id)]) for doc_id in ids)
+
+    def postings(self, term: str) -> Set[int]:
+        return set(self._postings.get(shard_key(term)).get(term, ()))
+
+    def prefix_postings(self, prefix: str) -> Set[int]:
+        """Documents containing any term that starts with prefix"""
+        if ":" in prefix:
+            field, value = prefix.split(":", 1)
+            keys = [f"{field}-{value[:1]}"] if value else self._postings.keys(f"{field}-")
+        elif len(prefix) >= 2:
+            keys = [prefix[:2]]
+        else:
+            keys = [key for key in self._postings.keys(prefix) if "-" not in key]
+        result: Set[int] = set()
+        for key in keys:
+            for term, postings in self._postings.get(key).items():
+                if term.startswith(prefix):
+                    result.update(postings)
+        return result
+
+    def all_ids(self) -> Set[int]:
+        """Every document id (reads all document shards; only NOT needs it)"""
+        result: Set[int] = set()
+        for key in self._docs.keys():
+            result.update(int(doc_id) for doc_id in self._docs.get(key))
+        return result
+
+    def _load_meta(self) -> Dict:
+        if self._meta is None:
+            self._meta = self._read(self.meta_path) or {"next_id": 0}
+        return self._meta
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict]:
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+
+class _QueryParser:
+    """Recursive-descent parser evaluating a query straight to document id sets"""
+
+    TOKEN = re.compile(r'\s*(\(|\)|-|"[^"]*"|[^\s()"]+(?:"[^"]*")?)')
+
+    def __init__(self, query: str, index: SearchIndex):
+        self.tokens = [match.group(1) for match in self.TOKEN.finditer(query)]
+        self.position = 0
+        self.index = index
+
+    def parse(self) -> Set[int]:
+        if not self.tokens:
+            raise ValueError("empty query")
+        result = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"unexpected {self.tokens[self.position]!r}")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("query ends too early")
+        self.position += 1
+        return token
+
+    def _or(self) -> Set[int]:
+        result = self._and()
+        while self._peek() == "OR":
+            self._next()
+            result = result | self._and()
+        return result
+
+    def _and(self) -> Set[int]:
+        result = self._not()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+            result = result & self._not()
+        return result
+
+    def _not(self) -> Set[int]:
+        if self._peek() in ("NOT", "-"):
+            self._next()
+            return self.index.all_ids() - self._not()
+        return self._atom()
+
+    def _atom(self) -> Set[int]:
+        token = self._next()
+        if token == "(":
+            result = self._or()
+            if self._next() != ")":
+                raise ValueError("missing )")
+            return result
+        if token == ")":
+            raise ValueError("unexpected )")
+        return self._term(token)
+
+    def _term(self, token: str) -> Set[int]:
+        field = None
+        if ":" in token and token.split(":", 1)[0].lower() in FIELDS:
+            field, token = token.split(":", 1)
+            field = field.lower()
+        prefix = token.endswith("*")
+        value = token.rstrip("*").strip('"')
+
+        if field:
+            if field == "lang":
+                value = value.lower()
+            else:
+                value = slugify(value)
+            term = f"{field}:{value}"
+            return self.index.prefix_postings(term) if prefix else self.index.postings(term)
+
+        words = WORD.findall(value.lower())
+        if not words:
+            raise ValueError(f"no searchable word in {token!r}")
+        result = None
+        for i, word in enumerate(words):
+            matches = self.index.prefix_postings(word) if prefix and i == len(words) - 1 else self.index.postings(word)
+            result = matches if result is None else result & matches
+        return result
+
+
+def solution_document(path: str, code: str, record: Dict) -> Dict:
+    """Document for a solution file, with metadata from its index record"""
+    parts = Path(path).parts
+    return {
+        "path": path,
+        "slug": record.get("slug") or Path(path).stem,
+        "title": record.get("title", ""),
+        "language": parts[1] if len(parts) > 1 else "",
+        "difficulty": record.get("difficulty") or (parts[2] if len(parts) > 2 else ""),
+        "tags": record.get("tags", []),
+        "code": code,
+    }
+
+
+def rebuild(repo_root: Path, index: SearchIndex, records: Dict[str, Dict]) -> Tuple[int, int]:
+    """
+    Index every readable solution file and drop documents whose file is gone
+
+    Returns:
+        (documents in the index, documents added or replaced)
+    """
+    solutions_dir = repo_root / "solutions"
+    paths = []
+    for path in sorted(solutions_dir.glob("*/*/*")):
+        if path.is_file() and not path.relative_to(solutions_dir).parts[0].startswith("."):
+            paths.append(path.relative_to(repo_root).as_posix())
+
+    if not index.exists():
+        index.clear()
+    for stale in index.paths() - set(paths):
+        index.remove_document(stale)
+    changed = 0
+    for path in paths:
+        code = (repo_root / path).read_text(encoding="utf-8")
+        changed += index.update_document(solution_document(path, code, records.get(Path(path).stem, {})))
+    index.save()
+    return len(paths), changed
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=str(repo_root / "metadata" / "search"), help="index directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    query_parser = subparsers.add_parser("query", help="print the solutions matching a query")
+    query_parser.add_argument("query")
+    query_parser.add_argument("--limit", type=int, default=50, help="results printed (0 = all)")
+    subparsers.add_parser("rebuild", help="index every solution file, re-reading only changed ones")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.dir)
+
+    if args.command == "rebuild":
+        from problem_index import ProblemIndex
+
+        records = {record["slug"]: record for record in ProblemIndex(str(repo_root / "metadata" / "problems_index.jsonl")).all()}
+        total, changed = rebuild(repo_root, index, records)
+        print(f"✓ Indexed {total} solution file(s) ({changed} added or updated)")
+        return
+
+    start = time.perf_counter()
+    try:
+        results = index.search(args.query)
+    except ValueError as e:
+        parser.exit(2, f"✗ Invalid query: {e}\n")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    shown = results if args.limit == 0 else results[:args.limit]
+    for path, title in shown:
+        print(f"{path:<70} {title}")
+    more = f" (showing {len(shown)})" if len(shown) < len(results) else ""
+    print(f"{len(results)} match(es){more} in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
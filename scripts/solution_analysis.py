@@ -0,0 +1,410 @@
+"""
+Solution Analysis - Static analysis of Python solutions, cached by content hash
+
+Parses each solutions/python3/**/*.py file with ast and records:
+  methods       signature of every Solution method, marking the entry point
+  helpers       other Solution methods, nested functions and module functions
+  loop_depth    deepest loop nesting reached from the entry point, following
+                calls into helpers (a loop calling a helper that loops counts 2)
+  recursive     whether any function can call itself, directly or via helpers
+  memoized      whether a function is wrapped in cache/lru_cache
+  uses          sort, heap and bisect usage
+
+Results live in metadata/solution_analysis.json keyed by path, each with the
+sha256 of the file it describes. Only files whose hash changed are parsed
+again, and many changed files are parsed in parallel across cores.
+LeetCodeSync analyses just the files a run wrote and copies a compact
+annotation into their index records, from which the README renders its
+Structure column.
+
+Usage:
+    python scripts/solution_analysis.py update            # re-parse changed files
+    python scripts/solution_analysis.py summary
+    python scripts/solution_analysis.py query --uses heap --min-depth 2
+    python scripts/solution_analysis.py annotate          # refresh index records and README
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from atomic_io import AtomicWriter
+
+# Bump when analyze_source changes what it records, so cached results are recomputed
+ANALYZER_VERSION = 1
+
+# Fewer changed files than this are parsed inline; process start-up would cost more
+PARALLEL_THRESHOLD = 16
+
+USAGE_CALLS = {
+    "sort": {"sorted", "sort"},
+    "heap": {"heappush", "heappop", "heapify", "heappushpop", "heapreplace", "nlargest", "nsmallest"},
+    "bisect": {"bisect", "bisect_left", "bisect_right", "insort", "insort_left", "insort_right"},
+}
+USAGE_MODULES = {"heapq": "heap", "bisect": "bisect"}
+MEMO_DECORATORS = {"cache", "lru_cache"}
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class _FunctionScanner(ast.NodeVisitor):
+    """Loop depth, calls (with the loop depth at the call) and library usage of one function body"""
+
+    def __init__(self, known: Set[str]):
+        self.known = known
+        self.depth = 0
+        self.max_depth = 0
+        self.calls: Dict[str, int] = {}
+        self.uses: Set[str] = set()
+
+    def scan(self, function: ast.AST) -> "_FunctionScanner":
+        for statement in function.body:
+            self.visit(statement)
+        return self
+
+    def _loop(self, node: ast.AST, levels: int = 1):
+        self.depth += levels
+        self.max_depth = max(self.max_depth, self.depth)
+        self.generic_visit(node)
+        self.depth -= levels
+
+    def visit_For(self, node):
+        self._loop(node)
+
+    visit_AsyncFor = visit_For
+    visit_While = visit_For
+
+    def visit_ListComp(self, node):
+        self._loop(node, len(node.generators))
+
+    visit_SetComp = visit_ListComp
+    visit_DictComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_FunctionDef(self, node):
+        # Nested functions are scanned as functions of their own
+        pass
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+    def visit_Call(self, node):
+        func = node.func
+        name = None
+        if isinstance(func, ast.Name):
+            name = func.id
+        elif isinstance(func, ast.Attribute):
+            name = func.attr
+            if isinstance(func.value, ast.Name) and func.value.id in USAGE_MODULES:
+                self.uses.add(USAGE_MODULES[func.value.id])
+        if name:
+            for usage, names in USAGE_CALLS.items():
+                if name in names:
+                    self.uses.add(usage)
+            if name in self.known:
+                self.calls[name] = max(self.calls.get(name, 0), self.depth)
+        self.generic_visit(node)
+
+
+def _signature(function: ast.AST) -> str:
+    args = [arg for arg in function.args.args if arg.arg != "self"]
+    params = [f"{arg.arg}: {ast.unparse(arg.annotation)}" if arg.annotation else arg.arg for arg in args]
+    returns = f" -> {ast.unparse(function.returns)}" if function.returns else ""
+    return f"{function.name}({', '.join(params)}){returns}"
+
+
+def _decorator_name(decorator: ast.AST) -> str:
+    node = decorator.func if isinstance(decorator, ast.Call) else decorator
+    return node.attr if isinstance(node, ast.Attribute) else getattr(node, "id", "")
+
+
+def analyze_source(source: str) -> Dict:
+    """
+    Analyse one solution file
+
+    Returns:
+        {"entry", "methods", "helpers", "loop_depth", "recursive", "memoized", "uses"},
+        or {"error": ...} when the file does not parse
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        return {"error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+
+    functions: Dict[str, ast.AST] = {}
+    methods = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Solution":
+            for item in node.body:
+                if isinstance(item, FUNCTION_NODES):
+                    methods.append(item)
+                    functions[item.name] = item
+        elif isinstance(node, FUNCTION_NODES):
+            functions[node.name] = node
+    for function in list(functions.values()):
+        for node in ast.walk(function):
+            if isinstance(node, FUNCTION_NODES) and node is not function:
+                functions.setdefault(node.name, node)
+
+    public = [method.name for method in methods if not method.name.startswith("_")]
+    entry = public[0] if public else None
+
+    scans = {name: _FunctionScanner(set(functions)).scan(function) for name, function in functions.items()}
+
+    def effective_depth(name: str, active: Set[str]) -> int:
+        scan = scans[name]
+        depth = scan.max_depth
+        for callee, depth_at_call in scan.calls.items():
+            if callee not in active:
+                depth = max(depth, depth_at_call + effective_depth(callee, active | {callee}))
+        return depth
+
+    def reaches(start: str, target: str) -> bool:
+        seen, stack = set(), [start]
+        while stack:
+            for callee in scans[stack.pop()].calls:
+                if callee == target:
+                    return True
+                if callee not in seen:
+                    seen.add(callee)
+                    stack.append(callee)
+        return False
+
+    roots = [entry] if entry else list(functions)
+    return {
+        "entry": entry,
+        "methods": [{"name": method.name, "signature": _signature(method), "entry": method.name == entry}
+                    for method in methods],
+        "helpers": [name for name in functions if name != entry],
+        "loop_depth": max((effective_depth(name, {name}) for name in roots), default=0),
+        "recursive": any(reaches(name, name) for name in functions),
+        "memoized": any(_decorator_name(decorator) in MEMO_DECORATORS
+                        for function in functions.values() for decorator in function.decorator_list),
+        "uses": sorted(set().union(*(scan.uses for scan in scans.values()))),
+    }
+
+
+def annotation(analysis: Dict) -> Dict:
+    """Compact form of an analysis stored in the problem's index record"""
+    if "error" in analysis:
+        return {"error": analysis["error"]}
+    entry = next((method["signature"] for method in analysis["methods"] if method["entry"]), None)
+    return {
+        "signature": entry,
+        "loop_depth": analysis["loop_depth"],
+        "recursive": analysis["recursive"],
+        "memoized": analysis["memoized"],
+        "uses": analysis["uses"],
+        "helpers": analysis["helpers"],
+    }
+
+
+def describe(note: Dict) -> str:
+    """One-line README rendering of an index record's analysis annotation"""
+    if not note or "error" in note or not note.get("signature"):
+        return ""
+    parts = [f"loop depth {note['loop_depth']}" if note["loop_depth"] else "no loops"]
+    if note.get("recursive"):
+        parts.append("recursive, memoized" if note.get("memoized") else "recursive")
+    parts.extend(note.get("uses", []))
+    if note.get("helpers"):
+        parts.append("helpers: " + ", ".join(note["helpers"]))
+    return ", ".join(parts)
+
+
+class SolutionAnalyzer:
+    """Content-hash cache of solution analyses under metadata/solution_analysis.json"""
+
+    def __init__(self, repo_root: str, writer: Optional[AtomicWriter] = None):
+        """
+        Initialize analyzer
+
+        Args:
+            repo_root: Root directory of the repository
+            writer: Shared writer for the results file
+        """
+        self.repo_root = Path(repo_root)
+        self.solutions_dir = self.repo_root / "solutions" / "python3"
+        self.results_file = self.repo_root / "metadata" / "solution_analysis.json"
+        self.writer = writer or AtomicWriter()
+        self.files: Dict[str, Dict] = self._load()
+        self.parsed = 0
+
+    def update(self, paths: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Bring the analyses of the given files up to date
+
+        Args:
+            paths: Repository-relative solution paths (None = every Python solution;
+                entries of deleted files are then dropped)
+
+        Returns:
+            Mapping of each requested path to its analysis (including its "hash")
+        """
+        if paths is None:
+            paths = [path.relative_to(self.repo_root).as_posix() for path in sorted(self.solutions_dir.rglob("*.py"))]
+            for stale in set(self.files) - set(paths):
+                del self.files[stale]
+        paths = list(paths)
+
+        by_hash = {entry["hash"]: entry for entry in self.files.values()}
+        pending: Dict[str, List[str]] = {}
+        sources: Dict[str, str] = {}
+        for path in paths:
+            full_path = self.repo_root / path
+            if not full_path.exists():
+                self.files.pop(path, None)
+                continue
+            source = full_path.read_text(encoding="utf-8")
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            if self.files.get(path, {}).get("hash") == digest:
+                continue
+            if digest in by_hash:
+                self.files[path] = by_hash[digest]
+                continue
+            pending.setdefault(digest, []).append(path)
+            sources[digest] = source
+
+        digests = list(pending)
+        if len(digests) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor() as executor:
+                analyses = list(executor.map(analyze_source, [sources[d] for d in digests], chunksize=8))
+        else:
+            analyses = [analyze_source(sources[d]) for d in digests]
+        for digest, analysis in zip(digests, analyses):
+            for path in pending[digest]:
+                self.files[path] = {"hash": digest, **analysis}
+        self.parsed += len(digests)
+
+        return {path: self.files[path] for path in paths if path in self.files}
+
+    def save(self):
+        self.writer.write_json(self.results_file, {
+            "version": ANALYZER_VERSION,
+            "files": dict(sorted(self.files.items())),
+        }, indent=1)
+
+    def query(self, uses: Optional[List[str]] = None, min_depth: Optional[int] = None,
+              recursive: Optional[bool] = None, has_helpers: Optional[bool] = None) -> Dict[str, Dict]:
+        """Analyses matching every given filter"""
+        matches = {}
+        for path, analysis in self.files.items():
+            if "error" in analysis:
+                continue
+            if uses and not set(uses) <= set(analysis["uses"]):
+                continue
+            if min_depth is not None and analysis["loop_depth"] < min_depth:
+                continue
+            if recursive is not None and analysis["recursive"] != recursive:
+                continue
+            if has_helpers is not None and bool(analysis["helpers"]) != has_helpers:
+                continue
+            matches[path] = analysis
+        return matches
+
+    def summary(self) -> Dict:
+        analyses = [analysis for analysis in self.files.values() if "error" not in analysis]
+        by_depth: Dict[int, int] = {}
+        by_use: Dict[str, int] = {}
+        for analysis in analyses:
+            by_depth[analysis["loop_depth"]] = by_depth.get(analysis["loop_depth"], 0) + 1
+            for use in analysis["uses"]:
+                by_use[use] = by_use.get(use, 0) + 1
+        return {
+            "files": len(self.files),
+            "errors": len(self.files) - len(analyses),
+            "loop_depth": dict(sorted(by_depth.items())),
+            "recursive": sum(1 for analysis in analyses if analysis["recursive"]),
+            "memoized": sum(1 for analysis in analyses if analysis["memoized"]),
+            "with_helpers": sum(1 for analysis in analyses if analysis["helpers"]),
+            "uses": dict(sorted(by_use.items())),
+        }
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.results_file.exists():
+            return {}
+        try:
+            with open(self.results_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != ANALYZER_VERSION:
+            return {}
+        return data.get("files", {})
+
+
+def annotate_index(repo_root: str, analyzer: SolutionAnalyzer) -> int:
+    """
+    Copy annotations into every Python record of the index, re-export problems_index.json
+    and refresh the README
+
+    Returns:
+        Number of index records that changed
+    """
+    from readme_updater import update_readme
+    from sync import LeetCodeSync
+
+    sync = LeetCodeSync(repo_root, probe=False)
+    index = sync._load_index()
+    changed = []
+    for slug in list(index.slugs()):
+        record = index.get(slug)
+        analysis = analyzer.files.get(record.get("solution_path") or "")
+        if analysis is None:
+            continue
+        note = annotation(analysis)
+        if record.get("analysis") != note:
+            changed.append({**record, "analysis": note})
+
+    sync._save_index(index, changed)
+    index.export_json(str(sync.index_file))
+    update_readme(str(sync.readme_file), str(sync._readme_source()), changed, sync.writer,
+                  sync._docs_dir())
+    sync.writer.flush()
+    return len(changed)
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("update", help="re-parse changed files (the default)")
+    subparsers.add_parser("summary", help="print aggregate counts as JSON")
+    query_parser = subparsers.add_parser("query", help="list solutions matching every filter")
+    query_parser.add_argument("--uses", nargs="+", choices=sorted(USAGE_CALLS))
+    query_parser.add_argument("--min-depth", type=int, help="minimum loop nesting depth")
+    query_parser.add_argument("--recursive", action="store_true", default=None)
+    query_parser.add_argument("--helpers", action="store_true", default=None, help="only solutions with helpers")
+    subparsers.add_parser("annotate", help="write annotations into the index and README")
+    args = parser.parse_args()
+
+    analyzer = SolutionAnalyzer(str(repo_root))
+    analyzer.update()
+    analyzer.save()
+
+    if args.command == "summary":
+        print(json.dumps(analyzer.summary(), indent=2))
+    elif args.command == "query":
+        for path, analysis in sorted(analyzer.query(args.uses, args.min_depth, args.recursive, args.helpers).items()):
+            entry = next((m["signature"] for m in analysis["methods"] if m["entry"]), "-")
+            print(f"{path:<60} {entry}  [{describe(annotation(analysis))}]")
+    elif args.command == "annotate":
+        changed = annotate_index(str(repo_root), analyzer)
+        print(f"✓ Annotated {changed} index record(s)")
+    else:
+        print(f"✓ Analysed {len(analyzer.files)} solution(s), parsed {analyzer.parsed} changed file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Solution Harness - Runs stored Python solutions on generated inputs and records time and memory
+
+Every solutions/python3/**/<slug>.py file with an input generator in
+solution_inputs.INPUT_GENERATORS is run in its own worker process (a fresh
+interpreter in a scratch directory, so solutions cannot disturb each other or
+the repository). Up to --workers files run at once, and a worker that exceeds
+--timeout is killed; the sizes it finished are kept.
+
+For each input size the worker reports the wall time per call (best of
+--repeat runs, with small inputs looped until the run is long enough to time)
+and the tracemalloc peak of one more call. Results are written to
+metadata/solution_perf.json next to the problem index.
+
+Usage:
+    python scripts/solution_harness.py                        # all solutions, default sizes
+    python scripts/solution_harness.py --only 3sum koko-eating-bananas
+    python scripts/solution_harness.py --sizes 100 1000 --timeout 10
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from atomic_io import AtomicWriter
+from solution_inputs import INPUT_GENERATORS, load_solution, solution_method
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_REPEAT = 3
+
+# Calls of one timed run are repeated until the run takes at least this long; for
+# solutions that mutate their arguments, only while the per-call copies stay under
+# MAX_COPIED_ELEMENTS in total
+MIN_RUN_S = 0.02
+MAX_CALLS_PER_RUN = 1024
+MAX_COPIED_ELEMENTS = 2_000_000
+
+# Worker output lines carrying results start with this marker (solutions may print)
+RESULT_MARKER = "@@harness "
+
+
+def fresh_copy(value):
+    """Copy of an argument deep enough that a solution mutating it cannot affect the next call"""
+    if isinstance(value, list):
+        if value and isinstance(value[0], (list, dict, set)):
+            return [fresh_copy(item) for item in value]
+        return value[:]
+    if isinstance(value, (tuple, int, float, str, bool, type(None))):
+        return value
+    return copy.deepcopy(value)
+
+
+def time_call(method: Callable, args: Tuple, size: int, repeat: int) -> float:
+    """
+    Best-of-repeat seconds per call; every call gets its own copy of the arguments
+
+    The garbage collector is off while timing (as in timeit): the argument copies
+    are large containers, and collections scanning them would be charged to the solution.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _time_call(method, args, size, repeat)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _time_call(method: Callable, args: Tuple, size: int, repeat: int) -> float:
+    # Solutions that leave their arguments alone are timed on the same (warm) arguments;
+    # the others get a fresh copy per call, within the copy budget
+    probe = [fresh_copy(arg) for arg in args]
+    method(*probe)
+    if probe == list(args):
+        max_calls = MAX_CALLS_PER_RUN
+        batch = lambda calls: [args] * calls
+    else:
+        max_calls = max(1, min(MAX_CALLS_PER_RUN, MAX_COPIED_ELEMENTS // max(1, size)))
+        batch = lambda calls: [[fresh_copy(arg) for arg in args] for _ in range(calls)]
+
+    calls = 1
+    while True:
+        copies = batch(calls)
+        start = time.perf_counter()
+        for call_args in copies:
+            method(*call_args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_RUN_S or calls >= max_calls:
+            break
+        calls = min(calls * 4, max_calls)
+
+    best = elapsed / calls
+    for _ in range(repeat - 1):
+        copies = batch(calls)
+        start = time.perf_counter()
+        for call_args in copies:
+            method(*call_args)
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def peak_memory(method: Callable, args: Tuple) -> int:
+    """Bytes allocated at the peak of one call, excluding the input itself"""
+    args = [fresh_copy(arg) for arg in args]
+    tracemalloc.start()
+    try:
+        method(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_solution(path: str, slug: str, sizes: List[int], repeat: int, seed: int):
+    """
+    Worker body: load one solution and print a result line per size
+
+    Runs inside the worker process. Each line is flushed as soon as the size
+    finishes, so a timeout in the parent loses only the size in progress.
+    """
+    def emit(record: Dict):
+        sys.__stdout__.write(RESULT_MARKER + json.dumps(record) + "\n")
+        sys.__stdout__.flush()
+
+    generator = INPUT_GENERATORS[slug]
+    try:
+        method = solution_method(load_solution(path), generator.method)
+    except Exception as e:
+        emit({"error": f"load failed: {type(e).__name__}: {e}"})
+        return
+
+    for size in sizes:
+        if generator.max_size is not None and size > generator.max_size:
+            emit({"skipped": size})
+            continue
+        args = generator.build(size, random.Random(f"{seed}:{slug}:{size}"))
+        try:
+            seconds = time_call(method, args, size, repeat)
+            peak = peak_memory(method, args)
+        except Exception as e:
+            emit({"error": f"n={size}: {type(e).__name__}: {e}"})
+            return
+        emit({"n": size, "time_s": round(seconds, 9), "peak_kb": round(peak / 1024, 1)})
+
+
+class SolutionHarness:
+    """Runs every measurable solution in isolated worker processes"""
+
+    def __init__(self, repo_root: str, sizes: Optional[List[int]] = None, timeout: float = DEFAULT_TIMEOUT,
+                 workers: Optional[int] = None, repeat: int = DEFAULT_REPEAT, seed: int = 0):
+        """
+        Initialize the harness
+
+        Args:
+            repo_root: Root directory of the repository
+            sizes: Input sizes to run, in increasing order
+            timeout: Seconds a single solution may take over all its sizes
+            workers: Worker processes running at once (defaults to the CPU count)
+            repeat: Timed runs per size (the best is kept)
+            seed: Seed for the input generators
+        """
+        self.repo_root = Path(repo_root)
+        self.solutions_dir = self.repo_root / "solutions" / "python3"
+        self.results_file = self.repo_root / "metadata" / "solution_perf.json"
+        self.sizes = sorted(sizes or DEFAULT_SIZES)
+        self.timeout = timeout
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.repeat = max(1, repeat)
+        self.seed = seed
+
+    def discover(self) -> Dict[str, Path]:
+        """Map slug to solution file for every stored Python solution"""
+        return {path.stem: path for path in sorted(self.solutions_dir.rglob("*.py"))}
+
+    def run(self, only: Optional[List[str]] = None, save: bool = True) -> Dict[str, Dict]:
+        """
+        Measure the selected solutions and save the results file
+
+        Args:
+            only: Slugs to run (None = every solution with an input generator)
+            save: Merge the results into metadata/solution_perf.json
+
+        Returns:
+            Mapping of slug to its result entry
+        """
+        solutions = self.discover()
+        slugs = [slug for slug in solutions if only is None or slug in only]
+
+        results: Dict[str, Dict] = {}
+        runnable = []
+        for slug in slugs:
+            if slug in INPUT_GENERATORS:
+                runnable.append(slug)
+            else:
+                results[slug] = self._entry(solutions[slug], "no_generator")
+
+        print(f"Running {len(runnable)} solution(s) with {self.workers} worker(s), sizes {self.sizes}")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for slug, entry in zip(runnable, executor.map(lambda s: self._run_worker(s, solutions[s]), runnable)):
+                results[slug] = entry
+                self._print_entry(slug, entry)
+
+        if save:
+            self.save(results)
+        return results
+
+    def save(self, results: Dict[str, Dict]):
+        """Merge results into the results file (entries for other slugs are kept)"""
+        existing = {}
+        if self.results_file.exists():
+            with open(self.results_file, 'r') as f:
+                existing = json.load(f).get("problems", {})
+        existing.update(results)
+        AtomicWriter().write_json(self.results_file, {
+            "sizes": self.sizes,
+            "problems": dict(sorted(existing.items())),
+        }, indent=2)
+        print(f"✓ Saved results to {self.results_file.relative_to(self.repo_root)}")
+
+    def _run_worker(self, slug: str, path: Path) -> Dict:
+        """Run one solution in a fresh interpreter and collect whatever it reported"""
+        command = [
+            sys.executable, os.path.abspath(__file__), "--worker", str(path.resolve()), slug,
+            "--sizes", *map(str, self.sizes), "--repeat", str(self.repeat), "--seed", str(self.seed),
+        ]
+        status = "ok"
+        error = None
+        # Solutions may write files (one registers an atexit hook that does), so give each a scratch cwd
+        with tempfile.TemporaryDirectory(prefix=f"harness-{slug}-") as scratch:
+            try:
+                completed = subprocess.run(command, cwd=scratch, capture_output=True, text=True, timeout=self.timeout)
+                stdout = completed.stdout
+                if completed.returncode != 0:
+                    status = "error"
+                    error = (completed.stderr.strip().splitlines() or [f"exit status {completed.returncode}"])[-1]
+            except subprocess.TimeoutExpired as e:
+                stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
+                status = "timeout"
+
+        entry = self._entry(path, status)
+        for line in stdout.splitlines():
+            if not line.startswith(RESULT_MARKER):
+                continue
+            record = json.loads(line[len(RESULT_MARKER):])
+            if "error" in record:
+                entry["status"], error = "error", record["error"]
+            elif "skipped" in record:
+                entry["skipped"].append(record["skipped"])
+            else:
+                entry["results"].append(record)
+        if status == "timeout":
+            done = {result["n"] for result in entry["results"]} | set(entry["skipped"])
+            error = f"timed out after {self.timeout:g}s at n={next((n for n in self.sizes if n not in done), '?')}"
+        if error:
+            entry["error"] = error
+        return entry
+
+    def _entry(self, path: Path, status: str) -> Dict:
+        entry = {
+            "path": path.relative_to(self.repo_root).as_posix(),
+            "status": status,
+            "results": [],
+            "skipped": [],
+        }
+        generator = INPUT_GENERATORS.get(path.stem)
+        if generator:
+            entry["method"] = generator.method
+        return entry
+
+    @staticmethod
+    def _print_entry(slug: str, entry: Dict):
+        mark = "✓" if entry["status"] == "ok" else "✗"
+        print(f"{mark} {slug} ({entry['status']})" + (f": {entry['error']}" if entry.get("error") else ""))
+        for result in entry["results"]:
+            print(f"    n={result['n']:<8} {result['time_s'] * 1000:12.4f} ms  {result['peak_kb']:10.1f} KB")
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="SLUG", help="run only these solutions")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="input sizes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per solution")
+    parser.add_argument("--workers", type=int, help="worker processes (defaults to the CPU count)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per size (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="input generator seed")
+    parser.add_argument("--worker", nargs=2, metavar=("PATH", "SLUG"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        measure_solution(args.worker[0], args.worker[1], sorted(args.sizes), max(1, args.repeat), args.seed)
+        return
+
+    harness = SolutionHarness(str(repo_root), args.sizes, args.timeout, args.workers, args.repeat, args.seed)
+    results = harness.run(args.only)
+    if any(entry["status"] in ("error", "timeout") for entry in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
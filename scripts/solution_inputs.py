@@ -0,0 +1,144 @@
+"""
+Solution Inputs - LeetCode-style preamble and input generators for stored solutions
+
+Stored solutions are bare LeetCode submissions: they rely on names LeetCode
+injects (List, Optional, collections, heapq, ListNode, ...) and cannot be
+imported on their own. load_solution() runs a file under the same preamble.
+
+INPUT_GENERATORS maps a problem slug to a generator that builds the positional
+arguments of its Solution method for a given input size. Sizes are counts of
+elements (cells for matrices, characters for strings).
+"""
+
+import random
+from math import isqrt
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+PREAMBLE = """
+from typing import *
+import bisect, collections, functools, heapq, itertools, math, operator, random, re, string
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict, deque, OrderedDict
+from functools import cache, lru_cache, reduce
+from heapq import heapify, heappop, heappush, heappushpop, heapreplace, nlargest, nsmallest
+from itertools import accumulate, combinations, permutations, product
+from math import ceil, floor, gcd, inf, log2, sqrt
+
+
+class ListNode:
+    def __init__(self, val=0, next=None):
+        self.val = val
+        self.next = next
+
+
+class TreeNode:
+    def __init__(self, val=0, left=None, right=None):
+        self.val = val
+        self.left = left
+        self.right = right
+"""
+
+
+class InputGenerator(NamedTuple):
+    """Builds arguments for one problem's Solution method"""
+
+    method: str
+    build: Callable[[int, random.Random], Tuple]
+    # Largest size worth running (quadratic solutions are capped near LeetCode's limit)
+    max_size: Optional[int] = None
+    # Expected growth in this generator's size when the problem's tags would mislead
+    expected: Optional[str] = None
+
+
+def load_solution(path: str) -> Dict[str, Any]:
+    """Execute a solution file under the LeetCode preamble and return its namespace"""
+    namespace: Dict[str, Any] = {"__name__": "solution"}
+    exec(PREAMBLE, namespace)
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    exec(compile(source, path, "exec"), namespace)
+    return namespace
+
+
+def solution_method(namespace: Dict[str, Any], name: Optional[str] = None) -> Callable:
+    """Bound Solution method by name, or the first public method defined on Solution"""
+    solution_class = namespace.get("Solution")
+    if solution_class is None:
+        raise LookupError("no Solution class")
+    if name is None:
+        public = [attr for attr, value in vars(solution_class).items() if callable(value) and not attr.startswith("_")]
+        if not public:
+            raise LookupError("Solution has no public method")
+        name = public[0]
+    return getattr(solution_class(), name)
+
+
+def _sorted_unique(n: int, rng: random.Random, spread: int = 4) -> list:
+    return sorted(rng.sample(range(-spread * n, spread * n), n))
+
+
+def _binary_search(n: int, rng: random.Random) -> Tuple:
+    # Last element: the worst case for a scan, an ordinary one for a binary search
+    nums = _sorted_unique(n, rng)
+    return nums, nums[-1]
+
+
+def _max_ascending_sum(n: int, rng: random.Random) -> Tuple:
+    return [rng.randint(1, 100) for _ in range(n)],
+
+
+def _valid_palindrome(n: int, rng: random.Random) -> Tuple:
+    # A real palindrome with punctuation mixed in, so the whole string is scanned
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789 ,.:'"
+    half = "".join(rng.choice(alphabet) for _ in range(n // 2))
+    return half + half[::-1],
+
+
+def _heights(n: int, rng: random.Random) -> Tuple:
+    return [rng.randint(0, 10 ** 4) for _ in range(n)],
+
+
+def _three_sum(n: int, rng: random.Random) -> Tuple:
+    return [rng.randint(-n, n) for _ in range(n)],
+
+
+def _rotated_sorted(n: int, rng: random.Random) -> Tuple:
+    nums = _sorted_unique(n, rng)
+    k = rng.randrange(n)
+    return nums[k:] + nums[:k],
+
+
+def _koko(n: int, rng: random.Random) -> Tuple:
+    piles = [rng.randint(1, 10 ** 9) for _ in range(n)]
+    return piles, n + rng.randrange(10 * n)
+
+
+def _search_matrix(n: int, rng: random.Random) -> Tuple:
+    side = max(1, isqrt(n))
+    values = _sorted_unique(side * side, rng)
+    matrix = [values[row * side:(row + 1) * side] for row in range(side)]
+    return matrix, values[rng.randrange(len(values))]
+
+
+def _two_sum_sorted(n: int, rng: random.Random) -> Tuple:
+    # Neighbours in the middle, so two pointers walk about n steps to meet them
+    numbers = sorted(rng.randint(-1000 * n, 1000 * n) for _ in range(max(2, n)))
+    middle = len(numbers) // 2
+    return numbers, numbers[middle - 1] + numbers[middle]
+
+
+INPUT_GENERATORS: Dict[str, InputGenerator] = {
+    "binary-search": InputGenerator("search", _binary_search),
+    "maximum-ascending-subarray-sum": InputGenerator("maxAscendingSum", _max_ascending_sum),
+    "valid-palindrome": InputGenerator("isPalindrome", _valid_palindrome),
+    "trapping-rain-water": InputGenerator("trap", _heights),
+    # Tagged Two Pointers/Sorting, but the pointer sweep runs once per element
+    "3sum": InputGenerator("threeSum", _three_sum, max_size=3000, expected="O(n²)"),
+    "container-with-most-water": InputGenerator("maxArea", _heights),
+    "find-minimum-in-rotated-sorted-array": InputGenerator("findMin", _rotated_sorted),
+    # Binary search over speeds, but every probe sums all n piles
+    "koko-eating-bananas": InputGenerator("minEatingSpeed", _koko, expected="O(n)"),
+    "search-a-2d-matrix": InputGenerator("searchMatrix", _search_matrix),
+    # Tagged Binary Search, but no pair search can beat one pass over the array
+    "two-sum-ii-input-array-is-sorted": InputGenerator("twoSum", _two_sum_sorted, expected="O(n)"),
+}
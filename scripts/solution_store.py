@@ -0,0 +1,133 @@
+"""
+Solution Store - Content-addressed storage for every accepted submission
+
+Each accepted submission becomes a version of its problem. The code of a
+version is stored once under solutions/.objects/<hash[:2]>/<hash[2:]>.<ext>,
+keyed by the sha256 of the code, so identical resubmissions share one object
+and cost no extra write. The readable solutions/{language}/{difficulty}/{slug}.{ext}
+file always holds the canonical (latest distinct) version for that language.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from atomic_io import AtomicWriter
+
+
+def hash_code(code: str) -> str:
+    """Content hash identifying a version's code"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def legacy_versions(record: Dict) -> List[Dict]:
+    """Single-version history for index records written before versions were tracked"""
+    return [{
+        "submission_id": None,
+        "language": record.get("language"),
+        "solved_at": record.get("solved_at"),
+        "code_hash": None,
+        "path": record.get("solution_path"),
+    }]
+
+
+def canonical_versions(versions: List[Dict]) -> Dict[str, Dict]:
+    """
+    Map each language to its canonical version
+
+    The canonical version is the first submission of the latest distinct code, so
+    resubmitting identical code leaves the canonical version (and its file) alone.
+
+    Args:
+        versions: Versions sorted oldest first
+    """
+    canonical = {}
+    for version in versions:
+        current = canonical.get(version["language"])
+        if current is None or version.get("code_hash") != current.get("code_hash"):
+            canonical[version["language"]] = version
+    return canonical
+
+
+class SolutionStore:
+    """Deduplicating object store for submission code"""
+
+    OBJECTS_DIR = ".objects"
+
+    def __init__(self, repo_root: str, solutions_dir: Optional[str] = None, writer: Optional[AtomicWriter] = None):
+        """
+        Initialize solution store
+
+        Args:
+            repo_root: Root directory of the repository (stored paths are relative to it)
+            solutions_dir: Directory holding solution files (defaults to repo_root/solutions)
+            writer: Shared writer used for new objects
+        """
+        self.writer = writer or AtomicWriter()
+        self.repo_root = Path(repo_root)
+        self.solutions_dir = Path(solutions_dir) if solutions_dir else self.repo_root / "solutions"
+        self.objects_dir = self.solutions_dir / self.OBJECTS_DIR
+        self.objects_written = 0
+        self.objects_reused = 0
+
+    def object_path(self, code_hash: str, extension: str) -> Path:
+        return self.objects_dir / code_hash[:2] / f"{code_hash[2:]}.{extension}"
+
+    def put(self, code: str, extension: str) -> Tuple[str, str]:
+        """
+        Store code unless an object with the same hash already exists
+
+        Returns:
+            (code hash, object path relative to the repo root)
+        """
+        code_hash = hash_code(code)
+        path = self.object_path(code_hash, extension)
+        if path.exists():
+            # Content-addressed: an existing object already holds exactly this code
+            self.objects_reused += 1
+        else:
+            self.writer.write_text(path, code)
+            self.objects_written += 1
+        return code_hash, str(path.relative_to(self.repo_root))
+
+    def add_versions(self, record: Optional[Dict], problems: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Store the code of submissions not yet in a record's history
+
+        Args:
+            record: Existing index record for the problem (None if it is new)
+            problems: Fetched submissions of that problem
+
+        Returns:
+            (full version history oldest first, versions added by this call)
+        """
+        versions = list(record.get("versions") or legacy_versions(record)) if record else []
+        known = {version["submission_id"] for version in versions if version.get("submission_id")}
+
+        added = []
+        for problem in sorted(problems, key=lambda p: p["solved_at"]):
+            submission_id = problem.get("submission_id")
+            if submission_id and submission_id in known:
+                continue
+            code_hash, path = self.put(problem["code"], problem["extension"])
+            added.append({
+                "submission_id": submission_id,
+                "language": problem["language"],
+                "solved_at": problem["solved_at"],
+                "code_hash": code_hash,
+                "path": path,
+            })
+            if submission_id:
+                known.add(submission_id)
+
+        versions.extend(added)
+        versions.sort(key=lambda version: version.get("solved_at") or "")
+        return versions, added
+
+    def read(self, version: Dict) -> Optional[str]:
+        """Return the stored code of a version, or None if its file is missing"""
+        path = self.repo_root / version["path"] if version.get("path") else None
+        if path is None or not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
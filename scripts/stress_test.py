@@ -0,0 +1,273 @@
+"""
+Stress Test - Differential testing of stored solutions against vectorized NumPy oracles
+
+LeetCode's hidden tests are small. Here every problem in STRESS_CASES gets
+random inputs generated a whole batch at a time as one NumPy array, and a
+reference implementation (oracle) answers the whole batch with array
+operations, so millions of cases cost little beyond calling the solution
+itself. Small value ranges are used on purpose: duplicates, plateaus and
+ties are where two-pointer and dedup logic goes wrong.
+
+When a solution disagrees with its oracle (or raises), the first failing case
+is shrunk, by dropping elements and moving values towards zero while it
+still fails, and reported as the minimal failing input.
+
+Each problem runs in its own worker process inside a scratch directory.
+NumPy is only needed for this script (pip install numpy).
+
+Usage:
+    python scripts/stress_test.py                             # every problem with an oracle
+    python scripts/stress_test.py --only 3sum --cases 1000000
+"""
+
+import argparse
+import inspect
+import itertools
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# Add scripts directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from solution_inputs import load_solution, solution_method
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_CASES = 200000
+
+# Cases generated and checked per oracle call, fewer when the oracle's arrays would
+# exceed MAX_BATCH_ELEMENTS values
+BATCH_SIZE = 4096
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+class StressCase:
+    """Generator and oracle for one problem"""
+
+    def __init__(self, method: str, generate: Callable, oracle: Callable, min_n: int, max_n: int,
+                 normalize: Callable[[Any], Any] = int, oracle_size: Callable[[int], int] = lambda n: n):
+        """
+        Args:
+            method: Solution method to call with one list argument
+            generate: (rng, batch, n) -> int array of shape (batch, n)
+            oracle: int array of shape (batch, n) -> one expected answer per row
+            min_n: Shortest input the problem allows
+            max_n: Longest input generated by default
+            normalize: Turns a solution's return value into the oracle's form
+            oracle_size: Values the oracle materializes per case of length n
+        """
+        self.method = method
+        self.generate = generate
+        self.oracle = oracle
+        self.min_n = min_n
+        self.max_n = max_n
+        self.normalize = normalize
+        self.oracle_size = oracle_size
+
+    def batch_size(self, n: int) -> int:
+        return max(1, min(BATCH_SIZE, MAX_BATCH_ELEMENTS // max(1, self.oracle_size(n))))
+
+
+class Failure(NamedTuple):
+    args: List[int]
+    expected: Any
+    got: Any
+
+
+def _uniform(low: int, high: int) -> Callable:
+    """Batch generator drawing every value from [low, high]"""
+    return lambda rng, batch, n: rng.integers(low, high + 1, size=(batch, n), dtype=np.int64)
+
+
+def trap_oracle(heights: "np.ndarray") -> "np.ndarray":
+    """Water above each bar is min(highest bar to its left, highest to its right) minus the bar"""
+    left = np.maximum.accumulate(heights, axis=1)
+    right = np.maximum.accumulate(heights[:, ::-1], axis=1)[:, ::-1]
+    return (np.minimum(left, right) - heights).sum(axis=1)
+
+
+def max_ascending_sum_oracle(numbers: "np.ndarray") -> "np.ndarray":
+    """Sum of each strictly ascending run via prefix sums, carrying each run's start forward"""
+    columns = np.arange(numbers.shape[1])
+    starts = np.ones(numbers.shape, dtype=bool)
+    starts[:, 1:] = numbers[:, 1:] <= numbers[:, :-1]
+    run_start = np.maximum.accumulate(np.where(starts, columns, 0), axis=1)
+    prefix = np.cumsum(numbers, axis=1)
+    before_run = np.take_along_axis(prefix - numbers, run_start, axis=1)
+    return (prefix - before_run).max(axis=1)
+
+
+def max_area_oracle(heights: "np.ndarray") -> "np.ndarray":
+    """Every pair of lines at once: min height times distance"""
+    n = heights.shape[1]
+    width = np.clip(np.arange(n)[None, :] - np.arange(n)[:, None], 0, None)
+    areas = np.minimum(heights[:, :, None], heights[:, None, :]) * width
+    return areas.reshape(len(heights), -1).max(axis=1)
+
+
+def three_sum_oracle(nums: "np.ndarray") -> List[List[tuple]]:
+    """Every index triple at once; zero-sum triples are sorted and deduplicated per case"""
+    triples = np.array(list(itertools.combinations(range(nums.shape[1]), 3)), dtype=np.intp)
+    values = np.sort(nums[:, triples], axis=2)
+    hits = values.sum(axis=2) == 0
+    answers = []
+    for row, row_hits in zip(values, hits):
+        found = row[row_hits]
+        answers.append([tuple(t) for t in np.unique(found, axis=0).tolist()] if len(found) else [])
+    return answers
+
+
+def _triplets(result: Sequence[Sequence[int]]) -> List[tuple]:
+    """Sorted triplets in sorted order; duplicates are kept so they show up as a mismatch"""
+    return sorted(tuple(sorted(triplet)) for triplet in result)
+
+
+STRESS_CASES: Dict[str, StressCase] = {
+    "trapping-rain-water": StressCase("trap", _uniform(0, 6), trap_oracle, min_n=1, max_n=48),
+    "maximum-ascending-subarray-sum": StressCase("maxAscendingSum", _uniform(1, 6), max_ascending_sum_oracle,
+                                                 min_n=1, max_n=48),
+    "container-with-most-water": StressCase("maxArea", _uniform(0, 8), max_area_oracle, min_n=2, max_n=32,
+                                            oracle_size=lambda n: n * n),
+    "3sum": StressCase("threeSum", _uniform(-4, 4), three_sum_oracle, min_n=3, max_n=12,
+                       normalize=_triplets, oracle_size=lambda n: n ** 3),
+}
+
+
+def check(method: Callable, case: StressCase, args: List[int], expected: Any) -> Optional[Failure]:
+    """Run the solution on one input; a Failure when it raises or disagrees with expected"""
+    try:
+        got = case.normalize(method(list(args)))
+    except Exception as e:
+        return Failure(list(args), expected, f"{type(e).__name__}: {e}")
+    if got != expected:
+        return Failure(list(args), expected, got)
+    return None
+
+
+def shrink(method: Callable, case: StressCase, failure: Failure) -> Failure:
+    """
+    Greedily minimize a failing input
+
+    Repeatedly drops single elements (down to case.min_n), then moves single
+    values towards zero, keeping any change after which the case still fails.
+    """
+    def fails(args: List[int]) -> Optional[Failure]:
+        expected = case.oracle(np.array([args], dtype=np.int64))[0]
+        expected = expected.item() if hasattr(expected, "item") else expected
+        return check(method, case, args, expected)
+
+    current = failure
+    improved = True
+    while improved:
+        improved = False
+        args = current.args
+        candidates = [args[:i] + args[i + 1:] for i in range(len(args))] if len(args) > case.min_n else []
+        for i, value in enumerate(args):
+            for smaller in {0, value // 2, value - 1 if value > 0 else value + 1}:
+                if abs(smaller) < abs(value):
+                    candidates.append(args[:i] + [smaller] + args[i + 1:])
+        for candidate in candidates:
+            result = fails(candidate)
+            if result is not None:
+                current = result
+                improved = True
+                break
+    return current
+
+
+def stress_problem(slug: str, path: str, cases: int, max_n: Optional[int], seed: int) -> Dict:
+    """
+    Worker body: check one solution against its oracle on `cases` random inputs
+
+    Inputs cover every length from the problem's minimum to max_n, shortest first,
+    so the first failure found is already short before shrinking.
+    """
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"stress-{slug}-") as scratch:
+        os.chdir(scratch)
+        try:
+            return _stress(slug, path, cases, max_n, seed)
+        finally:
+            os.chdir(previous_cwd)
+
+
+def _stress(slug: str, path: str, cases: int, max_n: Optional[int], seed: int) -> Dict:
+    case = STRESS_CASES[slug]
+    method = solution_method(load_solution(path), case.method)
+    rng = np.random.default_rng([seed, sum(map(ord, slug))])
+    lengths = range(case.min_n, (max_n or case.max_n) + 1)
+    per_length = max(1, cases // len(lengths))
+
+    checked = 0
+    failures = 0
+    first: Optional[Failure] = None
+    for n in lengths:
+        remaining = per_length
+        while remaining > 0:
+            batch = min(remaining, case.batch_size(n))
+            inputs = case.generate(rng, batch, n)
+            expected = case.oracle(inputs)
+            expected = expected.tolist() if hasattr(expected, "tolist") else expected
+            for args, answer in zip(inputs.tolist(), expected):
+                failure = check(method, case, args, answer)
+                if failure is not None:
+                    failures += 1
+                    first = first or failure
+            checked += batch
+            remaining -= batch
+
+    result = {"slug": slug, "cases": checked, "lengths": [lengths[0], lengths[-1]], "failures": failures}
+    if first is not None:
+        minimal = shrink(method, case, first)
+        parameter = next(iter(inspect.signature(method).parameters), "input")
+        result["minimal"] = {"input": {parameter: minimal.args}, "expected": minimal.expected, "got": minimal.got}
+    return result
+
+
+def main():
+    """Main entry point"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="SLUG", choices=sorted(STRESS_CASES), help="stress only these problems")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="random inputs per problem")
+    parser.add_argument("--max-n", type=int, help="longest input (defaults to each problem's own limit)")
+    parser.add_argument("--workers", type=int, help="worker processes (defaults to the CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("✗ NumPy is required for stress testing: pip install numpy")
+
+    solutions = {path.stem: path for path in (repo_root / "solutions" / "python3").rglob("*.py")}
+    slugs = [slug for slug in (args.only or STRESS_CASES) if slug in solutions]
+
+    print(f"Stress testing {len(slugs)} solution(s) with {args.cases:,} case(s) each")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(stress_problem, slug, str(solutions[slug].resolve()), args.cases, args.max_n, args.seed)
+                   for slug in slugs]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        lengths = f"n = {result['lengths'][0]}..{result['lengths'][1]}"
+        if not result["failures"]:
+            print(f"✓ {result['slug']}: {result['cases']:,} cases ({lengths}), no disagreement")
+            continue
+        minimal = result["minimal"]
+        print(f"✗ {result['slug']}: {result['failures']:,} of {result['cases']:,} cases ({lengths}) disagree")
+        print(f"    minimal failing input: {', '.join(f'{name}={value}' for name, value in minimal['input'].items())}")
+        print(f"    expected {minimal['expected']!r}, got {minimal['got']!r}")
+
+    if any(result["failures"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
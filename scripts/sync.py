@@ -2,136 +2,340 @@
 Sync Script - Main orchestrator for LeetCode sync process
 """
 
+import argparse
 import os
 import json
+import logging
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
-from dotenv import load_dotenv
-
-# Load environment variables from .env file if it exists
-load_dotenv()
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from leetcode_client import get_new_solved_problems
-from readme_updater import update_readme
+# Only lightweight modules are imported up front. requests (via leetcode_client),
+# dotenv, sqlite3 and the README renderer are imported on first use, so a run the
+# change probe finds to be a no-op never pays for them.
+from atomic_io import AtomicWriter
+from problem_index import ProblemIndex
+from solution_store import SolutionStore, canonical_versions
+from sync_metrics import SyncMetrics, configure_logging
+
+if TYPE_CHECKING:
+    from question_cache import QuestionCache
+    from request_scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
 
 
 class LeetCodeSync:
     """Main sync orchestrator"""
     
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, credentials: Optional[Tuple[str, str]] = None,
+                 question_cache: Optional["QuestionCache"] = None, scheduler: Optional["RequestScheduler"] = None,
+                 probe: Optional[bool] = None, git_commit: Optional[bool] = None):
         """
         Initialize sync orchestrator
         
         Args:
-            repo_root: Root directory of the repository
+            repo_root: Root directory of the repository (or of one account's tree)
+            credentials: (username, session cookie) to sync
+                (defaults to LEETCODE_USERNAME / LEETCODE_SESSION)
+            question_cache: Question metadata cache shared between accounts
+                (defaults to metadata/question_cache.json under repo_root)
+            scheduler: Rate limiter shared between accounts
+            probe: Skip the run when the change probe reports nothing new since the
+                last successful sync (defaults to on unless LEETCODE_PROBE=0)
+            git_commit: Commit the files written by each run (defaults to LEETCODE_GIT_COMMIT;
+                off when a caller such as MultiAccountSync commits several runs together)
         """
+        if probe is None:
+            probe = os.getenv("LEETCODE_PROBE", "1").lower() not in ("0", "false", "no")
+        self.probe = probe
+        self.credentials = credentials
+        self.question_cache = question_cache
+        self.scheduler = scheduler
         self.repo_root = Path(repo_root)
         self.metadata_dir = self.repo_root / "metadata"
         self.solutions_dir = self.repo_root / "solutions"
         self.state_file = self.metadata_dir / "state.json"
         self.index_file = self.metadata_dir / "problems_index.json"
+        self.index_log_file = self.metadata_dir / "problems_index.jsonl"
+        self.index_db_file = self.metadata_dir / "problems.db"
+        self.question_cache_file = self.metadata_dir / "question_cache.json"
+        self.stats_file = self.metadata_dir / "progress_stats.json"
         self.readme_file = self.repo_root / "README.md"
+        self.docs_dir = None
+        if os.getenv("LEETCODE_README_SHARDS", "").lower() in ("1", "true", "yes"):
+            self.docs_dir = self.repo_root / "docs"
+        if git_commit is None:
+            git_commit = os.getenv("LEETCODE_GIT_COMMIT", "").lower() in ("1", "true", "yes")
+        self.git_commit = git_commit
+        self.metrics_file = self.metadata_dir / "sync_metrics.json"
+        self.metrics = SyncMetrics()
+        self.writer = AtomicWriter()
+        self.solution_store = SolutionStore(str(self.repo_root), str(self.solutions_dir), self.writer)
+        self.search_index = None
+        self._search_pending: List[str] = []
+        # Kept between runs by watch(): the client (with its session) and the parsed index
+        self.client = None
+        self._index = None
     
-    def run(self):
-        """Execute the full sync process"""
-        print("=" * 60)
-        print("LeetCode Sync Starting")
-        print("=" * 60)
-        
-        # Step 1: Load state
-        state = self._load_state()
-        print(f"\nLast sync: {state.get('last_sync_at', 'Never')}")
-        print(f"Last processed: {state.get('last_processed_submission_time', 'Never')}")
-        
-        # Step 2: Fetch new problems from LeetCode
-        print("\n" + "-" * 60)
-        print("Fetching new problems from LeetCode...")
-        print("-" * 60)
+    def run(self) -> int:
+        """
+        Execute the full sync process, saving metadata/sync_metrics.json however it ends
         
+        Returns:
+            Number of new submissions synced
+        """
+        # Metrics, counters and written paths describe a single run, also when runs repeat in watch mode
+        self.metrics = SyncMetrics()
+        self.writer.reset()
+        self.solution_store.objects_written = 0
+        self.solution_store.objects_reused = 0
+        self._search_pending = []
         try:
-            new_problems = get_new_solved_problems(state)
-        except Exception as e:
-            print(f"✗ Error fetching problems: {e}")
-            sys.exit(1)
+            return self._run()
+        finally:
+            self.metrics.record_files(self.writer.stats.as_dict())
+            self.metrics.save(str(self.metrics_file))
+    
+    def watch(self, min_interval: float, max_interval: float, max_runs: Optional[int] = None):
+        """
+        Sync repeatedly, keeping the client, its session, the question cache and the index warm
         
-        if not new_problems:
-            print("\n✓ No new problems found. Everything is up to date!")
-            print("=" * 60)
-            return
+        Each poll is a normal run, so an idle poll costs one change-probe request over
+        the already open connection. After a run that synced something the next poll
+        comes min_interval later; every idle or failed run doubles the wait, up to
+        max_interval.
         
-        print(f"\n✓ Found {len(new_problems)} new problem(s) to sync")
+        Args:
+            min_interval: Seconds between polls right after activity
+            max_interval: Longest wait between polls
+            max_runs: Stop after this many polls (None = until interrupted)
+        """
+        self._warm_up()
+        interval = min_interval
+        runs = 0
+        while max_runs is None or runs < max_runs:
+            try:
+                synced = self.run()
+            except SystemExit as e:
+                # run() exits on fatal errors; in watch mode the next poll retries instead
+                logger.error(f"✗ Sync exited with status {e.code}; retrying on the next poll")
+                synced = 0
+            except Exception as e:
+                logger.error(f"✗ Sync failed: {e}; retrying on the next poll")
+                synced = 0
+            runs += 1
+            interval = min_interval if synced else min(interval * 2, max_interval)
+            if max_runs is not None and runs >= max_runs:
+                break
+            logger.info(f"Next poll in {interval:.0f}s")
+            time.sleep(interval)
+    
+    def _warm_up(self):
+        """Create the client, question cache and index that watch() reuses for every run"""
+        from leetcode_client import LeetCodeClient
+        from question_cache import QuestionCache
         
-        # Step 3: Load problem index
-        index = self._load_index()
-        existing_slugs = {p["slug"] for p in index["problems"]}
+        username, session_cookie = self.credentials or (os.getenv("LEETCODE_USERNAME"), os.getenv("LEETCODE_SESSION"))
+        if not username or not session_cookie:
+            raise ValueError("LEETCODE_USERNAME and LEETCODE_SESSION environment variables required")
         
-        # Step 4: Process each new problem
-        print("\n" + "-" * 60)
-        print("Storing solution files...")
-        print("-" * 60)
+        if self.question_cache is None:
+            self.question_cache = QuestionCache(str(self.question_cache_file), writer=self.writer)
+        self.client = LeetCodeClient(username, session_cookie, question_cache=self.question_cache,
+                                     scheduler=self.scheduler, metrics=self.metrics)
+        self._index = self._load_index()
+    
+    def _run(self):
+        logger.info("=" * 60)
+        logger.info("LeetCode Sync Starting")
+        logger.info("=" * 60)
         
-        latest_timestamp = state.get("last_processed_submission_time")
+        # Step 1: Load state
+        with self.metrics.phase("load_state"):
+            state = self._load_state()
+        logger.info(f"\nLast sync: {state.get('last_sync_at', 'Never')}")
+        logger.info(f"Last processed: {state.get('last_processed_submission_time', 'Never')}")
+        if state.get("dead_submissions"):
+            logger.warning(f"  ⚠ {len(state['dead_submissions'])} submission(s) in the dead-letter list are no longer "
+                           f"retried automatically; run sync.py --retry-dead to retry them")
         
-        for problem in new_problems:
-            slug = problem["slug"]
+        # Fast path: one tiny request tells whether anything changed since the last sync
+        fingerprint = None
+        if self.probe:
+            from probe import is_unchanged
             
-            # Skip if already in index (shouldn't happen but just in case)
-            if slug in existing_slugs:
-                print(f"  ⊘ Skipping {slug} (already exists)")
+            with self.metrics.phase("probe"):
+                fingerprint = self._probe(state)
+            if fingerprint is not None and is_unchanged(state, fingerprint):
+                self.metrics.count("probe_unchanged")
+                logger.info("\n✓ Probe: nothing changed since the last sync. Everything is up to date!")
+                logger.info("=" * 60)
+                return 0
+        
+        # Step 2: Fetch new problems from LeetCode
+        logger.info("\n" + "-" * 60)
+        logger.info("Fetching new problems from LeetCode...")
+        logger.info("-" * 60)
+        
+        # Pending retries are checked against the stored versions, so open the index early for them
+        index = None
+        is_stored = None
+        if state.get("pending_submissions"):
+            with self.metrics.phase("load_index"):
+                index = self._load_index()
+            is_stored = lambda slug, submission_id: self._is_stored(index, slug, submission_id)
+        
+        from leetcode_client import iter_new_solved_problems
+        
+        # Step 3: Store every new submission as a version of its problem, one fetched chunk
+        # at a time so only that chunk's code is held in memory
+        chunks = iter_new_solved_problems(state, str(self.question_cache_file), self.writer, self.credentials,
+                                          self.question_cache, self.scheduler, self.metrics, self.client, is_stored)
+        synced = 0
+        latest_timestamp = None
+        entries = {}
+        new_slugs = []
+        while True:
+            try:
+                with self.metrics.phase("fetch"):
+                    problems = next(chunks, None)
+            except Exception as e:
+                logger.error(f"✗ Error fetching problems: {e}")
+                sys.exit(1)
+            if problems is None:
+                break
+            if not problems:
                 continue
             
-            # Store solution file
-            solution_path = self._store_solution(problem)
-            
-            # Add to index
-            index_entry = {
-                "slug": slug,
-                "title": problem["title"],
-                "difficulty": problem["difficulty"],
-                "tags": problem["tags"],
-                "leetcode_url": problem["leetcode_url"],
-                "language": problem["language"],
-                "solution_path": solution_path,
-                "solved_at": problem["solved_at"]
-            }
-            index["problems"].append(index_entry)
-            
-            # Track latest timestamp
-            if not latest_timestamp or problem["solved_at"] > latest_timestamp:
-                latest_timestamp = problem["solved_at"]
+            if index is None:
+                with self.metrics.phase("load_index"):
+                    index = self._load_index()
             
-            print(f"  ✓ {problem['title']} ({problem['language']}) -> {solution_path}")
+            logger.info(f"\nStoring {len(problems)} new submission(s)...")
+            with self.metrics.phase("store_solutions"):
+                self._store_chunk(index, problems, state, entries, new_slugs)
+            synced += len(problems)
+            latest_timestamp = max([latest_timestamp or ""] + [problem["solved_at"] for problem in problems])
+        self.metrics.count("new_submissions", synced)
+        added_entries = list(entries.values())
+        
+        # Remember what the account looked like, so the next probe can compare against it
+        if fingerprint is not None:
+            state["probe"] = fingerprint
+        
+        if not synced:
+            # The scan watermark, probe fingerprint and pending failures may still have moved
+            with self.metrics.phase("save_state"):
+                self._save_state(state)
+                self.writer.flush()
+            self._commit([], [])
+            logger.info("\n✓ No new problems found. Everything is up to date!")
+            if state.get("pending_submissions"):
+                logger.warning(f"  ⚠ {len(state['pending_submissions'])} submission(s) pending retry on the next run")
+            logger.info("=" * 60)
+            return 0
+        
+        logger.info(f"\n✓ Synced {synced} new submission(s)")
+        if state.get("last_processed_submission_time") and state["last_processed_submission_time"] > latest_timestamp:
+            latest_timestamp = state["last_processed_submission_time"]
         
-        # Step 5: Save updated index
-        self._save_index(index)
-        print(f"\n✓ Updated problems index with {len(new_problems)} new problem(s)")
+        # Step 4b: Annotate the Python solutions written this run (unchanged files are never parsed)
+        with self.metrics.phase("analyze"):
+            self._analyze_solutions(added_entries)
+        
+        self.metrics.count("problems_updated", len(added_entries))
+        self.metrics.count("objects_written", self.solution_store.objects_written)
+        self.metrics.count("objects_reused", self.solution_store.objects_reused)
+        logger.info(f"\n✓ Stored {self.solution_store.objects_written} new solution object(s), "
+                    f"{self.solution_store.objects_reused} identical resubmission(s) deduplicated")
+        
+        # Step 5: Append new entries to the index log
+        with self.metrics.phase("save_index"):
+            self._save_index(index, added_entries)
+            self._update_search_index(index, added_entries)
+        logger.info(f"\n✓ Updated problems index with {len(added_entries)} new or updated problem(s)")
         
         # Step 6: Update README
-        print("\n" + "-" * 60)
-        print("Updating README.md...")
-        print("-" * 60)
+        logger.info("\n" + "-" * 60)
+        logger.info("Updating README.md...")
+        logger.info("-" * 60)
         
         try:
-            update_readme(str(self.readme_file), str(self.index_file))
+            with self.metrics.phase("update_readme"):
+                from readme_updater import update_readme
+                
+                update_readme(str(self.readme_file), str(self._readme_source()), added_entries, self.writer,
+                              self._docs_dir())
         except Exception as e:
-            print(f"✗ Error updating README: {e}")
+            logger.error(f"✗ Error updating README: {e}")
             sys.exit(1)
         
+        # Step 6b: Fold the new entries into the progress aggregates and the README stats section
+        with self.metrics.phase("update_stats"):
+            from progress_stats import update_stats
+            
+            update_stats(str(self.readme_file), str(self.stats_file), str(self._readme_source()),
+                         added_entries, self.writer)
+        
         # Step 7: Update state
-        state["last_sync_at"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-        state["last_processed_submission_time"] = latest_timestamp
-        self._save_state(state)
+        with self.metrics.phase("save_state"):
+            state["last_sync_at"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+            state["last_processed_submission_time"] = latest_timestamp
+            self._save_state(state)
+            self.writer.flush()
+        
+        logger.info(f"\n✓ Updated sync state (last processed: {latest_timestamp})")
+        if state.get("pending_submissions"):
+            logger.warning(f"  ⚠ {len(state['pending_submissions'])} submission(s) pending retry on the next run")
         
-        print(f"\n✓ Updated sync state (last processed: {latest_timestamp})")
+        # Step 8: Commit exactly the files this run wrote (LEETCODE_GIT_COMMIT)
+        self._commit(added_entries, new_slugs)
         
-        print("\n" + "=" * 60)
-        print(f"✓ Sync Complete! Added {len(new_problems)} new problem(s)")
-        print("=" * 60)
+        logger.info(f"✓ Files: {self.writer.stats.summary()}")
+        
+        logger.info("\n" + "=" * 60)
+        logger.info(f"✓ Sync Complete! Synced {synced} submission(s) across {len(added_entries)} problem(s)")
+        logger.info("=" * 60)
+        return synced
+    
+    def _store_chunk(self, index: ProblemIndex, problems: List[Dict], state: Dict, entries: Dict[str, Dict],
+                     new_slugs: List[str]):
+        """
+        Store one fetched chunk of submissions, grouped by problem
+        
+        Args:
+            index: Problem index as loaded at the start of the run
+            problems: Submissions of this chunk
+            state: Sync state whose watermarks advance with every stored submission
+            entries: slug -> index entry updated this run (earlier chunks included), updated in place
+            new_slugs: Slugs not in the index before this run, appended to in place
+        """
+        submissions_by_slug = {}
+        for problem in problems:
+            submissions_by_slug.setdefault(problem["slug"], []).append(problem)
+        
+        for slug, submissions in submissions_by_slug.items():
+            # An earlier chunk may already have updated this problem
+            existing = entries.get(slug) or index.get(slug)
+            index_entry = self._store_versions(existing, submissions)
+            self._advance_watermarks(state, submissions)
+            
+            # Nothing new (every submission is already in the history)
+            if index_entry is None:
+                logger.info(f"  ⊘ Skipping {slug} (already stored)")
+                continue
+            
+            entries[slug] = index_entry
+            if existing is None:
+                new_slugs.append(slug)
+            logger.info(f"  ✓ {index_entry['title']} ({index_entry['language']}, "
+                        f"{len(index_entry['versions'])} version(s)) -> {index_entry['solution_path']}")
     
     def _load_state(self) -> Dict:
         """Load or initialize state.json"""
@@ -140,25 +344,233 @@ class LeetCodeSync:
                 return json.load(f)
         return {
             "last_sync_at": None,
-            "last_processed_submission_time": None
+            "last_processed_submission_time": None,
+            "watermarks": {},
+            "pending_submissions": [],
+            "dead_submissions": []
         }
     
+    def retry_dead(self) -> int:
+        """
+        Move every dead-lettered submission back to the pending list with a fresh set of attempts
+        
+        Returns:
+            Number of submissions requeued
+        """
+        state = self._load_state()
+        dead = state.get("dead_submissions") or []
+        if not dead:
+            return 0
+        state["pending_submissions"] = (state.get("pending_submissions") or []) + [
+            {**submission, "attempts": 0} for submission in dead]
+        state["dead_submissions"] = []
+        self._save_state(state)
+        self.writer.flush()
+        return len(dead)
+    
     def _save_state(self, state: Dict):
         """Save state.json"""
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        self.writer.write_json(self.state_file, state, indent=2)
     
-    def _load_index(self) -> Dict:
-        """Load or initialize problems_index.json"""
-        if self.index_file.exists():
-            with open(self.index_file, 'r') as f:
-                return json.load(f)
-        return {"problems": []}
+    def _commit(self, entries: List[Dict], new_slugs: List[str]):
+        """Commit the paths the writer recorded this run through git plumbing, when enabled"""
+        if not self.git_commit:
+            return
+        
+        from git_commit import GitCommitError, GitCommitter, commit_message
+        
+        message = commit_message(entries, new_slugs)
+        try:
+            with self.metrics.phase("commit"):
+                commit = GitCommitter(str(self.repo_root)).commit(self.writer.written_paths,
+                                                                  self.writer.removed_paths, message)
+        except GitCommitError as e:
+            logger.error(f"✗ Error committing changes: {e}")
+            sys.exit(1)
+        
+        if commit is None:
+            logger.info("\n✓ Nothing to commit")
+            return
+        self.metrics.count("commits")
+        logger.info(f"\n✓ Committed {commit[:12]}: {message.splitlines()[0]}")
+    
+    def _analyze_solutions(self, entries: List[Dict]):
+        """Attach a static-analysis annotation to every entry whose canonical file is Python"""
+        paths = [entry["solution_path"] for entry in entries if (entry.get("solution_path") or "").endswith(".py")]
+        if not paths:
+            return
+        
+        from solution_analysis import SolutionAnalyzer, annotation
+        
+        analyzer = SolutionAnalyzer(str(self.repo_root), self.writer)
+        analyses = analyzer.update(paths)
+        for entry in entries:
+            analysis = analyses.get(entry.get("solution_path"))
+            if analysis is not None:
+                entry["analysis"] = annotation(analysis)
+        analyzer.save()
+        self.metrics.count("solutions_analyzed", analyzer.parsed)
+    
+    def _advance_watermarks(self, state: Dict, submissions: List[Dict]):
+        """Record the newest stored submission id and time for each (slug, language)"""
+        watermarks = state.setdefault("watermarks", {})
+        for problem in submissions:
+            marks = watermarks.setdefault(problem["slug"], {})
+            mark = marks.get(problem["language"])
+            if mark is None or self._submission_order(problem) > self._submission_order(mark):
+                marks[problem["language"]] = {
+                    "submission_id": problem.get("submission_id"),
+                    "solved_at": problem["solved_at"],
+                }
+    
+    @staticmethod
+    def _submission_order(item: Dict):
+        """Sort key for a submission or watermark: solved time, then numeric submission id"""
+        try:
+            submission_id = int(item.get("submission_id"))
+        except (TypeError, ValueError):
+            submission_id = -1
+        return item.get("solved_at") or "", submission_id
+    
+    def _probe(self, state: Dict) -> Optional[Dict]:
+        """Fetch the change fingerprint, or None when probing is not possible"""
+        from probe import ProbeError, fetch_fingerprint
+        
+        username = self.credentials[0] if self.credentials else os.getenv("LEETCODE_USERNAME")
+        if not username:
+            return None
+        try:
+            return fetch_fingerprint(username, session=self.client.session if self.client else None)
+        except ProbeError as e:
+            logger.warning(f"  ⚠ Change probe failed, running a full sync: {e}")
+            return None
+    
+    @staticmethod
+    def _is_stored(index: ProblemIndex, slug: str, submission_id: str) -> bool:
+        """Whether a submission is already stored as a version of its problem"""
+        record = index.get(slug) or {}
+        return any(str(version.get("submission_id")) == submission_id for version in record.get("versions") or [])
+    
+    def _load_index(self) -> ProblemIndex:
+        """
+        Open the problems_index.jsonl log, importing problems_index.json on first use
+        
+        In watch mode the open index is reused unless another process has changed
+        the log since (its size no longer matches what the index last saw).
+        """
+        warm = self._index
+        if warm is not None and self.index_log_file.exists() and self.index_log_file.stat().st_size == warm.log_size:
+            return warm
+        index = ProblemIndex(str(self.index_log_file), legacy_json_path=str(self.index_file), writer=self.writer)
+        if self.client is not None:
+            self._index = index
+        return index
+    
+    def _save_index(self, index: ProblemIndex, new_entries: List[Dict]):
+        """
+        Append new entries to the index log, compacting and exporting as configured
+        
+        problems_index.json is re-exported when the log is compacted, or on every
+        run when LEETCODE_EXPORT_INDEX_JSON is set.
+        """
+        previous_log_size = index.log_size
+        index.append(new_entries)
+        
+        export = os.getenv("LEETCODE_EXPORT_INDEX_JSON", "").lower() in ("1", "true", "yes")
+        if index.needs_compaction():
+            removed = index.compact()
+            logger.info(f"  ✓ Compacted index log ({removed} superseded record(s) removed)")
+            export = True
+        
+        if export:
+            index.export_json(str(self.index_file))
+        
+        from index_db import ProblemStore, index_db_enabled
+        
+        if index_db_enabled(str(self.index_db_file)):
+            store = ProblemStore(str(self.index_db_file))
+            try:
+                # Entries go in as one transaction; a store that missed earlier
+                # appends is rebuilt from the log instead
+                store.apply_append(index, new_entries, previous_log_size)
+            finally:
+                store.close()
+    
+    def _docs_dir(self) -> Optional[str]:
+        """Directory of the sharded README pages, or None for a single README table"""
+        return str(self.docs_dir) if self.docs_dir is not None else None
+    
+    def _readme_source(self) -> Path:
+        """Index the README is rebuilt from: the SQLite store when enabled, else the log"""
+        from index_db import index_db_enabled
+        
+        if index_db_enabled(str(self.index_db_file)):
+            return self.index_db_file
+        return self.index_log_file
+    
+    def _store_versions(self, existing: Optional[Dict], submissions: List[Dict]) -> Optional[Dict]:
+        """
+        Add submissions to a problem's version history and refresh its canonical files
+        
+        Args:
+            existing: Current index record for the problem (None if it is new)
+            submissions: Fetched submissions of that problem
+            
+        Returns:
+            Updated index record, or None if every submission was already stored
+        """
+        previous = canonical_versions(existing.get("versions") or []) if existing else {}
+        versions, added = self.solution_store.add_versions(existing, submissions)
+        if not added:
+            return None
+        
+        by_submission = {problem.get("submission_id"): problem for problem in submissions}
+        canonical = canonical_versions(versions)
+        
+        # Rewrite the readable file of each language whose canonical version changed
+        solution_paths = {}
+        for language, version in canonical.items():
+            if version in added and version is not previous.get(language):
+                solution_paths[language] = self._store_solution(by_submission[version["submission_id"]])
+        
+        # The record points at the canonical version of the most recently used language
+        newest = versions[-1]
+        pointer = canonical[newest["language"]]
+        latest_problem = by_submission.get(newest["submission_id"]) or max(submissions, key=lambda p: p["solved_at"])
+        
+        entry = dict(existing) if existing else {}
+        entry.update({
+            "slug": latest_problem["slug"],
+            "title": latest_problem["title"],
+            "difficulty": latest_problem["difficulty"],
+            "tags": latest_problem["tags"],
+            "leetcode_url": latest_problem["leetcode_url"],
+        })
+        if pointer in added:
+            entry.update({
+                "language": pointer["language"],
+                "solution_path": solution_paths.get(pointer["language"])
+                or self._solution_file(latest_problem, pointer["language"]),
+                "solved_at": pointer["solved_at"],
+                "code_hash": pointer["code_hash"],
+            })
+            # A measured complexity describes the code it was measured on
+            if existing and existing.get("code_hash") != pointer["code_hash"]:
+                entry.pop("complexity", None)
+        entry["first_solved_at"] = versions[0]["solved_at"]
+        entry["versions"] = versions
+        return entry
     
-    def _save_index(self, index: Dict):
-        """Save problems_index.json"""
-        with open(self.index_file, 'w') as f:
-            json.dump(index, f, indent=2)
+    def _solution_file(self, problem: Dict, language: Optional[str] = None) -> str:
+        """Relative path of the readable solution file for a problem in a language"""
+        if language is None or language == problem["language"]:
+            language, extension = problem["language"], problem["extension"]
+        else:
+            from leetcode_client import LeetCodeClient
+            
+            extension = LeetCodeClient.LANG_EXTENSIONS.get(language, "txt")
+        solution_file = self.solutions_dir / language / problem["difficulty"].lower() / f"{problem['slug']}.{extension}"
+        return str(solution_file.relative_to(self.repo_root))
     
     def _store_solution(self, problem: Dict) -> str:
         """
@@ -170,28 +582,45 @@ class LeetCodeSync:
         Returns:
             Relative path to stored solution file
         """
-        language = problem["language"]
-        difficulty = problem["difficulty"].lower()
-        slug = problem["slug"]
-        extension = problem["extension"]
-        code = problem["code"]
-        
         # Build path: solutions/{language}/{difficulty}/{slug}.{ext}
-        lang_dir = self.solutions_dir / language / difficulty
-        lang_dir.mkdir(parents=True, exist_ok=True)
-        
-        solution_file = lang_dir / f"{slug}.{extension}"
+        solution_path = self._solution_file(problem)
         
         # Add header comment with problem info
         header = self._generate_file_header(problem)
-        full_content = header + "\n\n" + code
+        full_content = header + "\n\n" + problem["code"]
         
-        # Write solution file
-        with open(solution_file, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+        # Write solution file (skipped if identical content is already there)
+        self.writer.write_text(self.repo_root / solution_path, full_content)
+        self._search_pending.append(solution_path)
         
         # Return relative path from repo root
-        return str(solution_file.relative_to(self.repo_root))
+        return solution_path
+    
+    def _update_search_index(self, index: ProblemIndex, entries: List[Dict]):
+        """
+        Add the solution files stored this run to the search index, reading them back from disk
+        
+        The index is generated data: when there is none yet (a fresh clone, or after it was
+        deleted) every solution file is indexed, so searches never miss older solutions.
+        """
+        if not self._search_pending:
+            return
+        from search_index import SearchIndex, rebuild, solution_document
+        
+        if self.search_index is None:
+            self.search_index = SearchIndex(str(self.metadata_dir / "search"), self.writer)
+        if not self.search_index.exists():
+            total, _ = rebuild(self.repo_root, self.search_index, {record["slug"]: record for record in index.all()})
+            logger.info(f"  ✓ Built the search index over {total} solution file(s)")
+            self._search_pending = []
+            return
+        records = {entry["slug"]: entry for entry in entries}
+        for solution_path in self._search_pending:
+            content = (self.repo_root / solution_path).read_text(encoding="utf-8")
+            record = records.get(Path(solution_path).stem, {})
+            self.search_index.update_document(solution_document(solution_path, content, record))
+        self._search_pending = []
+        self.search_index.save()
     
     def _generate_file_header(self, problem: Dict) -> str:
         """Generate a header comment for solution files"""
@@ -231,15 +660,64 @@ Solved: {solved_at}
 # Solved: {solved_at}'''
 
 
+def _load_env(repo_root: Path):
+    """Load a .env file if there is one (python-dotenv is only imported in that case)"""
+    for candidate in (Path.cwd() / ".env", repo_root / ".env"):
+        if candidate.exists():
+            from dotenv import load_dotenv
+            
+            load_dotenv(candidate)
+            return
+
+
 def main():
     """Main entry point"""
     # Get repo root (parent of scripts directory)
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent
     
+    parser = argparse.ArgumentParser(description="Sync accepted LeetCode submissions into this repository")
+    parser.add_argument("--profile", nargs="?", const=str(repo_root / "metadata" / "sync.prof"), metavar="PATH",
+                        help="write a cProfile dump of the run (default metadata/sync.prof)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="json emits one structured record per log line")
+    parser.add_argument("--verbose", action="store_true", help="also log per-phase timings")
+    parser.add_argument("--full", action="store_true", help="skip the change probe and always fetch")
+    parser.add_argument("--retry-dead", action="store_true",
+                        help="requeue the submissions that ran out of retries before syncing")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and poll for new accepted submissions until interrupted")
+    parser.add_argument("--min-interval", type=float, default=float(os.getenv("LEETCODE_WATCH_MIN_INTERVAL", 5)),
+                        help="seconds between polls right after activity (watch mode)")
+    parser.add_argument("--max-interval", type=float, default=float(os.getenv("LEETCODE_WATCH_MAX_INTERVAL", 300)),
+                        help="longest wait between idle polls (watch mode)")
+    args = parser.parse_args()
+    
+    configure_logging(args.log_format == "json", logging.DEBUG if args.verbose else logging.INFO)
+    _load_env(repo_root)
+    
     # Run sync
-    sync = LeetCodeSync(str(repo_root))
-    sync.run()
+    sync = LeetCodeSync(str(repo_root), probe=False if args.full else None)
+    if args.retry_dead:
+        logger.info(f"✓ Requeued {sync.retry_dead()} dead-lettered submission(s) for retry")
+    if args.watch:
+        try:
+            sync.watch(args.min_interval, max(args.min_interval, args.max_interval))
+        except KeyboardInterrupt:
+            logger.info("\n✓ Stopped watching")
+        return
+    if not args.profile:
+        sync.run()
+        return
+    
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(sync.run)
+    finally:
+        profiler.dump_stats(args.profile)
+        logger.info(f"✓ Wrote profile to {args.profile} (inspect with python -m pstats)")
 
 
 if __name__ == "__main__":
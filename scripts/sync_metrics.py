@@ -0,0 +1,187 @@
+"""
+Sync Metrics - Per-phase timings, GraphQL request statistics and structured logging
+
+A SyncMetrics instance is threaded through one sync run. Phases record wall
+and process CPU time, the client records every request attempt (operation,
+status, latency, bytes in and out), and the whole run is saved as
+metadata/sync_metrics.json.
+"""
+
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+
+from atomic_io import AtomicWriter
+
+
+class SyncMetrics:
+    """Collects phase timings, request statistics and counters for one sync run"""
+
+    # Upper bounds (ms) of the request latency histogram buckets; the last bucket is open-ended
+    LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.files: Dict[str, int] = {}
+        self._requests: Dict[str, Dict] = {}
+        self._latencies: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as a named phase (repeated phases accumulate)"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            with self._lock:
+                totals = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+                totals["wall_s"] += wall
+                totals["cpu_s"] += cpu
+            logging.getLogger(__name__).debug(
+                f"phase {name} took {wall:.3f}s wall, {cpu:.3f}s CPU",
+                extra={"phase": name, "wall_s": round(wall, 6), "cpu_s": round(cpu, 6)},
+            )
+
+    def count(self, name: str, amount: int = 1):
+        """Add to a named counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_request(self, operation: str, latency_s: float, bytes_out: int, bytes_in: int,
+                       status: Union[int, str]):
+        """
+        Record one request attempt (retries are separate attempts)
+
+        Args:
+            operation: GraphQL operationName
+            latency_s: Time from send to response
+            bytes_out: Request body size
+            bytes_in: Response body size (0 when no response arrived)
+            status: HTTP status code, or "error" for connection failures
+        """
+        latency_ms = latency_s * 1000
+        bucket = bisect.bisect_left(self.LATENCY_BUCKETS_MS, latency_ms)
+        with self._lock:
+            stats = self._requests.get(operation)
+            if stats is None:
+                stats = self._requests[operation] = {
+                    "count": 0,
+                    "errors": 0,
+                    "status": {},
+                    "bytes_out": 0,
+                    "bytes_in": 0,
+                    "histogram": [0] * (len(self.LATENCY_BUCKETS_MS) + 1),
+                }
+                self._latencies[operation] = []
+            stats["count"] += 1
+            if status == "error" or int(status) >= 400:
+                stats["errors"] += 1
+            stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+            stats["bytes_out"] += bytes_out
+            stats["bytes_in"] += bytes_in
+            stats["histogram"][bucket] += 1
+            self._latencies[operation].append(latency_ms)
+
+    def record_files(self, stats: Dict[str, int]):
+        """Store the writer's files/bytes written and skipped"""
+        self.files = dict(stats)
+
+    def as_dict(self) -> Dict:
+        labels = [f"<={bound}ms" for bound in self.LATENCY_BUCKETS_MS] + [f">{self.LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            requests = {}
+            for operation, stats in sorted(self._requests.items()):
+                latencies = sorted(self._latencies[operation])
+                requests[operation] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "status": dict(stats["status"]),
+                    "bytes_out": stats["bytes_out"],
+                    "bytes_in": stats["bytes_in"],
+                    "latency_ms": {
+                        "p50": round(self._percentile(latencies, 0.50), 3),
+                        "p95": round(self._percentile(latencies, 0.95), 3),
+                        "max": round(latencies[-1], 3) if latencies else 0.0,
+                        "histogram": dict(zip(labels, stats["histogram"])),
+                    },
+                }
+            return {
+                "started_at": self.started_at,
+                "total": {
+                    "wall_s": round(time.perf_counter() - self._wall_start, 6),
+                    "cpu_s": round(time.process_time() - self._cpu_start, 6),
+                },
+                "phases": {name: {key: round(value, 6) for key, value in totals.items()}
+                           for name, totals in self.phases.items()},
+                "requests": requests,
+                "request_totals": {
+                    "count": sum(stats["count"] for stats in self._requests.values()),
+                    "bytes_out": sum(stats["bytes_out"] for stats in self._requests.values()),
+                    "bytes_in": sum(stats["bytes_in"] for stats in self._requests.values()),
+                },
+                "files": dict(self.files),
+                "counters": dict(self.counters),
+            }
+
+    def save(self, path: str):
+        """
+        Write the metrics as JSON
+
+        Uses its own writer so the metrics file is not reported among the sync's written paths.
+        """
+        AtomicWriter().write_json(path, self.as_dict(), indent=2)
+
+    @staticmethod
+    def _percentile(values: List[float], fraction: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per log record, including any structured extras"""
+
+    _RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self._RESERVED})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(json_format: bool = False, level: Optional[int] = None):
+    """
+    Send log records to stdout, as plain messages or JSON lines
+
+    Args:
+        json_format: Emit one JSON object per record
+        level: Minimum level (defaults to INFO)
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter("%(message)s"))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level or logging.INFO)
+    # Connection-level chatter from requests is never useful here
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
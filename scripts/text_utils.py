@@ -0,0 +1,12 @@
+"""
+Text Utils - Small string helpers shared by the README renderer and the search index
+"""
+
+import re
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def slugify(value: str) -> str:
+    """Lowercase words joined by dashes, as used in page names and search field values"""
+    return "-".join(WORD.findall(value.lower()))